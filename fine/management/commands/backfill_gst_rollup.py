@@ -0,0 +1,17 @@
+# fine/management/commands/backfill_gst_rollup.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from fine.utils.gst_summary import rebuild_gst_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly GST input-credit rollup from all purchases"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_gst_rollup()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {count} GST rollup rows in {time.monotonic() - started:.1f}s"
+        ))
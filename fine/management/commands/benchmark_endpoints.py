@@ -0,0 +1,68 @@
+# fine/management/commands/benchmark_endpoints.py
+import os
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from fine.utils.benchmarks import (
+    DEFAULT_ITERATIONS, DEFAULT_THRESHOLD, DEFAULT_WARMUP,
+    compare, load_baseline, merge_baseline, run_benchmarks, save_baseline,
+)
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json')
+
+
+class Command(BaseCommand):
+    help = "Benchmark the hot endpoints with the test client and compare against a stored JSON baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+        parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+        parser.add_argument('--save', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='Relative increase in latency or memory counted as a regression')
+        parser.add_argument('--as-of', help='Anchor date for the benchmarked periods (default: latest expense date)')
+        parser.add_argument('--only', nargs='*', help='Benchmark only these endpoint names')
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['as_of']) if options['as_of'] else None
+        except ValueError:
+            raise CommandError(f"Invalid --as-of '{options['as_of']}', expected YYYY-MM-DD")
+
+        # Lets the test client through ALLOWED_HOSTS and keeps outgoing mail in memory
+        setup_test_environment()
+        try:
+            results = run_benchmarks(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                only=options['only'],
+                as_of=as_of,
+                log=self.stdout.write,
+            )
+        finally:
+            teardown_test_environment()
+
+        path = options['baseline']
+        if options['save']:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # A partial run only updates its own endpoints in an existing baseline
+            if options['only'] and os.path.exists(path):
+                results = merge_baseline(results, load_baseline(path))
+            save_baseline(results, path)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {path}"))
+            return
+
+        if not os.path.exists(path):
+            self.stdout.write(self.style.WARNING(f"No baseline at {path}; run with --save to record one"))
+            return
+
+        regressions = compare(results, load_baseline(path), threshold=options['threshold'])
+        if regressions:
+            for message in regressions:
+                self.stdout.write(self.style.ERROR(message))
+            raise CommandError(f"{len(regressions)} regression(s) against {path}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
@@ -0,0 +1,63 @@
+# fine/management/commands/find_duplicate_vouchers.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from fine.models import Expense, Purchase
+
+
+class Command(BaseCommand):
+    help = "List expenses and purchases that share a voucher/bill fingerprint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=['expense', 'purchase', 'all'], default='all')
+        parser.add_argument('--backfill', action='store_true', help="Recompute fingerprints before scanning")
+
+    def handle(self, *args, **options):
+        targets = []
+        if options['model'] in ('expense', 'all'):
+            targets.append((Expense, 'voucher_no', 'category'))
+        if options['model'] in ('purchase', 'all'):
+            targets.append((Purchase, 'bill_no', 'vendor'))
+
+        total_groups = 0
+        for model, ref_field, party_field in targets:
+            if options['backfill']:
+                self._backfill(model)
+
+            # One grouped pass over the fingerprint index finds every duplicate group
+            groups = list(
+                model.objects.exclude(fingerprint='')
+                .values('fingerprint')
+                .annotate(n=Count('id'))
+                .filter(n__gt=1)
+                .values_list('fingerprint', flat=True)
+            )
+            total_groups += len(groups)
+            if not groups:
+                continue
+
+            rows = model.objects.filter(fingerprint__in=groups).order_by('fingerprint', 'id').values(
+                'id', 'fingerprint', 'date', 'total_amount', ref_field, party_field
+            )
+            current = None
+            for row in rows:
+                if row['fingerprint'] != current:
+                    current = row['fingerprint']
+                    self.stdout.write(
+                        f"\n{model.__name__} {row[ref_field]} | {row[party_field]} | "
+                        f"{row['date']:%d-%b-%Y} | ₹{row['total_amount']}"
+                    )
+                self.stdout.write(f"  id {row['id']}")
+
+        self.stdout.write(self.style.SUCCESS(f"\nFound {total_groups} duplicate group(s)"))
+
+    def _backfill(self, model):
+        batch = []
+        for row in model.objects.all().iterator(chunk_size=2000):
+            row.fingerprint = row.compute_fingerprint()
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ['fingerprint'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['fingerprint'])
@@ -0,0 +1,37 @@
+# fine/management/commands/generate_payslips.py
+import os
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fine.utils.payslips import collect_payslip_data, stream_payslip_zip
+
+
+class Command(BaseCommand):
+    help = "Render PDF payslips for every payroll in a month into a ZIP file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=int, default=datetime.now().month)
+        parser.add_argument('--year', type=int, default=datetime.now().year)
+        parser.add_argument('--output', help="ZIP path (default: Payslips_YYYYMM.zip)")
+        parser.add_argument('--workers', type=int, default=None, help="Render processes (default: CPU count)")
+
+    def handle(self, *args, **options):
+        month, year = options['month'], options['year']
+        if not 1 <= month <= 12:
+            raise CommandError("Month must be between 1 and 12")
+
+        slips = collect_payslip_data(month, year)
+        if not slips:
+            raise CommandError(f"No payroll records found for {month:02d}/{year}")
+
+        output = options['output'] or f"Payslips_{year}{month:02d}.zip"
+        started = datetime.now()
+        with open(output, 'wb') as fh:
+            for chunk in stream_payslip_zip(slips, max_workers=options['workers'] or os.cpu_count() or 1):
+                fh.write(chunk)
+
+        elapsed = (datetime.now() - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(slips)} payslips to {output} in {elapsed:.1f}s"
+        ))
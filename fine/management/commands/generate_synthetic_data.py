@@ -0,0 +1,73 @@
+# fine/management/commands/generate_synthetic_data.py
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from fine.utils.synthetic_data import DEFAULT_CHUNK_SIZE, DEFAULT_SEED, SyntheticDataGenerator
+
+
+def _range(value):
+    try:
+        low, _, high = value.partition('-')
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise CommandError(f"Invalid range '{value}', expected MIN-MAX")
+    if low < 0 or high < low:
+        raise CommandError(f"Invalid range '{value}', expected MIN-MAX")
+    return low, high
+
+
+class Command(BaseCommand):
+    help = "Generate a seeded synthetic dataset (attendance, payroll, expenses, income, purchases) for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=25)
+        parser.add_argument('--years', type=int, default=2)
+        parser.add_argument('--end-date', help='Last generated day (YYYY-MM-DD); defaults to today')
+        parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+        parser.add_argument('--vendors', type=int, default=60)
+        parser.add_argument('--expenses-per-day', default='2-6', help='MIN-MAX expense vouchers per day')
+        parser.add_argument('--income-per-day', default='4-10', help='MIN-MAX income entries per day')
+        parser.add_argument('--purchases-per-day', default='1-5', help='MIN-MAX purchase bills per day')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--index-search', action='store_true', help='Rebuild the search token index afterwards')
+        parser.add_argument('--force', action='store_true', help='Allow running with DEBUG off (e.g. against a copy of production)')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("Refusing to write synthetic data with DEBUG off; pass --force if this is a benchmark database")
+
+        try:
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else None
+        except ValueError:
+            raise CommandError(f"Invalid --end-date '{options['end_date']}', expected YYYY-MM-DD")
+
+        generator = SyntheticDataGenerator(
+            employees=options['employees'],
+            years=options['years'],
+            end_date=end_date,
+            seed=options['seed'],
+            vendors=options['vendors'],
+            expenses_per_day=_range(options['expenses_per_day']),
+            income_per_day=_range(options['income_per_day']),
+            purchases_per_day=_range(options['purchases_per_day']),
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+
+        started = time.monotonic()
+        counts = generator.run()
+        if options['index_search']:
+            call_command('rebuild_search_index', chunk_size=options['chunk_size'])
+
+        elapsed = time.monotonic() - started
+        total = sum(v for k, v in counts.items() if k != 'gst_rollup')
+        for table, count in counts.items():
+            self.stdout.write(f"  {table}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total} rows from {generator.start_date} to {generator.end_date} "
+            f"in {elapsed:.1f}s (seed {options['seed']})"
+        ))
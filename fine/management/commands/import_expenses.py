@@ -0,0 +1,44 @@
+# fine/management/commands/import_expenses.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fine.utils.expense_import import import_expense_file, ImportFormatError, DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Bulk import expenses from a CSV or XLSX voucher sheet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to a .csv or .xlsx file")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Validate and roll back without saving")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+
+        started = time.monotonic()
+        try:
+            with open(path, 'rb') as fh:
+                report = import_expense_file(
+                    fh,
+                    os.path.basename(path),
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                )
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['message']}")
+        if report['error_count'] > len(report['errors']):
+            self.stderr.write(f"... and {report['error_count'] - len(report['errors'])} more errors")
+
+        action = "Validated" if report['dry_run'] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {report['imported']} expenses ({report['error_count']} rows rejected) "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,51 @@
+# fine/management/commands/import_settlements.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fine.utils.expense_import import ImportFormatError
+from fine.utils.settlement_import import import_settlement_file, CHANNELS, DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Import a Swiggy/Zomato settlement CSV or XLSX statement into income"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to a .csv or .xlsx file")
+        parser.add_argument('--channel', choices=CHANNELS, default=None,
+                            help="Channel for lines without a channel/platform column")
+        parser.add_argument('--aggregate', action='store_true', help="One income row per day and channel")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Validate and roll back without saving")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+
+        started = time.monotonic()
+        try:
+            with open(path, 'rb') as fh:
+                report = import_settlement_file(
+                    fh,
+                    os.path.basename(path),
+                    channel=options['channel'],
+                    aggregate=options['aggregate'],
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                )
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['message']}")
+        if report['error_count'] > len(report['errors']):
+            self.stderr.write(f"... and {report['error_count'] - len(report['errors'])} more errors")
+
+        action = "Validated" if report['dry_run'] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {report['order_lines']} order lines into {report['income_rows']} income rows "
+            f"({report['duplicate_count']} duplicates skipped, {report['error_count']} rejected) "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,92 @@
+# fine/management/commands/load_test.py
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from fine.models import Payroll
+from fine.utils.load_test import DEFAULT_MIX, run_load_test
+
+
+def _parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise CommandError(f"Unknown operation '{name}' in --mix; choose from {', '.join(DEFAULT_MIX)}")
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight for '{name}' in --mix")
+    return mix
+
+
+class Command(BaseCommand):
+    help = "Run concurrent attendance/payroll writes and report reads against the local database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', help='Month to hammer as YYYY-MM (default: latest payroll month)')
+        parser.add_argument('--threads', type=int, default=8, help='Simulated users per process')
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--duration', type=int, default=30, help='Seconds to run')
+        parser.add_argument('--employees', type=int, help='Only use the first N employees (more contention)')
+        parser.add_argument('--mix', help='Weights, e.g. save_attendance=50,edit_attendance=20,save_payroll=10,report_read=20')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', help='Also write the report to this file')
+        parser.add_argument('--force', action='store_true', help='Allow running with DEBUG off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("Refusing to write load-test data with DEBUG off; pass --force if this is a benchmark database")
+
+        if options['period']:
+            try:
+                year, month = (int(part) for part in options['period'].split('-'))
+            except ValueError:
+                raise CommandError(f"Invalid --period '{options['period']}', expected YYYY-MM")
+        else:
+            latest = Payroll.objects.aggregate(year=Max('year'))['year']
+            if latest is None:
+                raise CommandError("No payroll data; run generate_synthetic_data first")
+            year, month = latest, Payroll.objects.filter(year=latest).aggregate(month=Max('month'))['month']
+
+        setup_test_environment()
+        try:
+            report = run_load_test(
+                year, month,
+                threads=options['threads'],
+                processes=options['processes'],
+                duration=options['duration'],
+                mix=_parse_mix(options['mix']) if options['mix'] else None,
+                employees=options['employees'],
+                seed=options['seed'],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            teardown_test_environment()
+
+        for kind, stats in report['operations'].items():
+            self.stdout.write(
+                f"{kind:16} {stats['requests']:6} req  {stats['throughput_rps']:7} req/s  "
+                f"p50 {stats['p50_ms']}ms  p95 {stats['p95_ms']}ms  p99 {stats['p99_ms']}ms  {stats['outcomes']}"
+            )
+
+        outcomes = report['operations'].get('all', {}).get('outcomes', {})
+        self.stdout.write(f"Deadlocks: {outcomes.get('deadlock', 0)}, lock timeouts: {outcomes.get('lock_timeout', 0)}, "
+                          f"conflicts: {outcomes.get('conflict', 0)}")
+
+        violations = {name: rows for name, rows in report['integrity'].items() if rows}
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+        if violations:
+            for name, rows in violations.items():
+                self.stdout.write(self.style.ERROR(f"{name}: {len(rows)} e.g. {rows[0]}"))
+            raise CommandError("Integrity violations found")
+        self.stdout.write(self.style.SUCCESS("No integrity violations"))
@@ -0,0 +1,46 @@
+# fine/management/commands/populate_calendar.py
+import csv
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fine.models import CalendarDay
+from fine.models.calendar_day import DEFAULT_END, DEFAULT_START
+
+
+def _parse(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Fill the calendar_day dimension for a date range and optionally load holidays from a CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', default=DEFAULT_START.isoformat(), help='First day (YYYY-MM-DD)')
+        parser.add_argument('--end', default=DEFAULT_END.isoformat(), help='Last day (YYYY-MM-DD)')
+        parser.add_argument('--holidays', help='CSV with date,name columns; listed days are flagged as holidays')
+
+    def handle(self, *args, **options):
+        start, end = _parse(options['start']), _parse(options['end'])
+        if end < start:
+            raise CommandError("--end is before --start")
+
+        created = CalendarDay.populate(start, end)
+        self.stdout.write(f"Added {created} calendar days between {start} and {end}")
+
+        if options['holidays']:
+            flagged = 0
+            with open(options['holidays'], newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    day = _parse((row.get('date') or '').strip())
+                    CalendarDay.ensure_range(day, day)
+                    flagged += CalendarDay.objects.filter(date=day).update(
+                        is_holiday=True,
+                        holiday_name=(row.get('name') or '').strip()[:100],
+                    )
+            self.stdout.write(f"Flagged {flagged} holidays")
+
+        self.stdout.write(self.style.SUCCESS("Calendar populated"))
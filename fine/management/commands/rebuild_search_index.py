@@ -0,0 +1,40 @@
+# fine/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from fine.models import Expense, Income, Purchase, SearchToken
+from fine.models.search_index import uses_token_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SearchToken index (only used when MySQL FULLTEXT search is not)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not uses_token_index():
+            self.stdout.write("Search uses MySQL FULLTEXT indexes; nothing to rebuild.")
+            return
+
+        chunk_size = options['chunk_size']
+        SearchToken.objects.all().delete()
+
+        for doc_type, queryset in (
+            ('expense', Expense.objects.all()),
+            ('income', Income.objects.all()),
+            ('purchase', Purchase.objects.all()),
+        ):
+            count = 0
+            batch = []
+            for obj in queryset.iterator(chunk_size=chunk_size):
+                batch.append(obj)
+                if len(batch) >= chunk_size:
+                    SearchToken.index_documents(doc_type, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                SearchToken.index_documents(doc_type, batch)
+                count += len(batch)
+            self.stdout.write(f"Indexed {count} {doc_type} record(s)")
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
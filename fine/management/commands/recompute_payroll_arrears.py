@@ -0,0 +1,30 @@
+# fine/management/commands/recompute_payroll_arrears.py
+from django.core.management.base import BaseCommand
+
+from fine.utils.payroll_arrears import recompute_dirty_payrolls
+
+
+class Command(BaseCommand):
+    help = "Recompute payrolls marked dirty by attendance changes and print the arrears report"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report only, do not write")
+        parser.add_argument('--limit', type=int, default=None, help="Process at most this many dirty payrolls")
+
+    def handle(self, *args, **options):
+        report = recompute_dirty_payrolls(apply=not options['dry_run'], limit=options['limit'])
+
+        for r in report['records']:
+            self.stdout.write(
+                f"{r['employee_name']} {r['month']:02d}/{r['year']}: "
+                f"worked {r['old_worked_days']} -> {r['new_worked_days']}, "
+                f"net {r['old_net_salary']:.2f} -> {r['new_net_salary']:.2f} "
+                f"(arrears {r['arrears']:+.2f})"
+                + (" [incentive revoked]" if r['incentive_revoked'] else "")
+            )
+
+        action = "Recomputed" if report['applied'] else "Would recompute"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {report['changed']} of {report['checked']} dirty payrolls, "
+            f"total arrears {report['totals']['arrears']:+.2f}"
+        ))
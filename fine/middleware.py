@@ -0,0 +1,172 @@
+# fine/middleware.py
+"""
+Per-request query and latency instrumentation.
+
+QueryMetricsMiddleware wraps every database connection with an execute
+wrapper for the duration of the request and records the query count, the
+time spent in the database and the wall time. The numbers are returned in a
+Server-Timing header (visible in the browser dev tools) and logged as one
+JSON line on the 'fine.requests' logger, and feed the per-URL-name
+histograms in fine/utils/metrics.py.
+
+settings.QUERY_BUDGETS maps view function names to the most queries the view
+may run. Going over budget logs a warning, or raises QueryBudgetExceeded when
+settings.QUERY_BUDGET_RAISE is set (the test suite turns this on).
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .utils import metrics, profiling
+
+logger = logging.getLogger('fine.requests')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its QUERY_BUDGETS entry allows"""
+
+
+class QueryStats:
+    """connection.execute_wrapper that counts queries and the time spent in them"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def view_name(request):
+    """Name of the view function that handled the request, or '' when none resolved"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ''
+    return getattr(match.func, '__name__', None) or match.view_name or ''
+
+
+def query_budget(name):
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(name)
+
+
+class QueryMetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        request.query_stats = stats
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = stats.duration * 1000
+        name = view_name(request)
+        budget = query_budget(name)
+
+        match = getattr(request, 'resolver_match', None)
+        metrics.observe_request(match.url_name if match else None, request.method, wall_ms / 1000, stats.count)
+
+        timing = f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={wall_ms:.1f}'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': name,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(db_ms, 1),
+            'wall_ms': round(wall_ms, 1),
+        }
+        if budget is not None:
+            record['budget'] = budget
+        logger.info(json.dumps(record), extra={'request_metrics': record})
+
+        if budget is not None and stats.count > budget:
+            message = f"{name} ran {stats.count} queries, budget is {budget} ({request.method} {request.path})"
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={'request_metrics': record})
+
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under a profiler when a staff user passes a valid
+    ?__profile=<token> or X-Profile header (see fine/utils/profiling.py).
+    Untriggered requests cost one dict lookup. Must come after
+    AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = profiling.requested_token(request)
+        if not token or not profiling.check_token(token, request.user):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def profile(self, request):
+        import cProfile
+
+        sql_log = profiling.SqlLog()
+        engine = request.GET.get(profiling.ENGINE_PARAM, 'cprofile')
+        pyinstrument_profiler = None
+        if engine == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+                pyinstrument_profiler = Profiler()
+            except ImportError:
+                logger.warning("pyinstrument is not installed; profiling with cProfile")
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sql_log))
+            if pyinstrument_profiler is not None:
+                pyinstrument_profiler.start()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+                if pyinstrument_profiler is not None:
+                    pyinstrument_profiler.stop()
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        name = profiling.save_profile(
+            {
+                'method': request.method,
+                'path': request.get_full_path(),
+                'view': view_name(request),
+                'user': request.user.get_username(),
+                'status': response.status_code,
+                'wall_ms': round(wall_ms, 1),
+                'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            },
+            sql_log,
+            profiler=profiler,
+            html=pyinstrument_profiler.output_html() if pyinstrument_profiler is not None else None,
+        )
+        response['X-Profile-Id'] = name
+        return response
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyPayroll',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(default='attendance', max_length=50)),
+                ('marked_at', models.DateTimeField(auto_now=True)),
+                ('payroll', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dirty_marker', to='fine.payroll')),
+            ],
+            options={
+                'db_table': 'dirty_payroll',
+                'ordering': ['marked_at'],
+            },
+        ),
+    ]
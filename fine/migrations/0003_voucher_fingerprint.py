@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+from fine.utils.fingerprints import voucher_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    Expense = apps.get_model('fine', 'Expense')
+    Purchase = apps.get_model('fine', 'Purchase')
+
+    for model, ref_field, party_field in ((Expense, 'voucher_no', 'category'), (Purchase, 'bill_no', 'vendor')):
+        batch = []
+        for row in model.objects.exclude(**{f'{ref_field}__isnull': True}).exclude(**{ref_field: ''}).iterator(chunk_size=2000):
+            row.fingerprint = voucher_fingerprint(row.date, row.total_amount, getattr(row, ref_field), getattr(row, party_field))
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ['fingerprint'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0002_dirtypayroll'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=40),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
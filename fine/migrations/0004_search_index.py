@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+FULLTEXT_INDEXES = [
+    ('fine_expense', 'expense_fulltext', 'description, voucher_no'),
+    ('fine_income', 'income_fulltext', 'description'),
+    ('fine_purchase', 'purchase_fulltext', 'vendor, bill_no, description'),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for table, name, columns in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({columns})")
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for table, name, _ in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0003_voucher_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('doc_type', models.CharField(choices=[('expense', 'Expense'), ('income', 'Income'), ('purchase', 'Purchase')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('date', models.DateField()),
+            ],
+            options={
+                'db_table': 'search_token',
+                'indexes': [
+                    models.Index(fields=['token', 'date'], name='search_token_lookup'),
+                    models.Index(fields=['doc_type', 'object_id'], name='search_token_doc'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('token', 'doc_type', 'object_id'), name='search_token_unique'),
+                ],
+            },
+        ),
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
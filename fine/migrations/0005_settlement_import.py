@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SettlementImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64, unique=True)),
+                ('filename', models.CharField(max_length=255)),
+                ('channel', models.CharField(blank=True, max_length=50)),
+                ('order_lines', models.PositiveIntegerField(default=0)),
+                ('income_rows', models.PositiveIntegerField(default=0)),
+                ('imported_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'settlement_import',
+                'ordering': ['-imported_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SettlementRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_hash', models.CharField(max_length=64, unique=True)),
+                ('settlement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='fine.settlementimport')),
+            ],
+            options={
+                'db_table': 'settlement_row',
+            },
+        ),
+    ]
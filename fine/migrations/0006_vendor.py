@@ -0,0 +1,52 @@
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_vendors(apps, schema_editor):
+    Purchase = apps.get_model('fine', 'Purchase')
+    Vendor = apps.get_model('fine', 'Vendor')
+
+    # Merge spelling variants; the most used spelling becomes the display name
+    merged = {}
+    for row in Purchase.objects.values('vendor').annotate(n=Count('id'), last=Max('date')):
+        name = ' '.join(str(row['vendor'] or '').split())
+        normalized = name.lower()[:100]
+        if not normalized:
+            continue
+        entry = merged.setdefault(normalized, {'name': name, 'best': 0, 'count': 0, 'last': None})
+        if row['n'] > entry['best']:
+            entry['name'], entry['best'] = name, row['n']
+        entry['count'] += row['n']
+        if row['last'] and (entry['last'] is None or row['last'] > entry['last']):
+            entry['last'] = row['last']
+
+    Vendor.objects.bulk_create([
+        Vendor(name=e['name'][:100], normalized_name=normalized, usage_count=e['count'], last_used=e['last'])
+        for normalized, e in merged.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0005_settlement_import'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vendor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(max_length=100, unique=True)),
+                ('usage_count', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'vendor',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['-usage_count', 'name'], name='vendor_usage')],
+            },
+        ),
+        migrations.RunPython(backfill_vendors, migrations.RunPython.noop),
+    ]
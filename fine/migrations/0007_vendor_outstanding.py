@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_outstanding(apps, schema_editor):
+    Purchase = apps.get_model('fine', 'Purchase')
+    Vendor = apps.get_model('fine', 'Vendor')
+
+    balances = {}
+    for row in Purchase.objects.filter(status__in=['Pending', 'Due']).values('vendor').annotate(total=Sum('total_amount')):
+        normalized = ' '.join(str(row['vendor'] or '').lower().split())[:100]
+        if normalized:
+            balances[normalized] = balances.get(normalized, Decimal('0')) + (row['total'] or Decimal('0'))
+
+    vendors = list(Vendor.objects.filter(normalized_name__in=list(balances)))
+    for vendor in vendors:
+        vendor.outstanding_amount = balances[vendor.normalized_name]
+    Vendor.objects.bulk_update(vendors, ['outstanding_amount'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0006_vendor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['status', 'date'], name='purchase_status_date'),
+        ),
+        migrations.RunPython(backfill_outstanding, migrations.RunPython.noop),
+    ]
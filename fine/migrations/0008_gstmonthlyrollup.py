@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0007_vendor_outstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GstMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('vendor', models.CharField(max_length=100)),
+                ('vendor_key', models.CharField(max_length=100)),
+                ('bill_count', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('gst_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cat', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='gst_rollups', to='fine.cat')),
+            ],
+            options={
+                'db_table': 'gst_monthly_rollup',
+                'ordering': ['year', 'month'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('year', 'month', 'cat', 'vendor_key'), name='gst_rollup_unique'),
+                ],
+            },
+        ),
+    ]
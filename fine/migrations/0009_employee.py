@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize(name):
+    return ' '.join(str(name or '').lower().split())[:100]
+
+
+def backfill_employees(apps, schema_editor):
+    Employee = apps.get_model('fine', 'Employee')
+    tables = [apps.get_model('fine', name) for name in ('Payroll', 'Attendance', 'AttendanceSummary', 'Expense')]
+
+    # Every spelling per normalized key; the payroll spelling wins as display name
+    variants = {}
+    for model in tables:
+        names = model.objects.exclude(employee_name__isnull=True).exclude(employee_name='').values_list(
+            'employee_name', flat=True
+        ).distinct()
+        for name in names:
+            key = normalize(name)
+            if key:
+                entry = variants.setdefault(key, {'name': ' '.join(name.split()).title()[:100], 'spellings': set()})
+                entry['spellings'].add(name)
+
+    Employee.objects.bulk_create(
+        [Employee(name=entry['name'], name_key=key) for key, entry in variants.items()],
+        ignore_conflicts=True,
+    )
+    ids = dict(Employee.objects.values_list('name_key', 'id'))
+
+    for key, entry in variants.items():
+        for model in tables:
+            model.objects.filter(employee_name__in=entry['spellings']).update(employee_id=ids[key])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0008_gstmonthlyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_key', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'employee',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='employee',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attendance_records', to='fine.employee'),
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='employee',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attendance_summaries', to='fine.employee'),
+        ),
+        migrations.AddField(
+            model_name='payroll',
+            name='employee',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='payrolls', to='fine.employee'),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='employee',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='expenses', to='fine.employee'),
+        ),
+        migrations.RunPython(backfill_employees, migrations.RunPython.noop),
+    ]
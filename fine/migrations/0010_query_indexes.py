@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0009_employee'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['record_state', 'date'], name='expense_state_date'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['record_state', 'category', 'date'], name='expense_state_cat_date'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['date'], name='income_date'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['date'], name='purchase_date'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['record_state', 'date'], name='attendance_state_date'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['record_state', 'employee_name', 'date'], name='attendance_state_name_date'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['record_state', 'employee', 'date'], name='attendance_state_emp_date'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['record_state', 'year', 'month'], name='payroll_state_period'),
+        ),
+    ]
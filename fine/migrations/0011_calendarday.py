@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_calendar(apps, schema_editor):
+    CalendarDay = apps.get_model('fine', 'CalendarDay')
+
+    day, end = date(2015, 1, 1), date(2040, 12, 31)
+    rows = []
+    while day <= end:
+        fiscal_year = day.year if day.month >= 4 else day.year - 1
+        rows.append(CalendarDay(
+            date=day,
+            week_start=day - timedelta(days=day.weekday()),
+            month_start=day.replace(day=1),
+            year=day.year,
+            month=day.month,
+            fiscal_year=fiscal_year,
+            fiscal_quarter=(day.month - 4) % 12 // 3 + 1,
+            weekday=day.weekday(),
+        ))
+        day += timedelta(days=1)
+    CalendarDay.objects.bulk_create(rows, batch_size=2000)
+
+
+def calendar_field(date_field='date'):
+    return models.ForeignObject(
+        from_fields=[date_field], null=True, on_delete=django.db.models.deletion.DO_NOTHING,
+        related_name='+', serialize=False, to='fine.calendarday', to_fields=['date'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0010_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarDay',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('week_start', models.DateField(db_index=True)),
+                ('month_start', models.DateField(db_index=True)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('fiscal_quarter', models.PositiveSmallIntegerField()),
+                ('weekday', models.PositiveSmallIntegerField()),
+                ('is_holiday', models.BooleanField(default=False)),
+                ('holiday_name', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'db_table': 'calendar_day',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['fiscal_year', 'fiscal_quarter'], name='calendar_fiscal')],
+            },
+        ),
+        migrations.RunPython(populate_calendar, migrations.RunPython.noop),
+        # Join-only relations: no column is added
+        migrations.AddField(model_name='expense', name='calendar', field=calendar_field()),
+        migrations.AddField(model_name='income', name='calendar', field=calendar_field()),
+        migrations.AddField(model_name='purchase', name='calendar', field=calendar_field()),
+        migrations.AddField(model_name='attendance', name='calendar', field=calendar_field()),
+        migrations.AddField(model_name='payroll', name='calendar', field=calendar_field('salary_date')),
+    ]
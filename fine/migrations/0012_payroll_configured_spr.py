@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from django.core.validators import MinValueValidator
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_configured_spr(apps, schema_editor):
+    Payroll = apps.get_model('fine', 'Payroll')
+    Payroll.objects.update(configured_spr_amount=F('spr_amount'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fine', '0011_calendarday'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='configured_spr_amount',
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=10,
+                validators=[MinValueValidator(Decimal('0'))],
+            ),
+        ),
+        migrations.RunPython(backfill_configured_spr, migrations.RunPython.noop),
+    ]
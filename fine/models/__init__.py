@@ -1,22 +1,37 @@
 # fine/models/__init__.py
+from .calendar_day import CalendarDay
 from .expense import Expense
 from .income import Income
 from .purchase import Purchase, Cat
+from .vendor import Vendor
+from .gst_rollup import GstMonthlyRollup
 from .base import SoftDeleteManager, SoftDeleteModel
+from .employee import Employee
 from .payroll import Payroll
 from .attendance import Attendance
 from .attendance_summary import AttendanceSummary
 from .attendance_summary_manager import AttendanceSummaryManager
+from .dirty_payroll import DirtyPayroll
+from .search_index import SearchToken
+from .settlement import SettlementImport, SettlementRow
 
 __all__ = [
     'SoftDeleteManager',
     'SoftDeleteModel',
+    'Employee',
+    'CalendarDay',
     'Expense',
     'Cat',
     'Income',
     'Purchase',
+    'Vendor',
+    'GstMonthlyRollup',
     'Payroll',
     'Attendance',
     'AttendanceSummary',
     'AttendanceSummaryManager',
+    'DirtyPayroll',
+    'SearchToken',
+    'SettlementImport',
+    'SettlementRow',
 ]
\ No newline at end of file
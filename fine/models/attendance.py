@@ -1,12 +1,18 @@
 # models/attendance.py - Updated with better cascade handling
+from datetime import date as date_cls
 from django.db import models
 from decimal import Decimal
 from .base import SoftDeleteModel
+from .employee import Employee
+from .calendar_day import calendar_relation
 from django.utils import timezone
-from datetime import timedelta
+from ..utils.period_utils import period_bounds
 # from .payroll import Payroll  # Removed to prevent circular import
 # from .attendance_summary import AttendanceSummary  # Removed to prevent circular import
 
+# Stored summary period types and the period they cover
+SUMMARY_PERIODS = (('weekly', 'week'), ('monthly', 'month'))
+
 class Attendance(SoftDeleteModel):
     ATTENDANCE_STATUS_CHOICES = (
         ('present', 'Present'),
@@ -24,7 +30,15 @@ class Attendance(SoftDeleteModel):
     )
     
     employee_name = models.CharField(max_length=100)
+    employee = models.ForeignKey(
+        'Employee',
+        on_delete=models.PROTECT,
+        related_name='attendance_records',
+        null=True,
+        blank=True
+    )
     date = models.DateField()
+    calendar = calendar_relation()
     status = models.CharField(max_length=10, choices=ATTENDANCE_STATUS_CHOICES)
     notes = models.TextField(blank=True, null=True, verbose_name="Additional Notes")
     
@@ -36,10 +50,22 @@ class Attendance(SoftDeleteModel):
         db_table = 'attendance'
         unique_together = ['payroll', 'date', 'record_state']
         ordering = ['-date', 'employee_name']
+        indexes = [
+            models.Index(fields=['record_state', 'date'], name='attendance_state_date'),
+            models.Index(fields=['record_state', 'employee_name', 'date'], name='attendance_state_name_date'),
+            models.Index(fields=['record_state', 'employee', 'date'], name='attendance_state_emp_date'),
+        ]
 
     def __str__(self):
         return f"{self.employee_name} - {self.date} - {self.get_status_display()}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored date so moving a record also marks its old month dirty
+        instance._loaded_date = instance.__dict__.get('date')
+        return instance
+    
     @property
     def attendance_value(self):
         """Returns numeric value for attendance"""
@@ -54,13 +80,19 @@ class Attendance(SoftDeleteModel):
         if self.employee_name:
             self.employee_name = self.employee_name.strip().title()
 
-        # If payroll is missing, try to find it using employee_name
+        # If payroll is missing, try to find it using employee_name, preferring the
+        # payroll for this record's month (the one the arrears engine recomputes)
         if not self.payroll and self.employee_name:
             from .payroll import Payroll
-            payroll_record = Payroll.objects.filter(
+            candidates = Payroll.objects.filter(
                 employee_name=self.employee_name,
                 record_state='active'
-            ).first()
+            )
+            payroll_record = None
+            if self.date:
+                attendance_date = date_cls.fromisoformat(self.date[:10]) if isinstance(self.date, str) else self.date
+                payroll_record = candidates.filter(month=attendance_date.month, year=attendance_date.year).first()
+            payroll_record = payroll_record or candidates.first()
             if payroll_record:
                 self.payroll = payroll_record
         
@@ -71,6 +103,7 @@ class Attendance(SoftDeleteModel):
         # Ensure employee_name is properly formatted
         if self.employee_name:
             self.employee_name = self.employee_name.strip().title()
+            self.employee_id = Employee.resolve_id(self.employee_name)
         
         # Check if payroll is active (if payroll exists)
         if self.payroll and self.payroll.record_state != 'active':
@@ -80,49 +113,37 @@ class Attendance(SoftDeleteModel):
         
         super().save(*args, **kwargs)
         
-        # Trigger summary update after saving attendance (only if active)
-        if self.record_state == 'active':
-            self.update_related_summaries()
+        # Flag already-saved payrolls for the affected month(s) for arrears recomputation
+        self.mark_payroll_dirty()
+        # Summaries are refreshed by the post_save receiver in attendance_summary_manager
     
     def soft_delete(self):
         """Override soft delete to set deleted_at timestamp"""
         self.record_state = 'deleted'
         self.deleted_at = timezone.now()
         self.save()
+    
+    def mark_payroll_dirty(self):
+        """Mark payrolls for this record's current and previously stored month as dirty"""
+        from .dirty_payroll import DirtyPayroll
         
-        # Update summaries when attendance is soft deleted
-        self.update_related_summaries()
+        DirtyPayroll.mark(self.employee_name, [self.date, getattr(self, '_loaded_date', None)])
+        self._loaded_date = self.date
     
     def update_related_summaries(self):
         """Update all related attendance summaries when attendance changes"""
-        # Only update if attendance is active
-        if self.record_state != 'active':
+        from .attendance_summary import AttendanceSummary
+        
+        # Only update if attendance is active; summaries always belong to a payroll
+        if self.record_state != 'active' or not self.payroll_id:
             return
             
-        # Update weekly summary (current week)
-        start_of_week = self.date - timedelta(days=self.date.weekday())
-        end_of_week = start_of_week + timedelta(days=6)
-        
-        AttendanceSummary.generate_summary_for_period(
-            employee_name=self.employee_name,
-            period_type='weekly',
-            start_date=start_of_week,
-            end_date=end_of_week,
-            payroll_id=self.payroll.id if self.payroll else None
-        )
-        
-        # Update monthly summary
-        start_of_month = self.date.replace(day=1)
-        next_month = start_of_month.replace(
-            month=start_of_month.month % 12 + 1, 
-            year=start_of_month.year + (start_of_month.month // 12)
-        )
-        end_of_month = next_month - timedelta(days=1)
-        
-        AttendanceSummary.generate_summary_for_period(
-            employee_name=self.employee_name,
-            period_type='monthly',
-            start_date=start_of_month,
-            end_date=end_of_month,
-            payroll_id=self.payroll.id if self.payroll else None
-        )
\ No newline at end of file
+        for period_type, period in SUMMARY_PERIODS:
+            start_date, end_date = period_bounds(period, self.date)
+            AttendanceSummary.generate_summary_for_period(
+                employee_name=self.employee_name,
+                period_type=period_type,
+                start_date=start_date,
+                end_date=end_date,
+                payroll_id=self.payroll_id
+            )
@@ -1,8 +1,11 @@
 # models/attendance_summary.py - UPDATED VERSION
+import time
 from django.db import models
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from .base import SoftDeleteModel
+from .employee import Employee
+from ..utils import metrics
 # from .payroll import Payroll  # Removed to prevent circular import
 from django.utils import timezone
 
@@ -23,6 +26,13 @@ class AttendanceSummary(SoftDeleteModel):
     )
     
     employee_name = models.CharField(max_length=100)
+    employee = models.ForeignKey(
+        'Employee',
+        on_delete=models.PROTECT,
+        related_name='attendance_summaries',
+        null=True,
+        blank=True
+    )
     period_type = models.CharField(max_length=20, choices=SUMMARY_PERIOD_CHOICES)
     start_date = models.DateField()
     end_date = models.DateField()
@@ -88,6 +98,7 @@ class AttendanceSummary(SoftDeleteModel):
         # Ensure employee_name is properly formatted
         if self.employee_name:
             self.employee_name = self.employee_name.strip().title()
+            self.employee_id = Employee.resolve_id(self.employee_name)
         
         super().save(*args, **kwargs)
     
@@ -102,6 +113,7 @@ class AttendanceSummary(SoftDeleteModel):
     def generate_summary_for_period(cls, employee_name, period_type, start_date, end_date, payroll_id=None):
         """Generate and save summary for a specific period"""
         from ..models.attendance import Attendance
+        started = time.perf_counter()
         
         # Get payroll record if payroll_id provided
         payroll = None
@@ -117,7 +129,6 @@ class AttendanceSummary(SoftDeleteModel):
         total_days = (end_date - start_date).days + 1
         
         # Get attendance records for the period
-        from ..models.attendance import Attendance
         attendance_records = Attendance.objects.filter(
             employee_name=employee_name,
             date__range=[start_date, end_date],
@@ -149,4 +160,5 @@ class AttendanceSummary(SoftDeleteModel):
             }
         )
         
+        metrics.observe_summary(period_type, created, time.perf_counter() - started)
         return summary, created
\ No newline at end of file
@@ -1,9 +1,12 @@
 # models/attendance_summary_manager.py - FIXED VERSION
 from django.db.models.signals import post_save, post_delete
+from django.db.models import Max, Min
 from django.dispatch import receiver
-from datetime import date, timedelta
-from .attendance import Attendance
+from datetime import date
+from ..utils.period_utils import period_bounds
+from .attendance import Attendance, SUMMARY_PERIODS
 from .attendance_summary import AttendanceSummary
+from .calendar_day import CalendarDay
 
 class AttendanceSummaryManager:
     """Manager class for handling attendance summary operations"""
@@ -21,28 +24,16 @@ class AttendanceSummaryManager:
     @staticmethod
     def get_summary_for_period(employee_name, period_type, reference_date=None):
         """Get summary for a specific period type"""
-        from datetime import datetime
-        
         if not reference_date:
             reference_date = date.today()
         
-        start_date = end_date = reference_date
-        
-        if period_type == 'weekly':
-            start_date = reference_date - timedelta(days=reference_date.weekday())
-            end_date = start_date + timedelta(days=6)
-        elif period_type == 'monthly':
-            start_date = reference_date.replace(day=1)
-            next_month = start_date.replace(
-                month=start_date.month % 12 + 1, 
-                year=start_date.year + (start_date.month // 12)
-            )
-            end_date = next_month - timedelta(days=1)
-        elif period_type == 'custom':
+        if period_type == 'custom':
             # For custom, we need both start and end dates
             # This method shouldn't be called for custom without dates
             raise ValueError("Custom period requires explicit start and end dates")
         
+        start_date, end_date = period_bounds(dict(SUMMARY_PERIODS)[period_type], reference_date)
+        
         try:
             return AttendanceSummary.objects.get(
                 employee_name=employee_name,
@@ -91,96 +82,51 @@ class AttendanceSummaryManager:
         # Delete all existing summaries
         AttendanceSummary.objects.all().delete()
         
-        # Get all attendance records grouped by employee
-        employees = Attendance.objects.values_list('employee_name', flat=True).distinct()
-        
         total_regenerated = 0
         
-        for employee in employees:
-            # Get all dates for this employee
-            dates = Attendance.objects.filter(
-                employee_name=employee
-            ).values_list('date', flat=True).distinct()
-            
-            if not dates:
-                continue
-            
-            min_date = min(dates)
-            max_date = max(dates)
-            
-            # Generate weekly summaries
-            current_date = min_date
-            while current_date <= max_date:
-                start_of_week = current_date - timedelta(days=current_date.weekday())
-                end_of_week = start_of_week + timedelta(days=6)
-                
-                AttendanceSummary.generate_summary_for_period(
-                    employee_name=employee,
-                    period_type='weekly',
-                    start_date=start_of_week,
-                    end_date=end_of_week
-                )
-                total_regenerated += 1
-                
-                # Move to next week
-                current_date = end_of_week + timedelta(days=1)
+        bounds = Attendance.objects.aggregate(lo=Min('date'), hi=Max('date'))
+        if bounds['lo'] is None:
+            return total_regenerated
+        CalendarDay.ensure_range(bounds['lo'], bounds['hi'])
+        
+        # Every (employee, week) and (employee, month) with attendance under an active payroll,
+        # bucketed on the calendar table. Summaries always belong to a payroll; a week spanning
+        # two payroll months takes the later one.
+        with_payroll = Attendance.objects.filter(payroll__record_state='active')
+        for period_type, period in SUMMARY_PERIODS:
+            bucket_field = 'calendar__week_start' if period == 'week' else 'calendar__month_start'
+            buckets = with_payroll.values('employee_name', bucket_field).annotate(
+                bucket_payroll=Max('payroll_id')
+            ).values_list('employee_name', bucket_field, 'bucket_payroll').order_by()
             
-            # Generate monthly summaries
-            current_date = min_date.replace(day=1)
-            while current_date <= max_date:
-                start_of_month = current_date.replace(day=1)
-                next_month = start_of_month.replace(
-                    month=start_of_month.month % 12 + 1,
-                    year=start_of_month.year + (start_of_month.month // 12)
-                )
-                end_of_month = next_month - timedelta(days=1)
-                
+            for employee, period_start, payroll_id in buckets:
+                start_date, end_date = period_bounds(period, period_start)
                 AttendanceSummary.generate_summary_for_period(
                     employee_name=employee,
-                    period_type='monthly',
-                    start_date=start_of_month,
-                    end_date=end_of_month
+                    period_type=period_type,
+                    start_date=start_date,
+                    end_date=end_date,
+                    payroll_id=payroll_id
                 )
                 total_regenerated += 1
-                
-                # Move to next month
-                current_date = next_month
         
         return total_regenerated
 
 # Signals to auto-update summaries
 @receiver(post_save, sender=Attendance)
 def update_summary_on_attendance_save(sender, instance, created, **kwargs):
-    """Signal to update summaries when attendance is saved"""
+    """Signal to update summaries when attendance is saved (the only save-time trigger)"""
     instance.update_related_summaries()
 
 @receiver(post_delete, sender=Attendance)
 def update_summary_on_attendance_delete(sender, instance, **kwargs):
     """Signal to update summaries when attendance is deleted"""
-    # Update weekly summary
-    start_of_week = instance.date - timedelta(days=instance.date.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-    
-    AttendanceSummary.generate_summary_for_period(
-        employee_name=instance.employee_name,
-        period_type='weekly',
-        start_date=start_of_week,
-        end_date=end_of_week,
-        payroll_id=instance.payroll.id if instance.payroll else None
-    )
-    
-    # Update monthly summary
-    start_of_month = instance.date.replace(day=1)
-    next_month = start_of_month.replace(
-        month=start_of_month.month % 12 + 1,
-        year=start_of_month.year + (start_of_month.month // 12)
-    )
-    end_of_month = next_month - timedelta(days=1)
-    
-    AttendanceSummary.generate_summary_for_period(
-        employee_name=instance.employee_name,
-        period_type='monthly',
-        start_date=start_of_month,
-        end_date=end_of_month,
-        payroll_id=instance.payroll.id if instance.payroll else None
-    )
\ No newline at end of file
+    for period_type, period in SUMMARY_PERIODS:
+        start_date, end_date = period_bounds(period, instance.date)
+        AttendanceSummary.generate_summary_for_period(
+            employee_name=instance.employee_name,
+            period_type=period_type,
+            start_date=start_date,
+            end_date=end_date,
+            payroll_id=instance.payroll.id if instance.payroll else None
+        )
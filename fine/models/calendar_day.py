@@ -0,0 +1,143 @@
+# models/calendar_day.py
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import models
+from django.db.models import F, Max, Min, Sum
+
+from ..utils import metrics
+from ..utils.period_utils import fiscal_quarter_of, fiscal_year_of, range_filter
+
+# Calendar columns a report can bucket on
+BUCKET_FIELDS = {
+    'day': ('date',),
+    'week': ('week_start',),
+    'month': ('month_start',),
+    'year': ('year',),
+    'fiscal_quarter': ('fiscal_year', 'fiscal_quarter'),
+    'fiscal_year': ('fiscal_year',),
+}
+
+# Range created by the migration; ensure_range extends it on demand
+DEFAULT_START = date(2015, 1, 1)
+DEFAULT_END = date(2040, 12, 31)
+
+BOUNDS_CACHE_KEY = 'calendar_day:bounds'
+
+
+def calendar_relation(date_field='date'):
+    """
+    Join from a model's date column to its CalendarDay row. No column is
+    added; queries can group on calendar__week_start, calendar__fiscal_year, ...
+    """
+    return models.ForeignObject(
+        'CalendarDay',
+        on_delete=models.DO_NOTHING,
+        from_fields=[date_field],
+        to_fields=['date'],
+        related_name='+',
+        null=True,
+        serialize=False,
+    )
+
+
+class CalendarDay(models.Model):
+    """
+    Date dimension: one pre-populated row per day with its week, month and
+    financial-year (April-March) buckets, so reports group in SQL instead
+    of looping over periods in Python.
+    """
+    date = models.DateField(primary_key=True)
+    week_start = models.DateField(db_index=True)  # ISO week, Monday
+    month_start = models.DateField(db_index=True)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    fiscal_year = models.PositiveSmallIntegerField()
+    fiscal_quarter = models.PositiveSmallIntegerField()
+    weekday = models.PositiveSmallIntegerField()  # 0 = Monday
+    is_holiday = models.BooleanField(default=False)
+    holiday_name = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        db_table = 'calendar_day'
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['fiscal_year', 'fiscal_quarter'], name='calendar_fiscal'),
+        ]
+
+    def __str__(self):
+        return self.date.isoformat()
+
+    @classmethod
+    def for_date(cls, day):
+        """Unsaved row for day"""
+        return cls(
+            date=day,
+            week_start=day - timedelta(days=day.weekday()),
+            month_start=day.replace(day=1),
+            year=day.year,
+            month=day.month,
+            fiscal_year=fiscal_year_of(day),
+            fiscal_quarter=fiscal_quarter_of(day),
+            weekday=day.weekday(),
+        )
+
+    @classmethod
+    def populate(cls, start, end, batch_size=2000):
+        """
+        Insert the missing days in [start, end] (inclusive) and return how many
+        were added; existing rows keep their holiday flags
+        """
+        created = 0
+        batch_start = start
+        while batch_start <= end:
+            batch_end = min(batch_start + timedelta(days=batch_size - 1), end)
+            existing = set(cls.objects.filter(date__range=(batch_start, batch_end)).values_list('date', flat=True))
+            missing = [
+                cls.for_date(day)
+                for day in (batch_start + timedelta(days=i) for i in range((batch_end - batch_start).days + 1))
+                if day not in existing
+            ]
+            # ignore_conflicts only matters when another process fills the same days concurrently
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            created += len(missing)
+            batch_start = batch_end + timedelta(days=1)
+        cache.delete(BOUNDS_CACHE_KEY)
+        return created
+
+    @classmethod
+    def ensure_range(cls, start, end):
+        """Make sure every day in [start, end] has a row, keeping the table gapless"""
+        bounds = cache.get(BOUNDS_CACHE_KEY)
+        metrics.record_cache('calendar_bounds', bounds is not None)
+        if bounds is None:
+            agg = cls.objects.aggregate(lo=Min('date'), hi=Max('date'))
+            bounds = (agg['lo'], agg['hi'])
+            cache.set(BOUNDS_CACHE_KEY, bounds, 60 * 60 * 24)
+
+        lo, hi = bounds
+        if lo is not None and lo <= start and end <= hi:
+            return
+        cls.populate(min(start, lo or start), max(end, hi or end))
+
+    @classmethod
+    def group_totals(cls, queryset, bucket, amount_field, start, end, date_field='date'):
+        """
+        {bucket key: total} of amount_field over the half-open [start, end)
+        of date_field, grouped on the calendar join in one query. Keys are dates for
+        day/week/month, ints for year/fiscal_year and (fiscal_year, quarter)
+        tuples for fiscal_quarter.
+        """
+        fields = BUCKET_FIELDS[bucket]
+        cls.ensure_range(start, end - timedelta(days=1))
+
+        keys = {f'b{i}': F(f'calendar__{name}') for i, name in enumerate(fields)}
+        rows = (
+            queryset.filter(**range_filter(start, end, field=date_field))
+            .values(**keys)
+            .annotate(total=Sum(amount_field))
+            .order_by(*keys)
+        )
+        if len(fields) == 1:
+            return {row['b0']: row['total'] or 0 for row in rows}
+        return {tuple(row[k] for k in keys): row['total'] or 0 for row in rows}
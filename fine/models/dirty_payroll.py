@@ -0,0 +1,57 @@
+# models/dirty_payroll.py
+from datetime import date as date_cls
+from django.db import models
+from django.db.models import Q
+
+
+class DirtyPayroll(models.Model):
+    """
+    Marks a payroll whose month had attendance changed after it was saved.
+    The arrears engine recomputes only these payrolls and then clears the marks.
+    """
+    payroll = models.OneToOneField(
+        'Payroll',
+        on_delete=models.CASCADE,
+        related_name='dirty_marker'
+    )
+    reason = models.CharField(max_length=50, default='attendance')
+    marked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dirty_payroll'
+        ordering = ['marked_at']
+
+    def __str__(self):
+        return f"Dirty payroll #{self.payroll_id} ({self.reason})"
+
+    @classmethod
+    def mark(cls, employee_name, dates, reason='attendance'):
+        """Mark the payrolls covering the given attendance dates as dirty"""
+        from .payroll import Payroll
+
+        if not employee_name:
+            return 0
+
+        months = set()
+        for d in dates:
+            if not d:
+                continue
+            if isinstance(d, str):
+                d = date_cls.fromisoformat(d[:10])
+            months.add((d.month, d.year))
+
+        if not months:
+            return 0
+
+        month_filter = Q()
+        for month, year in months:
+            month_filter |= Q(month=month, year=year)
+
+        payroll_ids = Payroll.objects.filter(
+            month_filter,
+            employee_name__iexact=employee_name.strip()
+        ).values_list('id', flat=True)
+
+        markers = [cls(payroll_id=payroll_id, reason=reason) for payroll_id in payroll_ids]
+        cls.objects.bulk_create(markers, ignore_conflicts=True)
+        return len(markers)
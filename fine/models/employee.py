@@ -0,0 +1,47 @@
+# models/employee.py
+from django.db import IntegrityError, models, transaction
+
+from ..utils.fingerprints import normalize_ref
+
+
+class Employee(models.Model):
+    """
+    Employee dimension. Attendance, summaries, payroll and salary expenses
+    point here by integer id; employee_name stays on those rows for display.
+    """
+    name = models.CharField(max_length=100)
+    name_key = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'employee'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return normalize_ref(name)[:100]
+
+    @classmethod
+    def resolve_id(cls, name):
+        """Id of the employee with this name, creating the employee if needed"""
+        key = cls.normalize(name)
+        if not key:
+            return None
+
+        employee_id = cls.objects.filter(name_key=key).values_list('id', flat=True).first()
+        if employee_id is None:
+            try:
+                with transaction.atomic():
+                    employee_id = cls.objects.create(name=' '.join(str(name).split()).title()[:100], name_key=key).id
+            except IntegrityError:
+                employee_id = cls.objects.get(name_key=key).id
+        return employee_id
+
+    @classmethod
+    def ids_for(cls, names):
+        """{name_key: id} for existing employees among the given names, in one query"""
+        keys = {cls.normalize(n) for n in names if n}
+        return dict(cls.objects.filter(name_key__in=keys).values_list('name_key', 'id'))
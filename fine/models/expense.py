@@ -2,6 +2,10 @@
 from django.db import models
 from django.utils import timezone
 from .base import SoftDeleteModel, SoftDeleteManager
+from .employee import Employee
+from .search_index import SearchToken
+from .calendar_day import calendar_relation
+from ..utils.fingerprints import voucher_fingerprint
 
 
 class Expense(SoftDeleteModel):
@@ -36,6 +40,7 @@ class Expense(SoftDeleteModel):
     ]
 
     date = models.DateField(default=timezone.now)
+    calendar = calendar_relation()
     voucher_no = models.CharField(max_length=50, blank=True, null=True)
     category = models.CharField(max_length=100, choices=CATEGORY_CHOICES)
     description = models.TextField(blank=True, null=True)
@@ -59,6 +64,16 @@ class Expense(SoftDeleteModel):
         related_name='expenses'
     )
     employee_name = models.CharField(max_length=100, blank=True, null=True)
+    employee = models.ForeignKey(
+        'Employee',
+        on_delete=models.PROTECT,
+        related_name='expenses',
+        null=True,
+        blank=True
+    )
+
+    # Hash of (date, amount, voucher_no, category) for duplicate detection; empty without a voucher
+    fingerprint = models.CharField(max_length=40, blank=True, default='', db_index=True, editable=False)
 
     # Custom managers for soft delete support
     objects = SoftDeleteManager()
@@ -66,12 +81,33 @@ class Expense(SoftDeleteModel):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # record_state leads because SoftDeleteManager adds it to every query
+            models.Index(fields=['record_state', 'date'], name='expense_state_date'),
+            models.Index(fields=['record_state', 'category', 'date'], name='expense_state_cat_date'),
+        ]
 
     def save(self, *args, **kwargs):
         # Set default record state to active if not provided
         if not self.record_state:
             self.record_state = 'active'
+        self.fingerprint = self.compute_fingerprint()
+        self.employee_id = Employee.resolve_id(self.employee_name) if self.employee_name else None
         super().save(*args, **kwargs)
+        SearchToken.index_document('expense', self)
+
+    def compute_fingerprint(self):
+        return voucher_fingerprint(self.date, self.total_amount, self.voucher_no, self.category)
+
+    @classmethod
+    def find_duplicate(cls, fingerprint, exclude_id=None):
+        """Active expense with the same fingerprint (indexed lookup), if any"""
+        if not fingerprint:
+            return None
+        duplicates = cls.objects.filter(fingerprint=fingerprint)
+        if exclude_id:
+            duplicates = duplicates.exclude(id=exclude_id)
+        return duplicates.first()
 
     def __str__(self):
         return f"Exp: {self.category} - ₹{self.total_amount}"
\ No newline at end of file
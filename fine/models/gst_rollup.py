@@ -0,0 +1,76 @@
+# models/gst_rollup.py
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+from ..utils.fingerprints import normalize_ref
+
+
+class GstMonthlyRollup(models.Model):
+    """
+    Monthly purchase and GST input totals per (category, vendor), kept current
+    by Purchase.save/delete so GST summaries read a few rows instead of
+    scanning the purchase history.
+    """
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    cat = models.ForeignKey('Cat', on_delete=models.CASCADE, related_name='gst_rollups')
+    vendor = models.CharField(max_length=100)
+    vendor_key = models.CharField(max_length=100)
+    bill_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    gst_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'gst_monthly_rollup'
+        ordering = ['year', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month', 'cat', 'vendor_key'], name='gst_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"GST {self.month:02d}/{self.year} {self.vendor}: ₹{self.gst_amount}"
+
+    @staticmethod
+    def vendor_key_for(vendor):
+        return normalize_ref(vendor)[:100]
+
+    @classmethod
+    def apply_change(cls, old, new):
+        """
+        Move a purchase's contribution from old to new. Each side is a dict
+        with year, month, cat_id, vendor, total_amount and gst_amount, or None.
+        """
+        if old == new:
+            return
+        for contribution, sign in ((old, -1), (new, 1)):
+            if contribution:
+                cls._add(contribution, sign)
+
+    @classmethod
+    def _add(cls, c, sign):
+        key = {
+            'year': c['year'],
+            'month': c['month'],
+            'cat_id': c['cat_id'],
+            'vendor_key': cls.vendor_key_for(c['vendor']),
+        }
+        changes = {
+            'bill_count': F('bill_count') + sign,
+            'total_amount': F('total_amount') + sign * c['total_amount'],
+            'gst_amount': F('gst_amount') + sign * c['gst_amount'],
+        }
+        if cls.objects.filter(**key).update(**changes) or sign < 0:
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    **key,
+                    vendor=' '.join(str(c['vendor']).split())[:100],
+                    bill_count=1,
+                    total_amount=c['total_amount'],
+                    gst_amount=c['gst_amount'],
+                )
+        except IntegrityError:
+            # Another request created the row first
+            cls.objects.filter(**key).update(**changes)
@@ -1,5 +1,14 @@
-from django.db import models
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Q, Sum
 from django.utils import timezone
+from .search_index import SearchToken
+from .calendar_day import calendar_relation
+from ..utils import metrics
 
 class Income(models.Model):
     PAYMENT_MODE_CHOICES = [
@@ -17,11 +26,71 @@ class Income(models.Model):
     ]
 
     date = models.DateField(default=timezone.now)
+    calendar = calendar_relation()
     description = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_mode = models.CharField(max_length=50, choices=PAYMENT_MODE_CHOICES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Received')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='income_date'),
+        ]
+
     def __str__(self):
-        return f"Inc: {self.description} - ₹{self.amount}"
\ No newline at end of file
+        return f"Inc: {self.description} - ₹{self.amount}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        SearchToken.index_document('income', self)
+        self.invalidate_summary()
+
+    def delete(self, *args, **kwargs):
+        object_id = self.pk
+        result = super().delete(*args, **kwargs)
+        SearchToken.remove_document('income', object_id)
+        self.invalidate_summary()
+        return result
+
+    @staticmethod
+    def summary_cache_key(day):
+        return f"income_summary:{day.isoformat()}"
+
+    @classmethod
+    def get_summary_totals(cls, today=None):
+        """
+        Today / yesterday / week-to-date / month-to-date totals for the income
+        page cards, cached per day. Computed in one conditional aggregate over
+        the smallest range covering all four cards on a cache miss.
+        """
+        today = today or timezone.now().date()
+        key = cls.summary_cache_key(today)
+        totals = cache.get(key)
+        metrics.record_cache('income_summary', totals is not None)
+        if totals is None:
+            yesterday = today - timedelta(days=1)
+            start_of_week = today - timedelta(days=today.weekday())
+            start_of_month = today.replace(day=1)
+
+            totals = cls.objects.filter(
+                date__gte=min(yesterday, start_of_week, start_of_month)
+            ).aggregate(
+                daily_total=Sum('amount', filter=Q(date=today)),
+                yesterday_total=Sum('amount', filter=Q(date=yesterday)),
+                weekly_total=Sum('amount', filter=Q(date__gte=start_of_week)),
+                monthly_total=Sum('amount', filter=Q(date__gte=start_of_month)),
+            )
+            totals = {name: value or Decimal('0') for name, value in totals.items()}
+            cache.set(key, totals, getattr(settings, 'TOTALS_CACHE_TIMEOUT', 60))
+        return totals
+
+    @classmethod
+    def invalidate_summary(cls):
+        """
+        Drop today's cached summary once the write commits; called on every income
+        write. Other workers only see this with a shared cache, so entries also
+        expire after settings.TOTALS_CACHE_TIMEOUT.
+        """
+        key = cls.summary_cache_key(timezone.now().date())
+        transaction.on_commit(lambda: cache.delete(key))
\ No newline at end of file
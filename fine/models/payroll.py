@@ -1,9 +1,15 @@
 # payroll.py - Fix worked days calculation
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 from django.utils import timezone
 from .base import SoftDeleteModel, SoftDeleteManager
+from .employee import Employee
+from .calendar_day import calendar_relation
+from ..utils import metrics
 
 class Payroll(SoftDeleteModel):
     PAYMENT_SPLIT_CHOICES = (
@@ -18,8 +24,20 @@ class Payroll(SoftDeleteModel):
     ]
     
     employee_name = models.CharField(max_length=100)
+    employee = models.ForeignKey(
+        'Employee',
+        on_delete=models.PROTECT,
+        related_name='payrolls',
+        null=True,
+        blank=True
+    )
     basic_pay = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal('0'))])
     spr_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, validators=[MinValueValidator(Decimal('0'))])
+    # Incentive as entered; spr_amount is what is paid, and drops to 0 while worked days are too low
+    configured_spr_amount = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0,
+        validators=[MinValueValidator(Decimal('0'))], editable=False
+    )
     net_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0, validators=[MinValueValidator(Decimal('0'))])
     
     # Worked days field (for internal calculation only, not displayed in UI)
@@ -56,6 +74,7 @@ class Payroll(SoftDeleteModel):
     )
     
     salary_date = models.DateField()
+    calendar = calendar_relation('salary_date')
     month = models.PositiveIntegerField()
     year = models.PositiveIntegerField()
     
@@ -70,35 +89,94 @@ class Payroll(SoftDeleteModel):
     objects = SoftDeleteManager()
     all_objects = models.Manager()
     
+    # Incentives (SPR) are only paid above this many worked days
+    INCENTIVE_MIN_WORKED_DAYS = Decimal('28')
+    
     class Meta:
         db_table = 'payroll'
         unique_together = ['employee_name', 'month', 'year', 'record_state']
         ordering = ['-year', '-month', 'employee_name']
+        indexes = [
+            models.Index(fields=['record_state', 'year', 'month'], name='payroll_state_period'),
+        ]
 
     def __str__(self):
         return f"{self.employee_name} - {self.month}/{self.year} - ₹{self.net_salary}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored month so moving a payroll also refreshes the old month's totals
+        instance._loaded_period = (instance.__dict__.get('month'), instance.__dict__.get('year'))
+        return instance
+
+    @staticmethod
+    def month_totals_cache_key(month, year):
+        return f"payroll_totals:{int(year)}-{int(month):02d}"
+
+    @classmethod
+    def get_month_totals(cls, month, year):
+        """
+        Totals for the payroll page summary cards, cached per (month, year).
+        Computed in a single multi-aggregate query on a cache miss. Writes drop
+        the key, but with the default per-process cache only in the writing
+        worker, so entries also expire after settings.TOTALS_CACHE_TIMEOUT.
+        """
+        key = cls.month_totals_cache_key(month, year)
+        totals = cache.get(key)
+        metrics.record_cache('payroll_totals', totals is not None)
+        if totals is None:
+            totals = cls.objects.filter(month=month, year=year).aggregate(
+                total_basic_pay=Sum('basic_pay'),
+                total_spr=Sum('spr_amount'),
+                total_cash=Sum('cash_amount'),
+                total_bank=Sum('bank_transfer_amount'),
+                total_net_payable=Sum('net_salary'),
+            )
+            totals = {name: value or Decimal('0') for name, value in totals.items()}
+            cache.set(key, totals, getattr(settings, 'TOTALS_CACHE_TIMEOUT', 60))
+        return totals
+
+    def invalidate_month_totals(self):
+        """
+        Drop the cached totals for this payroll's month, and for the month it was
+        loaded with if it moved, once the write commits (a reader refilling the key
+        before the commit would cache the old totals again)
+        """
+        periods = {(self.month, self.year), getattr(self, '_loaded_period', (None, None))}
+        keys = [self.month_totals_cache_key(month, year) for month, year in periods if month and year]
+        self._loaded_period = (self.month, self.year)
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @staticmethod
+    def worked_days_for(payroll_ids):
+        """
+        {payroll_id: worked days} from the active attendance linked to each payroll,
+        in one grouped query. The single definition of worked days, shared by
+        save(), the arrears engine and the payroll simulator.
+        """
+        from .attendance import Attendance
+        
+        stats = Attendance.objects.filter(payroll_id__in=list(payroll_ids)).values('payroll_id').annotate(
+            p_count=Count('id', filter=Q(status='present')),
+            h_count=Count('id', filter=Q(status='half_day')),
+        ).order_by()
+        return {
+            s['payroll_id']: Decimal(s['p_count']) + Decimal(s['h_count']) * Decimal('0.5')
+            for s in stats
+        }
+
     def calculate_worked_days(self):
         """
         Calculate total worked days based on linked attendance records.
         """
-        try:
-            # Use the related_name from the Attendance model's ForeignKey
-            attendance_records = self.attendance_records.filter(record_state='active')
-            
-            total_worked = Decimal('0.0')
-            for record in attendance_records:
-                if record.status == 'present':
-                    total_worked += Decimal('1.0')
-                elif record.status == 'half_day':
-                    total_worked += Decimal('0.5')
-                    
-            print(f"Calculated worked days for {self.employee_name}: {total_worked}")
-            return total_worked
-            
-        except Exception as e:
-            print(f"Error calculating worked days: {e}")
+        if not self.pk:
             return Decimal('0.0')
+        return self.worked_days_for([self.pk]).get(self.pk, Decimal('0.0'))
+
+    def incentive_eligible(self):
+        return Decimal(str(self.worked_days)) > self.INCENTIVE_MIN_WORKED_DAYS
 
     def calculate_salary(self):
         """Calculate net salary and payment splits"""
@@ -139,19 +217,18 @@ class Payroll(SoftDeleteModel):
         worked_days_decimal = Decimal(str(self.worked_days))
         spr_amount_decimal = Decimal(str(self.spr_amount))
         
-        if worked_days_decimal <= Decimal('28') and spr_amount_decimal > Decimal('0'):
+        if worked_days_decimal <= self.INCENTIVE_MIN_WORKED_DAYS and spr_amount_decimal > Decimal('0'):
             raise ValueError(f"Incentives are only allowed when worked days > 28. Current worked days: {self.worked_days}")
 
-    def create_expenses(self):
-        """Create expense records for salary payments"""
+    def build_salary_expenses(self):
+        """Unsaved Salary expense rows for the cash and bank transfer portions"""
         from .expense import Expense
         
-        # Delete any existing expense records for this payroll
-        Expense.objects.filter(payroll=self).delete()
+        expenses = []
         
-        # Create expense for cash payment if amount > 0
+        # Expense for cash payment if amount > 0
         if self.cash_amount > Decimal('0'):
-            Expense.objects.create(
+            expenses.append(Expense(
                 date=self.salary_date,
                 category='Salary',
                 description=f"Salary payment to {self.employee_name} - Cash portion",
@@ -161,12 +238,13 @@ class Payroll(SoftDeleteModel):
                 total_amount=self.cash_amount,
                 payment_method='Cash',
                 payroll=self,
-                employee_name=self.employee_name
-            )
+                employee_name=self.employee_name,
+                employee_id=self.employee_id
+            ))
         
-        # Create expense for bank transfer if amount > 0
+        # Expense for bank transfer if amount > 0
         if self.bank_transfer_amount > Decimal('0'):
-            Expense.objects.create(
+            expenses.append(Expense(
                 date=self.salary_date,
                 category='Salary',
                 description=f"Salary payment to {self.employee_name} - Bank Transfer portion",
@@ -176,8 +254,21 @@ class Payroll(SoftDeleteModel):
                 total_amount=self.bank_transfer_amount,
                 payment_method='Bank Transfer',
                 payroll=self,
-                employee_name=self.employee_name
-            )
+                employee_name=self.employee_name,
+                employee_id=self.employee_id
+            ))
+        
+        return expenses
+
+    def create_expenses(self):
+        """Create expense records for salary payments"""
+        from .expense import Expense
+        
+        # Delete any existing expense records for this payroll
+        Expense.objects.filter(payroll=self).delete()
+        
+        for expense in self.build_salary_expenses():
+            expense.save()
         
         self.expenses_created = True
         self.save(update_fields=['expenses_created'])
@@ -188,6 +279,8 @@ class Payroll(SoftDeleteModel):
             self.month = self.salary_date.month
             self.year = self.salary_date.year
         
+        self.employee_id = Employee.resolve_id(self.employee_name)
+        
         # Calculate worked days from attendance
         self.worked_days = self.calculate_worked_days()
         
@@ -198,6 +291,11 @@ class Payroll(SoftDeleteModel):
             # Re-raise the error to be caught by the view
             raise e
         
+        # While the incentive is payable spr_amount is the entered value; otherwise it is
+        # 0 (validated above) and the configured amount is kept for the arrears engine
+        if self.incentive_eligible():
+            self.configured_spr_amount = self.spr_amount
+        
         # Calculate salary and payment splits
         self.calculate_salary()
         
@@ -209,6 +307,9 @@ class Payroll(SoftDeleteModel):
         is_new = self.pk is None
         super().save(*args, **kwargs)
         
+        # Soft delete and restore also go through save()
+        self.invalidate_month_totals()
+        
         # Create expenses after saving (for new payrolls)
         if is_new and self.net_salary > Decimal('0'):
             self.create_expenses()
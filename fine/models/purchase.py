@@ -1,5 +1,14 @@
-from django.db import models
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.utils import timezone
+from ..utils.fingerprints import voucher_fingerprint
+from ..utils.reference_data import bump_generation
+from .search_index import SearchToken
+from .vendor import Vendor
+from .gst_rollup import GstMonthlyRollup
+from .calendar_day import calendar_relation
 
 
 class Cat(models.Model):
@@ -8,6 +17,16 @@ class Cat(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Other workers must not reload the dropdowns before the row is visible to them
+        transaction.on_commit(bump_generation)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(bump_generation)
+        return result
+
 
 class Purchase(models.Model):
     # Status choices matching the options in your HTML modal
@@ -26,6 +45,7 @@ class Purchase(models.Model):
     ]
 
     date = models.DateField(default=timezone.now)
+    calendar = calendar_relation()
     vendor = models.CharField(max_length=100)
     cat = models.ForeignKey(Cat, on_delete=models.PROTECT)
     bill_no = models.CharField(max_length=50)
@@ -49,5 +69,105 @@ class Purchase(models.Model):
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Hash of (date, amount, bill_no, vendor) for duplicate detection; empty without a bill number
+    fingerprint = models.CharField(max_length=40, blank=True, default='', db_index=True, editable=False)
+
+    # Purchases in these states count towards the vendor's outstanding balance
+    OUTSTANDING_STATUSES = ('Pending', 'Due')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'date'], name='purchase_status_date'),
+            models.Index(fields=['date'], name='purchase_date'),
+        ]
+
     def __str__(self):
-        return f"Pur: {self.vendor} - ₹{self.total_amount}"
\ No newline at end of file
+        return f"Pur: {self.vendor} - ₹{self.total_amount}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored contributions so edits adjust the vendor balance and GST rollup by the delta
+        instance._loaded_outstanding = instance.outstanding_contribution()
+        instance._loaded_gst = instance.gst_contribution()
+        instance._loaded_vendor = instance.__dict__.get('vendor')
+        return instance
+
+    def outstanding_contribution(self):
+        """(vendor, amount owed) for this purchase; the amount is 0 unless Pending/Due"""
+        fields = self.__dict__
+        if 'vendor' not in fields or 'status' not in fields or 'total_amount' not in fields:
+            return None
+        amount = Decimal(str(fields['total_amount'] or 0)) if fields['status'] in self.OUTSTANDING_STATUSES else Decimal('0')
+        return fields['vendor'], amount
+
+    def gst_contribution(self):
+        """This purchase's share of its GstMonthlyRollup row"""
+        fields = self.__dict__
+        if any(name not in fields for name in ('date', 'vendor', 'cat_id', 'total_amount', 'gst_amount')):
+            return None
+        purchase_date = fields['date']
+        if isinstance(purchase_date, datetime):
+            purchase_date = purchase_date.date()
+        elif isinstance(purchase_date, str):
+            purchase_date = date.fromisoformat(purchase_date[:10])
+        if not purchase_date or not fields['cat_id']:
+            return None
+        return {
+            'year': purchase_date.year,
+            'month': purchase_date.month,
+            'cat_id': fields['cat_id'],
+            'vendor': fields['vendor'],
+            'total_amount': Decimal(str(fields['total_amount'] or 0)),
+            'gst_amount': Decimal(str(fields['gst_amount'] or 0)),
+        }
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        self.fingerprint = self.compute_fingerprint()
+        # The vendor balance and GST rollup must move with the row or not at all
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            SearchToken.index_document('purchase', self)
+            # A purchase counts once towards its vendor's usage: edits only refresh
+            # last_used, unless they move the purchase to another vendor
+            previous_vendor = None if adding else getattr(self, '_loaded_vendor', None)
+            moved = previous_vendor is not None and Vendor.normalize(previous_vendor) != Vendor.normalize(self.vendor)
+            Vendor.record_use(self.vendor, self.date, increment=1 if adding or moved else 0)
+            if moved:
+                Vendor.release_use(previous_vendor)
+
+            current = self.outstanding_contribution()
+            Vendor.apply_outstanding_change(None if adding else getattr(self, '_loaded_outstanding', None), current)
+
+            current_gst = self.gst_contribution()
+            GstMonthlyRollup.apply_change(None if adding else getattr(self, '_loaded_gst', None), current_gst)
+        self._loaded_outstanding = current
+        self._loaded_gst = current_gst
+        self._loaded_vendor = self.vendor
+
+    def delete(self, *args, **kwargs):
+        object_id = self.pk
+        previous = getattr(self, '_loaded_outstanding', None) or self.outstanding_contribution()
+        previous_gst = getattr(self, '_loaded_gst', None) or self.gst_contribution()
+        previous_vendor = getattr(self, '_loaded_vendor', None) or self.vendor
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            SearchToken.remove_document('purchase', object_id)
+            Vendor.release_use(previous_vendor)
+            Vendor.apply_outstanding_change(previous, None)
+            GstMonthlyRollup.apply_change(previous_gst, None)
+        return result
+
+    def compute_fingerprint(self):
+        return voucher_fingerprint(self.date, self.total_amount, self.bill_no, self.vendor)
+
+    @classmethod
+    def find_duplicate(cls, fingerprint, exclude_id=None):
+        """Purchase with the same fingerprint (indexed lookup), if any"""
+        if not fingerprint:
+            return None
+        duplicates = cls.objects.filter(fingerprint=fingerprint)
+        if exclude_id:
+            duplicates = duplicates.exclude(id=exclude_id)
+        return duplicates.first()
\ No newline at end of file
@@ -0,0 +1,103 @@
+# models/search_index.py
+import re
+
+from django.conf import settings
+from django.db import connection, models
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+# doc_type -> {field: weight}; references outrank vendor/category, which outrank free text
+SEARCH_FIELDS = {
+    'expense': {'voucher_no': 3, 'category': 2, 'description': 1},
+    'income': {'description': 1},
+    'purchase': {'bill_no': 3, 'vendor': 2, 'description': 1},
+}
+
+
+def tokenize(text):
+    """Lower-cased alphanumeric tokens of text, without very short ones"""
+    return [
+        token[:MAX_TOKEN_LENGTH]
+        for token in TOKEN_RE.findall(str(text or '').lower())
+        if len(token) >= MIN_TOKEN_LENGTH
+    ]
+
+
+def uses_token_index():
+    """
+    MySQL answers searches from its FULLTEXT indexes; every other backend
+    (or SEARCH_BACKEND = 'tokens') uses the SearchToken table.
+    """
+    backend = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend:
+        return backend == 'tokens'
+    return connection.vendor != 'mysql'
+
+
+class SearchToken(models.Model):
+    """Inverted index row: one token of one expense/income/purchase record"""
+    DOC_TYPE_CHOICES = [
+        ('expense', 'Expense'),
+        ('income', 'Income'),
+        ('purchase', 'Purchase'),
+    ]
+
+    token = models.CharField(max_length=MAX_TOKEN_LENGTH)
+    doc_type = models.CharField(max_length=10, choices=DOC_TYPE_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    weight = models.PositiveSmallIntegerField(default=1)
+    date = models.DateField()
+
+    class Meta:
+        db_table = 'search_token'
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'doc_type', 'object_id'], name='search_token_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['token', 'date'], name='search_token_lookup'),
+            models.Index(fields=['doc_type', 'object_id'], name='search_token_doc'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.doc_type} #{self.object_id}"
+
+    @classmethod
+    def build_tokens(cls, doc_type, obj):
+        """Unsaved token rows for one record, keeping the highest field weight per token"""
+        weights = {}
+        for field, weight in SEARCH_FIELDS[doc_type].items():
+            for token in tokenize(getattr(obj, field, '')):
+                weights[token] = max(weights.get(token, 0), weight)
+        return [
+            cls(token=token, doc_type=doc_type, object_id=obj.pk, weight=weight, date=obj.date)
+            for token, weight in weights.items()
+        ]
+
+    @classmethod
+    def index_documents(cls, doc_type, objs):
+        """Replace the index entries of the given records (no-op when FULLTEXT is used)"""
+        if not uses_token_index():
+            return
+        objs = [obj for obj in objs if obj.pk]
+        if not objs:
+            return
+        cls.objects.filter(doc_type=doc_type, object_id__in=[obj.pk for obj in objs]).delete()
+        rows = []
+        for obj in objs:
+            rows.extend(cls.build_tokens(doc_type, obj))
+        cls.objects.bulk_create(rows, batch_size=2000)
+
+    @classmethod
+    def index_document(cls, doc_type, obj):
+        cls.index_documents(doc_type, [obj])
+
+    @classmethod
+    def remove_document(cls, doc_type, object_id):
+        cls.remove_documents(doc_type, [object_id])
+
+    @classmethod
+    def remove_documents(cls, doc_type, object_ids):
+        if uses_token_index():
+            cls.objects.filter(doc_type=doc_type, object_id__in=list(object_ids)).delete()
@@ -0,0 +1,35 @@
+# models/settlement.py
+from django.db import models
+
+
+class SettlementImport(models.Model):
+    """One imported Swiggy/Zomato settlement file, keyed by its content hash"""
+    file_hash = models.CharField(max_length=64, unique=True)
+    filename = models.CharField(max_length=255)
+    channel = models.CharField(max_length=50, blank=True)
+    order_lines = models.PositiveIntegerField(default=0)
+    income_rows = models.PositiveIntegerField(default=0)
+    imported_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'settlement_import'
+        ordering = ['-imported_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.order_lines} lines)"
+
+
+class SettlementRow(models.Model):
+    """Hash of one imported order line, so overlapping statements are not counted twice"""
+    row_hash = models.CharField(max_length=64, unique=True)
+    settlement = models.ForeignKey(
+        SettlementImport,
+        on_delete=models.CASCADE,
+        related_name='rows'
+    )
+
+    class Meta:
+        db_table = 'settlement_row'
+
+    def __str__(self):
+        return self.row_hash
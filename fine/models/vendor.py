@@ -0,0 +1,111 @@
+# models/vendor.py
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
+
+from ..utils.fingerprints import normalize_ref
+from ..utils.reference_data import bump_generation
+
+
+class Vendor(models.Model):
+    """
+    Vendor dimension maintained from purchase writes. normalized_name
+    merges spelling variants ("ABC  Traders" / "abc traders") and backs
+    the prefix autocomplete.
+    """
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True)
+    usage_count = models.PositiveIntegerField(default=0)
+    last_used = models.DateField(null=True, blank=True)
+
+    # Sum of Pending/Due purchases, kept current by Purchase.save/delete
+    outstanding_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'vendor'
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['-usage_count', 'name'], name='vendor_usage'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return normalize_ref(name)[:100]
+
+    @classmethod
+    def canonical_name(cls, name):
+        """Existing spelling of a vendor name, or the cleaned input for a new vendor"""
+        cleaned = ' '.join(str(name or '').split())
+        existing = cls.objects.filter(normalized_name=cls.normalize(cleaned)).values_list('name', flat=True).first()
+        return existing or cleaned
+
+    @classmethod
+    def record_use(cls, name, used_on, increment=1):
+        """
+        Create or bump the vendor row for a purchase write. increment=0 only
+        refreshes last_used; a vendor row created here always counts the
+        purchase that refers to it.
+        """
+        normalized = cls.normalize(name)
+        if not normalized:
+            return
+        if isinstance(used_on, datetime):
+            used_on = used_on.date()
+
+        updated = cls.objects.filter(normalized_name=normalized).update(
+            usage_count=F('usage_count') + increment,
+            last_used=Greatest(Coalesce(F('last_used'), used_on), used_on) if used_on else F('last_used'),
+        )
+        if not updated:
+            cls.objects.bulk_create(
+                [cls(name=' '.join(str(name).split())[:100], normalized_name=normalized,
+                     usage_count=max(increment, 1), last_used=used_on)],
+                ignore_conflicts=True,
+            )
+            # New vendors must show up in every worker's cached dropdown, once the
+            # enclosing Purchase.save transaction has committed them
+            transaction.on_commit(bump_generation)
+
+    @classmethod
+    def release_use(cls, name):
+        """Take back one purchase's use of a vendor (purchase deleted or moved to another vendor)"""
+        normalized = cls.normalize(name)
+        if normalized:
+            cls.objects.filter(normalized_name=normalized, usage_count__gt=0).update(
+                usage_count=F('usage_count') - 1
+            )
+
+    @classmethod
+    def apply_outstanding_change(cls, old, new):
+        """
+        Move a purchase's contribution from old to new, each a (vendor, amount)
+        pair or None, with one UPDATE per affected vendor.
+        """
+        deltas = {}
+        for contribution, sign in ((old, -1), (new, 1)):
+            if not contribution:
+                continue
+            name, amount = contribution
+            normalized = cls.normalize(name)
+            if normalized:
+                deltas[normalized] = deltas.get(normalized, Decimal('0')) + sign * amount
+
+        for normalized, delta in deltas.items():
+            if delta:
+                cls.objects.filter(normalized_name=normalized).update(
+                    outstanding_amount=F('outstanding_amount') + delta
+                )
+
+    @classmethod
+    def autocomplete(cls, prefix, limit=10):
+        """Most used vendors whose normalized name starts with prefix (index range scan)"""
+        normalized = cls.normalize(prefix)
+        if not normalized:
+            return cls.objects.none()
+        return cls.objects.filter(normalized_name__startswith=normalized).order_by('-usage_count', 'name')[:limit]
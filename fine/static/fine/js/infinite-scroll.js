@@ -0,0 +1,61 @@
+// infinite-scroll.js - Keyset "load more" / infinite scroll for listing tables
+(function() {
+    'use strict';
+
+    if (window.jsdcInfiniteScrollLoaded) return;
+    window.jsdcInfiniteScrollLoaded = true;
+
+    function initLoader(loader) {
+        const target = document.querySelector(loader.dataset.target);
+        const button = loader.querySelector('[data-keyset-more]');
+        const countEl = loader.querySelector('[data-keyset-count]');
+        const totalEl = loader.querySelector('[data-keyset-total]');
+        let loading = false;
+
+        function loadMore() {
+            const cursor = loader.dataset.cursor;
+            if (loading || !cursor || !target) return;
+
+            loading = true;
+            button.disabled = true;
+
+            // Keep the page's filters and ask for the rows after the cursor
+            const params = new URLSearchParams(window.location.search);
+            params.set('cursor', cursor);
+
+            fetch(`${loader.dataset.url}?${params.toString()}`, {
+                headers: { 'X-Requested-With': 'XMLHttpRequest' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) throw new Error(data.message || 'Failed to load rows');
+
+                target.insertAdjacentHTML('beforeend', data.html);
+                loader.dataset.cursor = data.next_cursor || '';
+
+                countEl.textContent = parseInt(countEl.textContent, 10) + data.count;
+                totalEl.textContent = (parseFloat(totalEl.textContent) + data.page_total).toFixed(2);
+
+                if (!data.has_more) button.classList.add('d-none');
+            })
+            .catch(error => console.error('Error loading rows:', error))
+            .finally(() => {
+                loading = false;
+                button.disabled = false;
+            });
+        }
+
+        button.addEventListener('click', loadMore);
+
+        // Load the next page automatically when the loader scrolls into view
+        if ('IntersectionObserver' in window) {
+            new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) loadMore();
+            }).observe(loader);
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('[data-keyset-loader]').forEach(initLoader);
+    });
+})();
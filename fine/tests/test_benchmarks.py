@@ -0,0 +1,44 @@
+# fine/tests/test_benchmarks.py
+"""
+Benchmark harness: timings come from untraced requests, peak memory from
+separate tracemalloc passes.
+Run with: python manage.py test fine.tests.test_benchmarks
+"""
+import tracemalloc
+from unittest import mock
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from fine.utils import benchmarks
+
+
+class BenchmarkHarnessTests(TestCase):
+
+    def test_untraced_measure_reports_no_peak(self):
+        status, elapsed_ms, queries, peak = benchmarks.measure(Client(), reverse('get_weekly_attendance'), {})
+
+        self.assertEqual(status, 200)
+        self.assertGreater(elapsed_ms, 0)
+        self.assertIsNone(peak)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_timed_requests_run_without_tracemalloc(self):
+        traced = []
+        real_measure = benchmarks.measure
+
+        def spy(client, url, params, trace_memory=False):
+            traced.append((trace_memory, tracemalloc.is_tracing()))
+            return real_measure(client, url, params, trace_memory=trace_memory)
+
+        with mock.patch.object(benchmarks, 'measure', spy):
+            results = benchmarks.run_benchmarks(iterations=4, warmup=1, only={'weekly_attendance'})
+
+        self.assertEqual(traced.count((False, False)), 5)
+        self.assertEqual(traced.count((True, True)), benchmarks.MEMORY_ITERATIONS)
+        self.assertEqual(len(traced), 5 + benchmarks.MEMORY_ITERATIONS)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        endpoint = results['endpoints']['weekly_attendance']
+        self.assertEqual(endpoint['status'], [200])
+        self.assertGreaterEqual(endpoint['peak_kb'], 0)
@@ -0,0 +1,44 @@
+# fine/tests/test_calendar_day.py
+"""
+CalendarDay.populate inserts only missing days and reports how many it added.
+Run with: python manage.py test fine.tests.test_calendar_day
+"""
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from fine.models import CalendarDay
+from fine.models.calendar_day import DEFAULT_END
+
+
+class CalendarPopulateTests(TestCase):
+
+    def test_existing_days_are_not_counted(self):
+        # The migration already created 2015-2040
+        self.assertEqual(CalendarDay.populate(date(2024, 1, 1), date(2024, 12, 31)), 0)
+
+    def test_counts_only_missing_days_across_batches(self):
+        start = DEFAULT_END - timedelta(days=4)
+        end = DEFAULT_END + timedelta(days=10)
+
+        self.assertEqual(CalendarDay.populate(start, end, batch_size=3), 10)
+        self.assertEqual(CalendarDay.objects.filter(date__range=(start, end)).count(), 15)
+        self.assertEqual(CalendarDay.populate(start, end, batch_size=3), 0)
+
+    def test_existing_rows_keep_holiday_flags(self):
+        CalendarDay.objects.filter(date=date(2024, 8, 15)).update(is_holiday=True, holiday_name='Independence Day')
+
+        CalendarDay.populate(date(2024, 8, 1), date(2024, 8, 31))
+
+        day = CalendarDay.objects.get(date=date(2024, 8, 15))
+        self.assertTrue(day.is_holiday)
+        self.assertEqual(day.holiday_name, 'Independence Day')
+
+    def test_new_row_buckets(self):
+        CalendarDay.objects.filter(date=date(2025, 4, 2)).delete()
+
+        self.assertEqual(CalendarDay.populate(date(2025, 3, 30), date(2025, 4, 5)), 1)
+
+        day = CalendarDay.objects.get(date=date(2025, 4, 2))
+        self.assertEqual((day.week_start, day.month_start), (date(2025, 3, 31), date(2025, 4, 1)))
+        self.assertEqual((day.fiscal_year, day.fiscal_quarter, day.weekday), (2025, 1, 2))
@@ -0,0 +1,63 @@
+# fine/tests/test_expense_import.py
+"""
+Streaming expense import: duplicate vouchers are caught within a file
+(across batch boundaries) and against rows already in the database.
+Run with: python manage.py test fine.tests.test_expense_import
+"""
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import TestCase
+
+from fine.models import Employee, Expense
+from fine.utils.expense_import import import_expense_file
+
+CSV = b"""date,voucher_no,category,description,amount,payment_method,employee_name
+2024-05-01,V-1,Electricity,Bill,1200,Cash,
+2024-05-02,V-2,Phone Bill,Mobile,499,UPI,Ravi Kumar
+2024-05-03,V-3,Rental,Shop,15000,Bank Transfer,
+2024-05-01,v-1 ,electricity,Same voucher again,1200.00,Cash,
+2024-05-04,V-4,Pooja,Flowers,300,Cash,
+2024-05-05,,Sweet,No voucher,150,Cash,
+2024-05-05,,Sweet,No voucher,150,Cash,
+2024-05-06,V-5,Unknown,Bad category,10,Cash,
+"""
+
+
+class ExpenseImportTests(TestCase):
+
+    def setUp(self):
+        # V-4 was already entered by hand
+        Expense.objects.create(date=date(2024, 5, 4), voucher_no='V-4', category='Pooja',
+                               total_amount=Decimal('300'), payment_method='Cash')
+
+    def test_duplicates_across_batches_and_database(self):
+        report = import_expense_file(BytesIO(CSV), 'vouchers.csv', batch_size=2)
+
+        # V-1 repeats two batches later; V-4 exists already; rows without a voucher are never duplicates
+        self.assertEqual(report['imported'], 5)
+        self.assertEqual(report['duplicate_count'], 2)
+        self.assertEqual(report['error_count'], 3)
+        self.assertEqual(Expense.objects.filter(voucher_no__iexact='v-1').count(), 1)
+        self.assertEqual(Expense.objects.filter(voucher_no='V-4').count(), 1)
+        self.assertEqual(Expense.objects.filter(category='Sweet').count(), 2)
+
+        imported = Expense.objects.get(voucher_no='V-2')
+        self.assertEqual(imported.fingerprint, imported.compute_fingerprint())
+        self.assertEqual(imported.employee_id, Employee.objects.get(name_key=Employee.normalize('Ravi Kumar')).id)
+
+    def test_reimport_adds_nothing(self):
+        import_expense_file(BytesIO(CSV), 'vouchers.csv', batch_size=3)
+        count = Expense.objects.count()
+
+        report = import_expense_file(BytesIO(CSV), 'vouchers.csv', batch_size=3)
+
+        # Only the voucher-less rows can be added again
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(Expense.objects.count(), count + 2)
+
+    def test_dry_run_rolls_back(self):
+        report = import_expense_file(BytesIO(CSV), 'vouchers.csv', dry_run=True)
+        self.assertEqual(report['imported'], 5)
+        self.assertEqual(Expense.objects.count(), 1)
@@ -0,0 +1,149 @@
+# fine/tests/test_fingerprints.py
+"""
+Duplicate voucher/bill detection: the fingerprint itself, the indexed
+find_duplicate lookup, the 0003 backfill and the entry forms' duplicate
+warning with its "Save anyway" override.
+Run with: python manage.py test fine.tests.test_fingerprints
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+from django.urls import reverse
+
+from fine.models import Cat, Expense, Purchase
+from fine.utils.fingerprints import voucher_fingerprint
+
+
+class VoucherFingerprintTests(TestCase):
+
+    def test_normalizes_case_whitespace_and_amount(self):
+        fingerprint = voucher_fingerprint(date(2024, 5, 1), Decimal('1200'), 'V-1', 'Electricity')
+        self.assertEqual(len(fingerprint), 40)
+        self.assertEqual(fingerprint, voucher_fingerprint('2024-05-01', '1200.00', '  v-1 ', 'electricity'))
+        self.assertEqual(fingerprint, voucher_fingerprint(datetime(2024, 5, 1, 10, 30), 1200, 'V-1', 'ELECTRICITY'))
+
+    def test_each_part_changes_the_fingerprint(self):
+        base = voucher_fingerprint(date(2024, 5, 1), 1200, 'V-1', 'Electricity')
+        self.assertNotEqual(base, voucher_fingerprint(date(2024, 5, 2), 1200, 'V-1', 'Electricity'))
+        self.assertNotEqual(base, voucher_fingerprint(date(2024, 5, 1), 1201, 'V-1', 'Electricity'))
+        self.assertNotEqual(base, voucher_fingerprint(date(2024, 5, 1), 1200, 'V-2', 'Electricity'))
+        self.assertNotEqual(base, voucher_fingerprint(date(2024, 5, 1), 1200, 'V-1', 'Rental'))
+
+    def test_no_reference_means_no_fingerprint(self):
+        self.assertEqual(voucher_fingerprint(date(2024, 5, 1), 1200, '', 'Electricity'), '')
+        self.assertEqual(voucher_fingerprint(date(2024, 5, 1), 1200, None, 'Electricity'), '')
+        self.assertEqual(voucher_fingerprint(date(2024, 5, 1), 1200, '   ', 'Electricity'), '')
+
+
+class FindDuplicateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cat = Cat.objects.create(name='Groceries')
+        cls.expense = Expense.objects.create(date=date(2024, 5, 1), voucher_no='V-1', category='Electricity',
+                                             total_amount=Decimal('1200'), payment_method='Cash')
+        cls.purchase = Purchase.objects.create(date=date(2024, 5, 1), vendor='Ravi Traders', cat=cls.cat,
+                                               bill_no='B-7', total_amount=Decimal('500'))
+
+    def test_expense_lookup(self):
+        fingerprint = voucher_fingerprint(date(2024, 5, 1), 1200, 'v-1', 'Electricity')
+        self.assertEqual(self.expense.fingerprint, fingerprint)
+        self.assertEqual(Expense.find_duplicate(fingerprint), self.expense)
+        self.assertIsNone(Expense.find_duplicate(fingerprint, exclude_id=self.expense.id))
+        self.assertIsNone(Expense.find_duplicate(''))
+
+    def test_deleted_expense_is_not_a_duplicate(self):
+        self.expense.soft_delete()
+        self.assertIsNone(Expense.find_duplicate(self.expense.fingerprint))
+
+    def test_purchase_lookup(self):
+        fingerprint = voucher_fingerprint(date(2024, 5, 1), 500, 'B-7', 'ravi traders')
+        self.assertEqual(self.purchase.fingerprint, fingerprint)
+        self.assertEqual(Purchase.find_duplicate(fingerprint), self.purchase)
+        self.assertIsNone(Purchase.find_duplicate(fingerprint, exclude_id=self.purchase.id))
+
+
+class FingerprintBackfillTests(TestCase):
+
+    def test_backfill_sets_fingerprints_of_referenced_rows(self):
+        cat = Cat.objects.create(name='Groceries')
+        with_voucher = Expense.objects.create(date=date(2024, 5, 1), voucher_no='V-1', category='Electricity',
+                                              total_amount=Decimal('1200'), payment_method='Cash')
+        without_voucher = Expense.objects.create(date=date(2024, 5, 1), category='Sweet',
+                                                 total_amount=Decimal('150'), payment_method='Cash')
+        purchase = Purchase.objects.create(date=date(2024, 5, 1), vendor='Ravi Traders', cat=cat,
+                                           bill_no='B-7', total_amount=Decimal('500'))
+        # Rows as they were before the fingerprint column existed
+        Expense.all_objects.update(fingerprint='')
+        Purchase.objects.update(fingerprint='')
+
+        migration = import_module('fine.migrations.0003_voucher_fingerprint')
+        migration.backfill_fingerprints(apps, None)
+
+        with_voucher.refresh_from_db()
+        without_voucher.refresh_from_db()
+        purchase.refresh_from_db()
+        self.assertEqual(with_voucher.fingerprint, with_voucher.compute_fingerprint())
+        self.assertNotEqual(with_voucher.fingerprint, '')
+        self.assertEqual(without_voucher.fingerprint, '')
+        self.assertEqual(purchase.fingerprint, purchase.compute_fingerprint())
+
+
+class DuplicateEntryFormTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cat = Cat.objects.create(name='Groceries')
+        Expense.objects.create(date=date(2024, 5, 1), voucher_no='V-1', category='Electricity',
+                               total_amount=Decimal('1200'), payment_method='Cash')
+        Purchase.objects.create(date=date(2024, 5, 1), vendor='Ravi Traders', cat=cls.cat,
+                                bill_no='B-7', total_amount=Decimal('500'))
+
+    def expense_post(self, **extra):
+        data = {'date': '2024-05-01', 'voucher_no': 'v-1', 'category': 'Electricity',
+                'total_amount': '1200', 'payment_method': 'UPI', 'description': 'Meter 2'}
+        data.update(extra)
+        return self.client.post(reverse('expenses'), data)
+
+    def purchase_post(self, **extra):
+        data = {'date': '2024-05-01', 'vendor': 'Ravi Traders', 'cat': self.cat.id, 'bill_no': 'B-7',
+                'total_amount': '500', 'gst_amount': '0', 'payment_mode': 'Cash', 'status': 'Paid'}
+        data.update(extra)
+        return self.client.post(reverse('purchases'), data)
+
+    def test_duplicate_expense_is_shown_with_the_entered_values(self):
+        response = self.expense_post()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Expense.objects.count(), 1)
+        self.assertEqual(response.context['duplicate'].voucher_no, 'V-1')
+        self.assertEqual(response.context['form_data']['description'], 'Meter 2')
+        self.assertContains(response, 'is already recorded', status_code=409)
+        self.assertContains(response, 'name="allow_duplicate" value="true"', status_code=409)
+
+    def test_save_anyway_records_the_expense(self):
+        response = self.expense_post(allow_duplicate='true')
+
+        self.assertRedirects(response, reverse('expenses'))
+        self.assertEqual(Expense.objects.filter(voucher_no__iexact='v-1').count(), 2)
+
+    def test_duplicate_purchase_is_shown_with_the_entered_values(self):
+        response = self.purchase_post(description='Second copy')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Purchase.objects.count(), 1)
+        self.assertEqual(response.context['form_data']['description'], 'Second copy')
+        self.assertContains(response, 'name="allow_duplicate" value="true"', status_code=409)
+
+    def test_save_anyway_records_the_purchase(self):
+        response = self.purchase_post(allow_duplicate='true')
+
+        self.assertRedirects(response, reverse('purchases'))
+        self.assertEqual(Purchase.objects.count(), 2)
+
+    def test_page_without_duplicate_has_no_override(self):
+        response = self.client.get(reverse('expenses'))
+        self.assertNotContains(response, 'Save anyway')
@@ -0,0 +1,86 @@
+# fine/tests/test_gst_rollup.py
+"""
+GstMonthlyRollup maintained by Purchase.save/delete must hold the same
+totals rebuild_gst_rollup computes from the purchase table.
+Run with: python manage.py test fine.tests.test_gst_rollup
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from fine.models import Cat, GstMonthlyRollup, Purchase
+from fine.utils.gst_summary import gst_summary, rebuild_gst_rollup
+
+
+def rollup_snapshot():
+    """{(year, month, cat, vendor_key): (bills, total, gst)}, ignoring rows emptied by edits"""
+    return {
+        (r.year, r.month, r.cat_id, r.vendor_key): (r.bill_count, r.total_amount, r.gst_amount)
+        for r in GstMonthlyRollup.objects.all()
+        if r.bill_count or r.total_amount or r.gst_amount
+    }
+
+
+class GstRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.groceries = Cat.objects.create(name='Groceries')
+        cls.packaging = Cat.objects.create(name='Packaging')
+
+    def purchase(self, purchase_date, vendor, cat, bill_no, total, gst):
+        return Purchase.objects.create(date=purchase_date, vendor=vendor, cat=cat, bill_no=bill_no,
+                                       total_amount=Decimal(total), gst_amount=Decimal(gst))
+
+    def assertRollupMatchesRebuild(self):
+        incremental = rollup_snapshot()
+        summary = gst_summary(2024)
+        rebuild_gst_rollup()
+        self.assertEqual(incremental, rollup_snapshot())
+        # Vendor display spellings may differ between the two, the totals may not
+        rebuilt = gst_summary(2024)
+        for part in ('totals', 'by_month', 'by_category'):
+            self.assertEqual(summary[part], rebuilt[part], part)
+
+    def test_creates(self):
+        self.purchase(date(2024, 4, 3), 'Ravi Traders', self.groceries, 'B-1', '1180', '180')
+        self.purchase(date(2024, 4, 9), 'ravi  traders', self.groceries, 'B-2', '590', '90')
+        self.purchase(date(2024, 4, 9), 'Ravi Traders', self.packaging, 'B-3', '236', '36')
+        self.purchase(date(2024, 5, 1), 'Murugan Stores', self.groceries, 'B-4', '1000', '0')
+
+        snapshot = rollup_snapshot()
+        self.assertEqual(len(snapshot), 3)
+        key = (2024, 4, self.groceries.id, GstMonthlyRollup.vendor_key_for('Ravi Traders'))
+        self.assertEqual(snapshot[key], (2, Decimal('1770.00'), Decimal('270.00')))
+        self.assertRollupMatchesRebuild()
+
+    def test_edits_across_months_categories_and_vendors(self):
+        moved = self.purchase(date(2024, 4, 3), 'Ravi Traders', self.groceries, 'B-1', '1180', '180')
+        self.purchase(date(2024, 4, 9), 'Ravi Traders', self.groceries, 'B-2', '590', '90')
+
+        edits = [
+            {'gst_amount': Decimal('200'), 'total_amount': Decimal('1200')},
+            {'date': date(2024, 6, 30)},
+            {'cat': self.packaging},
+            {'vendor': 'Murugan Stores'},
+            {'date': date(2024, 4, 3), 'cat': self.groceries, 'vendor': 'Ravi Traders'},
+        ]
+        for fields in edits:
+            purchase = Purchase.objects.get(pk=moved.pk)
+            for name, value in fields.items():
+                setattr(purchase, name, value)
+            purchase.save()
+            with self.subTest(**{k: str(v) for k, v in fields.items()}):
+                self.assertRollupMatchesRebuild()
+
+    def test_deletes(self):
+        first = self.purchase(date(2024, 4, 3), 'Ravi Traders', self.groceries, 'B-1', '1180', '180')
+        self.purchase(date(2024, 4, 9), 'Ravi Traders', self.groceries, 'B-2', '590', '90')
+        only = self.purchase(date(2024, 7, 1), 'Murugan Stores', self.packaging, 'B-3', '236', '36')
+
+        Purchase.objects.get(pk=first.pk).delete()
+        only.delete()
+
+        self.assertEqual(len(rollup_snapshot()), 1)
+        self.assertRollupMatchesRebuild()
@@ -0,0 +1,45 @@
+# fine/tests/test_load_test.py
+"""
+Load test harness: multi-process runs start spawned workers that set Django
+up themselves and use the same database as the parent.
+Run with: python manage.py test fine.tests.test_load_test
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from fine.models import Payroll
+from fine.utils.load_test import run_load_test
+
+
+def in_memory_database():
+    return connection.vendor == 'sqlite' and connection.is_in_memory_db()
+
+
+class LoadTestTests(TransactionTestCase):
+    # Worker processes only see committed rows, so no wrapping transaction
+
+    def setUp(self):
+        for name in ('Load One', 'Load Two'):
+            Payroll.objects.create(
+                employee_name=name, basic_pay=Decimal('15000'), spr_amount=Decimal('0'),
+                salary_date=date(2024, 3, 31), month=3, year=2024,
+            )
+
+    def test_single_process(self):
+        report = run_load_test(2024, 3, threads=2, processes=1, duration=1, mix={'report_read': 1})
+
+        self.assertGreater(report['operations']['all']['requests'], 0)
+        self.assertEqual(set(report['operations']['all']['outcomes']), {'ok'})
+
+    def test_two_processes(self):
+        if in_memory_database():
+            self.skipTest('spawned workers cannot reach an in-memory database')
+        report = run_load_test(2024, 3, threads=1, processes=2, duration=1, mix={'report_read': 1})
+
+        self.assertEqual(report['config']['processes'], 2)
+        self.assertGreater(report['operations']['all']['requests'], 0)
+        self.assertEqual(set(report['operations']['all']['outcomes']), {'ok'})
+        self.assertFalse(any(report['integrity'].values()))
@@ -0,0 +1,93 @@
+# fine/tests/test_metrics.py
+"""
+Prometheus metrics: access to /metrics, the 503 answer when metrics are
+off, render() output and the cache hit-ratio collector.
+Run with: python manage.py test fine.tests.test_metrics
+"""
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from fine.utils import metrics
+
+
+class MetricsAccessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('auditor', password='x', is_staff=True)
+        cls.clerk = User.objects.create_user('clerk', password='x')
+
+    @override_settings(METRICS_TOKEN='')
+    def test_anonymous_and_non_staff_are_refused(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        self.client.force_login(self.clerk)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_bearer_does_not_match_unset_token(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(METRICS_TOKEN='s3cret', METRICS_ENABLED=False)
+    def test_bearer_token(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_metrics_answer_503(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 503)
+        self.assertIsNone(metrics.render())
+
+    def test_missing_prometheus_client_answers_503(self):
+        self.client.force_login(self.staff)
+        with mock.patch.object(metrics, 'prometheus_client', None):
+            self.assertFalse(metrics.enabled())
+            metrics.record_cache('reference_data', True)
+            response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 503)
+
+
+@skipUnless(metrics.prometheus_client, 'prometheus_client is not installed')
+@override_settings(METRICS_ENABLED=True)
+class MetricsRenderTests(TestCase):
+
+    def test_render_exposes_counters_and_hit_ratio(self):
+        metrics.record_cache('test_render', True)
+        metrics.record_cache('test_render', False)
+
+        text = metrics.render().decode('utf-8')
+
+        self.assertIn('fine_cache_requests_total{cache="test_render",result="hit"}', text)
+        self.assertIn('fine_cache_hit_ratio{cache="test_render"}', text)
+        self.assertIn('# TYPE fine_request_duration_seconds histogram', text)
+
+    def test_staff_scrape(self):
+        self.client.force_login(User.objects.create_user('auditor', password='x', is_staff=True))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+
+    def test_hit_ratio_collector(self):
+        source = metrics.CollectorRegistry()
+        requests = metrics.Counter('fine_cache_requests', 'test', ['cache', 'result'], registry=source)
+        requests.labels('month_totals', 'hit').inc(3)
+        requests.labels('month_totals', 'miss').inc()
+        requests.labels('income_summary', 'miss').inc(2)
+        metrics.Counter('fine_other', 'test', registry=source).inc(5)
+
+        families = list(metrics.CacheHitRatioCollector(source).collect())
+
+        self.assertEqual([f.name for f in families], ['fine_cache_hit_ratio'])
+        ratios = {s.labels['cache']: s.value for s in families[0].samples}
+        self.assertEqual(ratios, {'income_summary': 0.0, 'month_totals': 0.75})
+
+    def test_hit_ratio_skips_caches_without_lookups(self):
+        families = list(metrics.CacheHitRatioCollector(metrics.CollectorRegistry()).collect())
+        self.assertEqual(families[0].samples, [])
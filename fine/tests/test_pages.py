@@ -0,0 +1,29 @@
+# fine/tests/test_pages.py
+"""
+Smoke test for the full-page views: each listing page must render.
+Run with: python manage.py test fine.tests.test_pages
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from fine.models import Expense, Income
+
+PAGES = ('dashboard', 'expenses', 'income', 'purchases', 'payroll', 'attendance', 'reports')
+
+
+class PageRenderTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        Expense.objects.create(date=today, category='Electricity', total_amount=Decimal('50'), payment_method='Cash')
+        Income.objects.create(date=today, description='Sales', amount=Decimal('100'), payment_mode='Cash')
+
+    def test_pages_render(self):
+        for name in PAGES:
+            with self.subTest(page=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,99 @@
+# fine/tests/test_payroll_arrears.py
+"""
+Arrears engine tests: retroactive attendance edits recompute worked days,
+revoke or restore the incentive and rebuild the Salary expenses.
+Run with: python manage.py test fine.tests.test_payroll_arrears
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from fine.models import Attendance, DirtyPayroll, Employee, Expense, Payroll, SearchToken
+from fine.utils.payroll_arrears import recompute_dirty_payrolls
+
+MONTH_START = date(2024, 1, 1)
+
+
+@override_settings(SEARCH_BACKEND='tokens')
+class PayrollArrearsTests(TestCase):
+
+    def setUp(self):
+        employee = Employee.objects.create(name='Arrears Test', name_key='arrears test')
+        self.payroll = Payroll.objects.create(
+            employee_name='Arrears Test', basic_pay=Decimal('20000'), spr_amount=Decimal('0'),
+            salary_date=date(2024, 1, 31), month=1, year=2024,
+        )
+        Attendance.all_objects.bulk_create([
+            Attendance(payroll=self.payroll, employee=employee, employee_name='Arrears Test',
+                       date=MONTH_START + timedelta(days=d), status='present', record_state='active')
+            for d in range(30)
+        ])
+        # 30 worked days make the incentive payable
+        self.payroll.spr_amount = Decimal('1500')
+        self.payroll.save()
+        self.payroll.create_expenses()
+        DirtyPayroll.objects.all().delete()
+
+    def set_status(self, days, status):
+        for record in Attendance.objects.filter(payroll=self.payroll, date__in=days):
+            record.status = status
+            record.save()
+
+    def salary_expenses(self):
+        return Expense.objects.filter(payroll=self.payroll, category='Salary')
+
+    def test_downward_edit_revokes_incentive(self):
+        old_ids = list(self.salary_expenses().values_list('id', flat=True))
+        self.set_status([MONTH_START + timedelta(days=d) for d in range(3)], 'absent')
+
+        report = recompute_dirty_payrolls()
+
+        self.assertEqual(report['changed'], 1)
+        record = report['records'][0]
+        self.assertTrue(record['incentive_revoked'])
+        self.assertEqual(record['arrears'], -1500.0)
+
+        self.payroll.refresh_from_db()
+        self.assertEqual(self.payroll.worked_days, Decimal('27'))
+        self.assertEqual(self.payroll.spr_amount, Decimal('0'))
+        self.assertEqual(self.payroll.configured_spr_amount, Decimal('1500'))
+        self.assertEqual(self.payroll.net_salary, Decimal('20000'))
+        self.assertEqual(sum(e.total_amount for e in self.salary_expenses()), self.payroll.net_salary)
+        # Worked days agree with the normal save path
+        self.assertEqual(self.payroll.calculate_worked_days(), self.payroll.worked_days)
+
+        self.assertFalse(SearchToken.objects.filter(doc_type='expense', object_id__in=old_ids).exists())
+        if connection.features.can_return_rows_from_bulk_insert:
+            new_ids = list(self.salary_expenses().values_list('id', flat=True))
+            self.assertTrue(SearchToken.objects.filter(doc_type='expense', object_id__in=new_ids).exists())
+        self.assertFalse(DirtyPayroll.objects.exists())
+
+    def test_upward_edit_restores_incentive(self):
+        days = [MONTH_START + timedelta(days=d) for d in range(3)]
+        self.set_status(days, 'absent')
+        recompute_dirty_payrolls()
+
+        self.set_status(days, 'present')
+        report = recompute_dirty_payrolls()
+
+        self.assertTrue(report['records'][0]['incentive_restored'])
+        self.payroll.refresh_from_db()
+        self.assertEqual(self.payroll.worked_days, Decimal('30'))
+        self.assertEqual(self.payroll.spr_amount, Decimal('1500'))
+        self.assertEqual(self.payroll.net_salary, Decimal('21500'))
+        self.assertEqual(sum(e.total_amount for e in self.salary_expenses()), Decimal('21500'))
+
+    def test_dry_run_writes_nothing(self):
+        self.set_status([MONTH_START], 'half_day')
+        expense_ids = set(self.salary_expenses().values_list('id', flat=True))
+
+        report = recompute_dirty_payrolls(apply=False)
+
+        self.assertFalse(report['applied'])
+        self.assertEqual(report['records'][0]['new_worked_days'], 29.5)
+        self.payroll.refresh_from_db()
+        self.assertEqual(self.payroll.worked_days, Decimal('30'))
+        self.assertEqual(set(self.salary_expenses().values_list('id', flat=True)), expense_ids)
+        self.assertTrue(DirtyPayroll.objects.filter(payroll=self.payroll).exists())
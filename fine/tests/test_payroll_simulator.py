@@ -0,0 +1,87 @@
+# fine/tests/test_payroll_simulator.py
+"""
+The vectorized payroll simulator must give the same totals as running
+Payroll.calculate_salary row by row.
+Run with: python manage.py test fine.tests.test_payroll_simulator
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from fine.models import Attendance, Payroll
+from fine.utils.payroll_simulator import simulate_month
+
+MONTH, YEAR = 3, 2024
+
+STAFF = [
+    # name, basic pay, worked days, SPR, split type, cash %, bank %
+    ('Sim One', Decimal('18250.55'), 31, Decimal('1200'), 'full_cash', Decimal('100'), Decimal('0')),
+    ('Sim Two', Decimal('22000.10'), 29, Decimal('750.50'), 'split', Decimal('37'), Decimal('63')),
+    ('Sim Three', Decimal('15999.99'), 20, Decimal('0'), 'full_bank', Decimal('0'), Decimal('100')),
+    ('Sim Four', Decimal('30100.01'), 30, Decimal('0'), 'split', Decimal('40'), Decimal('40')),
+]
+
+TOTAL_KEYS = ('total_basic_pay', 'total_spr', 'total_net_payable', 'total_cash', 'total_bank')
+
+
+class PayrollSimulatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for name, basic, worked, spr, split, cash, bank in STAFF:
+            payroll = Payroll.objects.create(
+                employee_name=name, basic_pay=basic, salary_date=date(YEAR, MONTH, 28), month=MONTH, year=YEAR,
+                payment_split_type=split, cash_percentage=cash, bank_transfer_percentage=bank,
+            )
+            Attendance.all_objects.bulk_create([
+                Attendance(payroll=payroll, employee_name=name, date=date(YEAR, MONTH, 1) + timedelta(days=d),
+                           status='present', record_state='active')
+                for d in range(worked)
+            ])
+            if spr:
+                payroll.spr_amount = spr
+                payroll.save()
+
+    def per_row_totals(self, adjust=None):
+        """Totals from calculate_salary on every payroll row, optionally adjusted first"""
+        totals = dict.fromkeys(TOTAL_KEYS, Decimal('0'))
+        for payroll in Payroll.objects.filter(month=MONTH, year=YEAR):
+            if adjust:
+                adjust(payroll)
+            payroll.calculate_salary()
+            totals['total_basic_pay'] += payroll.basic_pay
+            totals['total_spr'] += payroll.spr_amount
+            totals['total_net_payable'] += payroll.net_salary
+            totals['total_cash'] += payroll.cash_amount
+            totals['total_bank'] += payroll.bank_transfer_amount
+        return {key: float(value) for key, value in totals.items()}
+
+    def assertTotals(self, simulated, expected):
+        for key in TOTAL_KEYS:
+            self.assertAlmostEqual(simulated[key], expected[key], places=2, msg=key)
+
+    def test_baseline_matches_stored_rows(self):
+        result = simulate_month(MONTH, YEAR, [])
+        self.assertEqual(result['employee_count'], len(STAFF))
+        self.assertTotals(result['baseline'], self.per_row_totals())
+
+    def test_scenario_matches_per_row_calculation(self):
+        def adjust(payroll):
+            payroll.basic_pay = payroll.basic_pay * 2 + Decimal('100')
+            payroll.payment_split_type = 'split'
+            payroll.cash_percentage = Decimal('33')
+            payroll.bank_transfer_percentage = Decimal('67')
+
+        result = simulate_month(MONTH, YEAR, [{
+            'basic_multiplier': 2, 'basic_delta': 100,
+            'payment_split_type': 'split', 'cash_percentage': 33, 'bank_transfer_percentage': 67,
+        }])
+        self.assertTotals(result['scenarios'][0], self.per_row_totals(adjust))
+
+    def test_incentive_dropped_below_threshold(self):
+        result = simulate_month(MONTH, YEAR, [{'spr_amount': 500}])
+        scenario = result['scenarios'][0]
+        # Three employees are above 28 worked days; Sim Three (20 days) loses the flat incentive
+        self.assertEqual(scenario['total_spr'], 1500.0)
+        self.assertEqual(scenario['incentives_dropped'], 1)
@@ -0,0 +1,76 @@
+# fine/tests/test_profiling.py
+"""
+On-demand profiling tokens: only the staff user a token was issued to can
+trigger a profile, and only until the token expires.
+Run with: python manage.py test fine.tests.test_profiling
+"""
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from fine.utils import profiling
+
+
+class ProfilingTokenTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('auditor', password='x', is_staff=True)
+        cls.other_staff = User.objects.create_user('manager', password='x', is_staff=True)
+        cls.clerk = User.objects.create_user('clerk', password='x')
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        settings_override = override_settings(PROFILE_DIR=self.profile_dir, PROFILE_TOKEN_MAX_AGE=3600)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def expired_token(self, user):
+        with mock.patch('django.core.signing.time.time', return_value=time.time() - 7200):
+            return profiling.make_token(user)
+
+    def test_staff_token(self):
+        self.assertTrue(profiling.check_token(profiling.make_token(self.staff), self.staff))
+
+    def test_non_staff_user_is_rejected(self):
+        self.assertFalse(profiling.check_token(profiling.make_token(self.clerk), self.clerk))
+
+    def test_token_of_another_user_is_rejected(self):
+        self.assertFalse(profiling.check_token(profiling.make_token(self.other_staff), self.staff))
+
+    def test_expired_token_is_rejected(self):
+        self.assertFalse(profiling.check_token(self.expired_token(self.staff), self.staff))
+
+    def test_tampered_or_missing_token_is_rejected(self):
+        self.assertFalse(profiling.check_token(profiling.make_token(self.staff) + 'x', self.staff))
+        self.assertFalse(profiling.check_token('', self.staff))
+
+    def get_profiled(self, user, token):
+        self.client.force_login(user)
+        return self.client.get(reverse('get_weekly_attendance'), {profiling.PROFILE_PARAM: token})
+
+    def test_middleware_profiles_for_staff(self):
+        response = self.get_profiled(self.staff, profiling.make_token(self.staff))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(response['X-Profile-Id'], profiling.stored_names())
+
+    def test_middleware_ignores_non_staff_and_expired_tokens(self):
+        for user, token in ((self.clerk, profiling.make_token(self.clerk)),
+                            (self.staff, self.expired_token(self.staff))):
+            with self.subTest(user=user.username):
+                response = self.get_profiled(user, token)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(profiling.stored_names(), [])
+
+    def test_profile_pages_are_staff_only(self):
+        self.client.force_login(self.clerk)
+        response = self.client.get(reverse('profile_list'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,74 @@
+# fine/tests/test_query_budgets.py
+"""
+Query budget tests.
+
+Requests the budgeted endpoints with QUERY_BUDGET_RAISE on, so a view that
+goes over its settings.QUERY_BUDGETS entry fails here instead of only
+logging a warning in production.
+Run with: python manage.py test fine.tests.test_query_budgets
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from fine.models import Attendance, Employee, Expense, Income, Payroll
+
+EMPLOYEES = 12
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
+        for i in range(EMPLOYEES):
+            name = f'Budget Employee {i}'
+            employee = Employee.objects.create(name=name, name_key=name.lower())
+            payroll = Payroll.all_objects.create(
+                employee_name=name, employee=employee, basic_pay=Decimal('12000'),
+                salary_date=today, month=today.month, year=today.year, record_state='active',
+            )
+            Attendance.all_objects.bulk_create([
+                Attendance(payroll=payroll, employee=employee, employee_name=name,
+                           date=week_start + timedelta(days=d), status='present', record_state='active')
+                for d in range(7)
+            ])
+        Income.objects.bulk_create([
+            Income(date=today - timedelta(days=d), description='Sales', amount=Decimal('100'), payment_mode='Cash')
+            for d in range(60)
+        ])
+        Expense.all_objects.bulk_create([
+            Expense(date=today - timedelta(days=d), category='Electricity', total_amount=Decimal('50'),
+                    payment_method='Cash', record_state='active')
+            for d in range(60)
+        ])
+
+    def get(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertIn('Server-Timing', response)
+        return response
+
+    def test_weekly_attendance(self):
+        self.get('get_weekly_attendance')
+
+    def test_attendance_summary(self):
+        today = date.today()
+        self.get('get_attendance_summary', from_date=today.replace(day=1).isoformat(), to_date=today.isoformat())
+
+    def test_payroll_data(self):
+        today = date.today()
+        self.get('get_payroll_data', month=today.month, year=today.year)
+
+    def test_chart_data(self):
+        for period in ('weekly', 'monthly', 'yearly'):
+            with self.subTest(period=period):
+                self.get('get_chart_data', period=period)
+
+    def test_listing_rows(self):
+        for name in ('expense_rows', 'income_rows', 'purchase_rows'):
+            with self.subTest(view=name):
+                self.get(name)
@@ -0,0 +1,120 @@
+# fine/tests/test_query_plans.py
+"""
+Query plan regression tests.
+
+Each key listing/report query is run through EXPLAIN against the test
+database and must be answered from an index, not a full table scan.
+Run with: python manage.py test fine.tests.test_query_plans
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from fine.models import Attendance, Cat, Employee, Expense, Income, Payroll, Purchase
+from fine.utils.period_utils import PERIOD_TYPES, period_range, range_filter
+
+ROWS = 3000
+START = date(2022, 1, 1)
+
+
+def explain(queryset):
+    """EXPLAIN rows for a queryset as a list of dicts (MySQL) or detail strings (SQLite)"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def full_scans(queryset):
+    """Tables read without any index in the plan"""
+    plan = explain(queryset)
+    if connection.vendor == 'sqlite':
+        return [detail for detail in plan if detail.startswith('SCAN') and 'INDEX' not in detail]
+    return [row['table'] for row in plan if row.get('type') == 'ALL']
+
+
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cat = Cat.objects.create(name='Groceries')
+        employee = Employee.objects.create(name='Plan Test', name_key='plan test')
+        days = [START + timedelta(days=i % 1460) for i in range(ROWS)]
+
+        Expense.all_objects.bulk_create([
+            Expense(date=d, category='Electricity', total_amount=Decimal('10'), payment_method='Cash',
+                    record_state='active' if i % 10 else 'deleted')
+            for i, d in enumerate(days)
+        ])
+        Income.objects.bulk_create([
+            Income(date=d, description='Sales', amount=Decimal('10'), payment_mode='Cash') for d in days
+        ])
+        Purchase.objects.bulk_create([
+            Purchase(date=d, vendor=f'Vendor {i % 40}', cat=cat, bill_no=str(i), total_amount=Decimal('10'),
+                     status='Pending' if i % 5 == 0 else 'Paid')
+            for i, d in enumerate(days)
+        ])
+        Attendance.all_objects.bulk_create([
+            Attendance(employee_name=f'Employee {i % 30}', employee=employee if i % 30 == 0 else None,
+                       date=d, status='present', record_state='active')
+            for i, d in enumerate(days)
+        ])
+        Payroll.all_objects.bulk_create([
+            Payroll(employee_name=f'Employee {i}', basic_pay=Decimal('1000'), salary_date=date(2022 + i // 12 % 4, i % 12 + 1, 28),
+                    month=i % 12 + 1, year=2022 + i // 12 % 4, record_state='active')
+            for i in range(ROWS // 10)
+        ])
+
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                for model in (Expense, Income, Purchase, Attendance, Payroll):
+                    cursor.execute(f"ANALYZE TABLE {model._meta.db_table}")
+
+    def assertIndexed(self, queryset):
+        scans = full_scans(queryset)
+        self.assertEqual(scans, [], f"Full table scan in plan for: {queryset.query}")
+
+    def test_expense_month_listing(self):
+        self.assertIndexed(Expense.objects.filter(date__gte=date(2023, 3, 1), date__lt=date(2023, 4, 1)))
+
+    def test_expense_category_range(self):
+        self.assertIndexed(Expense.objects.filter(
+            category='Electricity', date__gte=date(2023, 3, 1), date__lt=date(2023, 4, 1)
+        ))
+
+    def test_income_range(self):
+        self.assertIndexed(Income.objects.filter(date__gte=date(2023, 3, 1), date__lt=date(2023, 3, 8)))
+
+    def test_purchase_range(self):
+        self.assertIndexed(Purchase.objects.filter(date__gte=date(2023, 3, 1), date__lt=date(2023, 4, 1)))
+
+    def test_purchase_outstanding(self):
+        self.assertIndexed(Purchase.objects.filter(status__in=Purchase.OUTSTANDING_STATUSES, date__lt=date(2022, 2, 1)))
+
+    def test_attendance_by_name_and_date(self):
+        self.assertIndexed(Attendance.objects.filter(employee_name='Employee 3', date=date(2023, 3, 4)))
+
+    def test_attendance_by_employee_month(self):
+        self.assertIndexed(Attendance.objects.filter(
+            employee_id=1, date__gte=date(2023, 3, 1), date__lt=date(2023, 4, 1)
+        ))
+
+    def test_attendance_week(self):
+        self.assertIndexed(Attendance.objects.filter(date__gte=date(2023, 3, 6), date__lt=date(2023, 3, 13)))
+
+    def test_payroll_month(self):
+        self.assertIndexed(Payroll.objects.filter(month=3, year=2023))
+
+    def test_period_service_ranges(self):
+        anchor = date(2023, 3, 15)
+        for period_type in PERIOD_TYPES:
+            with self.subTest(period=period_type):
+                bounds = period_range(period_type, anchor, start_date=date(2023, 3, 1), end_date=date(2023, 3, 31))
+                for model in (Expense, Income, Purchase):
+                    self.assertIndexed(model.objects.filter(**range_filter(*bounds)))
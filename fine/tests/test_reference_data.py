@@ -0,0 +1,63 @@
+# fine/tests/test_reference_data.py
+"""
+Reference data generation bumps happen only once the Cat/Vendor write has
+committed, so no worker reloads its dropdowns before the row is visible.
+Run with: python manage.py test fine.tests.test_reference_data
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from fine.models import Cat, Purchase
+from fine.utils.reference_data import current_generation, get_reference
+
+
+class ReferenceDataGenerationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cat = Cat.objects.create(name='Groceries')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_category_write_bumps_after_commit(self):
+        get_reference('categories')
+        before = current_generation()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Cat.objects.create(name='Packaging')
+            self.assertEqual(current_generation(), before)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(current_generation(), before)
+        self.assertIn('Packaging', [c.name for c in get_reference('categories')])
+
+    def test_new_vendor_bumps_after_commit(self):
+        before = current_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Purchase.objects.create(date=date(2024, 5, 1), vendor='Murugan Stores', cat=self.cat,
+                                    bill_no='B-1', total_amount=Decimal('100'))
+            self.assertEqual(current_generation(), before)
+
+        self.assertGreater(current_generation(), before)
+        self.assertIn('Murugan Stores', get_reference('vendors'))
+
+    def test_rolled_back_vendor_is_not_announced(self):
+        before = current_generation()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Purchase.objects.create(date=date(2024, 5, 1), vendor='Ghost Traders', cat=self.cat,
+                                            bill_no='B-2', total_amount=Decimal('100'))
+                    raise RuntimeError("rolled back")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(current_generation(), before)
@@ -0,0 +1,127 @@
+# fine/tests/test_search.py
+"""
+Ranked search: the SearchToken inverted index kept by save()/delete(),
+search() over it, and the MySQL FULLTEXT path's handling of terms shorter
+than innodb_ft_min_token_size.
+Run with: python manage.py test fine.tests.test_search
+"""
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from fine.models import Cat, Expense, Income, Purchase, SearchToken
+from fine.models.search_index import tokenize
+from fine.utils.search import _fulltext_query, search
+
+
+class TokenizeTests(TestCase):
+
+    def test_lowercases_and_drops_single_characters(self):
+        self.assertEqual(tokenize('EB Bill - Meter #7, a'), ['eb', 'bill', 'meter'])
+        self.assertEqual(tokenize(None), [])
+
+
+@override_settings(SEARCH_BACKEND='tokens')
+class SearchTokenIndexTests(TestCase):
+
+    def test_save_indexes_with_highest_field_weight(self):
+        expense = Expense.objects.create(date=date(2024, 5, 1), voucher_no='EB7', category='Electricity',
+                                         description='eb7 meter reading', total_amount=Decimal('900'),
+                                         payment_method='Cash')
+
+        weights = dict(SearchToken.objects.filter(doc_type='expense', object_id=expense.id)
+                       .values_list('token', 'weight'))
+        self.assertEqual(weights, {'eb7': 3, 'electricity': 2, 'meter': 1, 'reading': 1})
+
+    def test_edit_replaces_and_delete_removes_tokens(self):
+        income = Income.objects.create(date=date(2024, 5, 1), description='Counter sales',
+                                       amount=Decimal('100'), payment_mode='Cash')
+        income.description = 'Catering order'
+        income.save()
+        tokens = set(SearchToken.objects.filter(doc_type='income', object_id=income.id).values_list('token', flat=True))
+        self.assertEqual(tokens, {'catering', 'order'})
+
+        object_id = income.id
+        income.delete()
+        self.assertFalse(SearchToken.objects.filter(doc_type='income', object_id=object_id).exists())
+
+
+@override_settings(SEARCH_BACKEND='tokens')
+class TokenSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.by_voucher = Expense.objects.create(date=date(2024, 5, 1), voucher_no='EB7', category='Electricity',
+                                                total_amount=Decimal('900'), payment_method='Cash')
+        cls.by_text = Expense.objects.create(date=date(2024, 5, 3), category='Repair & Maintenance',
+                                             description='EB7 panel repair', total_amount=Decimal('400'),
+                                             payment_method='Cash')
+        cls.income = Income.objects.create(date=date(2024, 5, 2), description='Catering order Murugan',
+                                           amount=Decimal('5000'), payment_mode='UPI')
+        cat = Cat.objects.create(name='Groceries')
+        cls.purchase = Purchase.objects.create(date=date(2024, 5, 2), vendor='Murugan Stores', cat=cat,
+                                               bill_no='B-19', total_amount=Decimal('750'))
+
+    def test_reference_match_outranks_free_text(self):
+        results = search('eb7')['results']
+        self.assertEqual([(r['type'], r['id']) for r in results],
+                         [('expense', self.by_voucher.id), ('expense', self.by_text.id)])
+        self.assertGreater(results[0]['score'], results[1]['score'])
+
+    def test_all_terms_must_match_and_last_term_is_a_prefix(self):
+        results = search('murugan cater')['results']
+        self.assertEqual([(r['type'], r['id']) for r in results], [('income', self.income.id)])
+
+    def test_doc_type_filter(self):
+        results = search('murugan', doc_types=['purchase'])['results']
+        self.assertEqual([(r['type'], r['id']) for r in results], [('purchase', self.purchase.id)])
+
+    def test_soft_deleted_expense_is_dropped(self):
+        self.by_text.soft_delete()
+        results = search('eb7')['results']
+        self.assertEqual([r['id'] for r in results], [self.by_voucher.id])
+
+    def test_pagination(self):
+        first = search('eb7', page_size=1)
+        second = search('eb7', page=2, page_size=1)
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual([r['id'] for r in first['results'] + second['results']],
+                         [self.by_voucher.id, self.by_text.id])
+
+    def test_empty_query(self):
+        self.assertEqual(search('  - ')['results'], [])
+
+
+class FulltextQueryTests(TestCase):
+
+    def test_short_terms_are_kept_out_of_the_boolean_query(self):
+        self.assertEqual(_fulltext_query(['eb', 'bill', 'meter']), ('+bill* +meter*', ['eb']))
+        self.assertEqual(_fulltext_query(['eb']), ('', ['eb']))
+
+
+@skipUnless(connection.vendor == 'mysql', 'FULLTEXT search needs MySQL')
+@override_settings(SEARCH_BACKEND='fulltext')
+class FulltextSearchTests(TransactionTestCase):
+    # InnoDB FULLTEXT indexes only see committed rows, so no wrapping transaction
+
+    def setUp(self):
+        self.eb = Expense.objects.create(date=date(2024, 5, 1), voucher_no='EB', category='Electricity',
+                                         description='EB bill for May', total_amount=Decimal('900'),
+                                         payment_method='Cash')
+        self.other = Expense.objects.create(date=date(2024, 5, 2), category='Phone Bill',
+                                            description='Mobile bill', total_amount=Decimal('499'),
+                                            payment_method='UPI')
+
+    def test_short_term_alone(self):
+        results = search('eb', doc_types=['expense'])['results']
+        self.assertEqual([r['id'] for r in results], [self.eb.id])
+
+    def test_short_term_with_indexed_term(self):
+        results = search('eb bill', doc_types=['expense'])['results']
+        self.assertEqual([r['id'] for r in results], [self.eb.id])
+        results = search('bill', doc_types=['expense'])['results']
+        self.assertEqual({r['id'] for r in results}, {self.eb.id, self.other.id})
@@ -0,0 +1,112 @@
+# fine/tests/test_settlement_import.py
+"""
+Settlement import idempotency: row hashes, refusing a re-uploaded file and
+skipping orders already booked from an overlapping statement.
+Run with: python manage.py test fine.tests.test_settlement_import
+"""
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import TestCase
+
+from fine.models import Income, SettlementImport, SettlementRow
+from fine.utils.expense_import import ImportFormatError
+from fine.utils.settlement_import import import_settlement_file, row_hash
+
+MAY_STATEMENT = b"""Order Date,Order ID,Net Payable,Order Status
+2024-05-01,SW-1001,250.00,Delivered
+2024-05-01,SW-1002,180.50,Delivered
+2024-05-02,SW-1003,320.00,Cancelled
+2024-05-02,SW-1004,99.00,Delivered
+2024-05-02,SW-1001,250.00,Delivered
+"""
+
+# Overlaps the May statement on SW-1002 and SW-1004
+OVERLAPPING_STATEMENT = b"""Order Date,Order ID,Net Payable
+2024-05-01,SW-1002,180.50
+2024-05-02,SW-1004,99.00
+2024-05-03,SW-1005,410.00
+"""
+
+# No order ids: identical lines are still separate orders
+NO_ORDER_IDS = b"""Date,Amount,Description
+2024-05-04,150.00,Dine-out payout
+2024-05-04,150.00,Dine-out payout
+"""
+
+
+def upload(content):
+    return BytesIO(content)
+
+
+class RowHashTests(TestCase):
+
+    def test_order_id_hash_is_independent_of_file_and_line(self):
+        line = (date(2024, 5, 1), 'Swiggy', 'SW-1001', Decimal('250'), '')
+        self.assertEqual(row_hash(line, 'a' * 64, 2), row_hash(line, 'b' * 64, 9))
+        self.assertNotEqual(row_hash(line, 'a' * 64, 2),
+                            row_hash((date(2024, 5, 1), 'Zomato', 'SW-1001', Decimal('250'), ''), 'a' * 64, 2))
+
+    def test_hash_without_order_id_is_unique_per_file_line(self):
+        line = (date(2024, 5, 4), 'Swiggy', '', Decimal('150'), 'Dine-out payout')
+        self.assertEqual(row_hash(line, 'a' * 64, 2), row_hash(line, 'a' * 64, 2))
+        self.assertNotEqual(row_hash(line, 'a' * 64, 2), row_hash(line, 'a' * 64, 3))
+        self.assertNotEqual(row_hash(line, 'a' * 64, 2), row_hash(line, 'b' * 64, 2))
+
+
+class SettlementImportTests(TestCase):
+
+    def test_repeated_and_cancelled_orders_are_skipped(self):
+        report = import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy')
+
+        self.assertEqual(report['order_lines'], 3)
+        self.assertEqual(report['income_rows'], 3)
+        self.assertEqual(report['duplicate_count'], 1)
+        self.assertEqual(Income.objects.count(), 3)
+        self.assertEqual(SettlementRow.objects.count(), 3)
+
+    def test_same_file_is_refused(self):
+        import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy')
+
+        with self.assertRaises(ImportFormatError):
+            import_settlement_file(upload(MAY_STATEMENT), 'may-again.csv', channel='Swiggy')
+        self.assertEqual(Income.objects.count(), 3)
+        self.assertEqual(SettlementImport.objects.count(), 1)
+
+    def test_overlapping_statement_adds_only_new_orders(self):
+        import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy')
+        report = import_settlement_file(upload(OVERLAPPING_STATEMENT), 'may-week1.csv', channel='Swiggy')
+
+        self.assertEqual(report['order_lines'], 1)
+        self.assertEqual(report['duplicate_count'], 2)
+        self.assertEqual(Income.objects.count(), 4)
+        self.assertEqual(Income.objects.get(date=date(2024, 5, 3)).amount, Decimal('410.00'))
+
+    def test_lines_without_order_id_are_not_deduplicated(self):
+        report = import_settlement_file(upload(NO_ORDER_IDS), 'dineout.csv', channel='Zomato')
+
+        self.assertEqual(report['order_lines'], 2)
+        self.assertEqual(report['duplicate_count'], 0)
+
+    def test_aggregated_overlap_books_each_order_once(self):
+        import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy', aggregate=True)
+        self.assertEqual(Income.objects.count(), 2)
+        self.assertEqual(Income.objects.get(date=date(2024, 5, 1)).amount, Decimal('430.50'))
+
+        report = import_settlement_file(upload(OVERLAPPING_STATEMENT), 'may-week1.csv', channel='Swiggy',
+                                        aggregate=True)
+
+        self.assertEqual(report['order_lines'], 1)
+        self.assertEqual(report['income_rows'], 1)
+        self.assertEqual(sum(i.amount for i in Income.objects.all()), Decimal('939.50'))
+
+    def test_dry_run_records_nothing(self):
+        report = import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy', dry_run=True)
+        self.assertEqual(report['order_lines'], 3)
+        self.assertEqual(Income.objects.count(), 0)
+        self.assertEqual(SettlementImport.objects.count(), 0)
+
+        # The file can still be imported for real afterwards
+        report = import_settlement_file(upload(MAY_STATEMENT), 'may.csv', channel='Swiggy')
+        self.assertEqual(report['order_lines'], 3)
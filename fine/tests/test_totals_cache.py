@@ -0,0 +1,74 @@
+# fine/tests/test_totals_cache.py
+"""
+Cached page totals are dropped when the rows behind them change.
+Run with: python manage.py test fine.tests.test_totals_cache
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from fine.models import Income, Payroll
+
+
+class PayrollMonthTotalsCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def create_payroll(self, name, basic, month):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Payroll.objects.create(
+                employee_name=name, basic_pay=Decimal(basic), salary_date=date(2024, month, 28), month=month, year=2024,
+            )
+
+    def test_save_invalidates_month(self):
+        self.create_payroll('Cache One', '10000', 1)
+        self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('10000'))
+
+        self.create_payroll('Cache Two', '5000', 1)
+        self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('15000'))
+
+    def test_invalidation_waits_for_commit(self):
+        payroll = self.create_payroll('Cache One', '10000', 1)
+        Payroll.get_month_totals(1, 2024)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            payroll = Payroll.objects.get(pk=payroll.pk)
+            payroll.basic_pay = Decimal('12000')
+            payroll.save()
+            self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('10000'))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('12000'))
+
+    def test_moving_payroll_invalidates_both_months(self):
+        payroll = self.create_payroll('Cache Move', '8000', 1)
+        self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('8000'))
+        self.assertEqual(Payroll.get_month_totals(2, 2024)['total_basic_pay'], Decimal('0'))
+
+        payroll = Payroll.objects.get(pk=payroll.pk)
+        payroll.month, payroll.salary_date = 2, date(2024, 2, 28)
+        with self.captureOnCommitCallbacks(execute=True):
+            payroll.save()
+
+        self.assertEqual(Payroll.get_month_totals(1, 2024)['total_basic_pay'], Decimal('0'))
+        self.assertEqual(Payroll.get_month_totals(2, 2024)['total_basic_pay'], Decimal('8000'))
+
+
+class IncomeSummaryCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_save_and_delete_invalidate_summary(self):
+        self.assertEqual(Income.get_summary_totals()['daily_total'], Decimal('0'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            income = Income.objects.create(description='Sales', amount=Decimal('250'), payment_mode='Cash')
+        self.assertEqual(Income.get_summary_totals()['daily_total'], Decimal('250'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            income.delete()
+        self.assertEqual(Income.get_summary_totals()['daily_total'], Decimal('0'))
@@ -0,0 +1,153 @@
+# fine/tests/test_vendors.py
+"""
+Vendor rows maintained by Purchase.save/delete: each purchase counts once
+towards its vendor's usage_count, and outstanding_amount stays equal to the
+vendor's Pending/Due total, whatever edits and deletes the purchases go through.
+Run with: python manage.py test fine.tests.test_vendors
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from fine.models import Cat, Purchase, Vendor
+
+
+def usage(name):
+    return Vendor.objects.get(normalized_name=Vendor.normalize(name)).usage_count
+
+
+class VendorUsageTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cat = Cat.objects.create(name='Groceries')
+
+    def purchase(self, vendor, bill_no, **fields):
+        return Purchase.objects.create(date=date(2024, 5, 1), vendor=vendor, cat=self.cat, bill_no=bill_no,
+                                       total_amount=Decimal('100'), **fields)
+
+    def test_new_purchases_count_once_per_spelling_variant(self):
+        self.purchase('Ravi Traders', 'B-1')
+        self.purchase('ravi  traders', 'B-2')
+
+        self.assertEqual(Vendor.objects.count(), 1)
+        self.assertEqual(usage('Ravi Traders'), 2)
+
+    def test_edit_without_vendor_change_keeps_count(self):
+        purchase = self.purchase('Ravi Traders', 'B-1')
+        purchase = Purchase.objects.get(pk=purchase.pk)
+        purchase.date = date(2024, 5, 9)
+        purchase.save()
+
+        self.assertEqual(usage('Ravi Traders'), 1)
+        self.assertEqual(Vendor.objects.get().last_used, date(2024, 5, 9))
+
+    def test_edit_to_new_vendor_moves_the_count(self):
+        purchase = self.purchase('Ravi Traders', 'B-1')
+        self.purchase('Ravi Traders', 'B-2')
+
+        purchase = Purchase.objects.get(pk=purchase.pk)
+        purchase.vendor = 'Murugan Stores'
+        purchase.save()
+
+        self.assertEqual(usage('Murugan Stores'), 1)
+        self.assertEqual(usage('Ravi Traders'), 1)
+
+        # A second save of the same edit is not a second move
+        purchase.save()
+        self.assertEqual(usage('Murugan Stores'), 1)
+        self.assertEqual(usage('Ravi Traders'), 1)
+
+    def test_delete_releases_the_use(self):
+        purchase = self.purchase('Ravi Traders', 'B-1')
+        self.purchase('Ravi Traders', 'B-2')
+
+        Purchase.objects.get(pk=purchase.pk).delete()
+        self.assertEqual(usage('Ravi Traders'), 1)
+
+    def test_count_never_goes_negative(self):
+        purchase = self.purchase('Ravi Traders', 'B-1')
+        Vendor.objects.update(usage_count=0)
+
+        purchase.delete()
+        self.assertEqual(usage('Ravi Traders'), 0)
+
+
+class VendorOutstandingTests(TestCase):
+    """outstanding_amount must always equal the Pending/Due total recomputed from purchases"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cat = Cat.objects.create(name='Groceries')
+
+    def purchase(self, vendor, bill_no, amount, status):
+        return Purchase.objects.create(date=date(2024, 5, 1), vendor=vendor, cat=self.cat, bill_no=bill_no,
+                                       total_amount=Decimal(amount), status=status)
+
+    def assertBalancesMatchPurchases(self):
+        expected = {}
+        for purchase in Purchase.objects.all():
+            key = Vendor.normalize(purchase.vendor)
+            owed = purchase.total_amount if purchase.status in Purchase.OUTSTANDING_STATUSES else Decimal('0')
+            expected[key] = expected.get(key, Decimal('0')) + owed
+        actual = {v.normalized_name: v.outstanding_amount for v in Vendor.objects.all()}
+        for key in set(expected) | set(actual):
+            self.assertEqual(actual.get(key, Decimal('0')), expected.get(key, Decimal('0')), key)
+
+    def test_create(self):
+        self.purchase('Ravi Traders', 'B-1', '100', 'Pending')
+        self.purchase('ravi traders', 'B-2', '50', 'Due')
+        self.purchase('Ravi Traders', 'B-3', '70', 'Paid')
+
+        self.assertEqual(Vendor.objects.get().outstanding_amount, Decimal('150'))
+        self.assertBalancesMatchPurchases()
+
+    def test_edits(self):
+        first = self.purchase('Ravi Traders', 'B-1', '100', 'Pending')
+        self.purchase('Ravi Traders', 'B-2', '50', 'Due')
+
+        edits = [
+            {'total_amount': Decimal('120')},
+            {'status': 'Paid'},
+            {'status': 'Due', 'total_amount': Decimal('80')},
+            {'vendor': 'Murugan Stores'},
+            {'vendor': 'Ravi Traders', 'status': 'Pending'},
+        ]
+        for fields in edits:
+            with self.subTest(**{k: str(v) for k, v in fields.items()}):
+                purchase = Purchase.objects.get(pk=first.pk)
+                for name, value in fields.items():
+                    setattr(purchase, name, value)
+                purchase.save()
+                self.assertBalancesMatchPurchases()
+
+    def test_repeated_save_of_one_instance(self):
+        purchase = self.purchase('Ravi Traders', 'B-1', '100', 'Pending')
+        purchase.total_amount = Decimal('40')
+        purchase.save()
+        purchase.save()
+
+        self.assertEqual(Vendor.objects.get().outstanding_amount, Decimal('40'))
+        self.assertBalancesMatchPurchases()
+
+    def test_delete(self):
+        pending = self.purchase('Ravi Traders', 'B-1', '100', 'Pending')
+        self.purchase('Ravi Traders', 'B-2', '50', 'Due')
+        paid = self.purchase('Ravi Traders', 'B-3', '70', 'Paid')
+
+        Purchase.objects.get(pk=pending.pk).delete()
+        self.assertBalancesMatchPurchases()
+        paid.delete()
+        self.assertBalancesMatchPurchases()
+        self.assertEqual(Vendor.objects.get().outstanding_amount, Decimal('50'))
+
+    def test_vendor_balances_endpoint(self):
+        self.purchase('Ravi Traders', 'B-1', '100', 'Pending')
+        self.purchase('Murugan Stores', 'B-2', '30', 'Paid')
+
+        data = self.client.get(reverse('vendor_balances')).json()
+
+        self.assertEqual([row['vendor'] for row in data['data']], ['Ravi Traders'])
+        self.assertEqual(data['total_outstanding'], 100.0)
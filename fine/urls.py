@@ -9,14 +9,25 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('api/dashboard-charts/', views.get_chart_data, name='get_chart_data'),
 
+    # Search
+    path('api/search/', views.search, name='search'),
+
     # Expenses
     path('expenses/', views.expenses, name='expenses'),
+    path('api/expenses/rows/', views.expense_rows, name='expense_rows'),
+    path('expenses/import/', views.import_expenses, name='import_expenses'),
     path('expenses/delete/<int:pk>/', views.delete_expense, name='delete_expense'),
     path('expenses/report/', views.get_expense_report, name='expense_report'),
     path('expenses/restore/', views.restore_expense, name='restore_expense'),
 
     # Purchases
     path('purchases/', views.purchases, name='purchases'),
+    path('api/purchases/rows/', views.purchase_rows, name='purchase_rows'),
+    path('api/vendors/autocomplete/', views.vendor_autocomplete, name='vendor_autocomplete'),
+    path('api/vendors/balances/', views.vendor_balances, name='vendor_balances'),
+    path('api/purchases/payables-aging/', views.payables_aging, name='payables_aging'),
+    path('api/purchases/gst-summary/', views.get_gst_summary, name='get_gst_summary'),
+    path('purchases/gst-summary/export/', views.export_gst_summary, name='export_gst_summary'),
     path('edit_purchase/<int:pk>/', views.edit_purchase, name='edit_purchase'),
     path('delete_purchase/<int:pk>/', views.delete_purchase, name='delete_purchase'),
     path('api/reports/purchase/', views.get_purchase_report, name='get_purchase_report'),
@@ -24,6 +35,8 @@ urlpatterns = [
 
     # Income
     path('income/', views.income, name='income'),
+    path('api/income/rows/', views.income_rows, name='income_rows'),
+    path('income/import-settlements/', views.import_settlements, name='import_settlements'),
     path('edit_income/<int:pk>/', views.edit_income, name='edit_income'),
     path('delete_income/<int:pk>/', views.delete_income, name='delete_income'),
     path('api/income-report/', views.get_income_report, name='get_income_report'),
@@ -35,6 +48,10 @@ urlpatterns = [
     path('delete-payroll/', views.delete_payroll, name='delete_payroll'),
     path('recreate-expenses/', views.recreate_expenses, name='recreate_expenses'),
     path('restore-payroll/', views.restore_payroll, name='restore_payroll'),
+    path('simulate-payroll/', views.simulate_payroll, name='simulate_payroll'),
+    path('export-payslips/', views.export_payslips, name='export_payslips'),
+    path('payroll-arrears/', views.get_payroll_arrears, name='get_payroll_arrears'),
+    path('recompute-payroll-arrears/', views.recompute_payroll_arrears, name='recompute_payroll_arrears'),
     
 
     # Attendance URLs
@@ -72,4 +89,12 @@ urlpatterns = [
     # =================== END REPORTS SECTION ===================
 
     path('settings/', views.settings, name='settings'),
+
+    # Prometheus scrape endpoint
+    path('metrics', views.metrics, name='metrics'),
+
+    # Request profiles (staff only)
+    path('profiles/', views.profile_list, name='profile_list'),
+    path('profiles/<str:name>/', views.profile_detail, name='profile_detail'),
+    path('profiles/<str:name>/download/<str:ext>/', views.profile_download, name='profile_download'),
 ]
\ No newline at end of file
@@ -0,0 +1,205 @@
+# fine/utils/benchmarks.py
+"""
+Endpoint benchmark harness.
+
+Requests each hot endpoint through Django's test client (no web server,
+no external services) against whatever database is configured, usually
+one filled by generate_synthetic_data. For every endpoint it records
+p50/p95 wall time, the query count and the peak Python memory allocated
+while serving the request (tracemalloc), and compares those numbers with
+a stored JSON baseline. tracemalloc slows every allocation down, so timings
+come from untraced requests and memory from a few separate traced ones.
+"""
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+from django.db import connection, connections
+from django.db.models import Max
+from django.test import Client
+from django.urls import reverse
+
+from ..middleware import QueryStats
+from ..models import Expense
+from .period_utils import month_range
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+
+# Traced requests per endpoint for the peak memory figure
+MEMORY_ITERATIONS = 3
+
+# Relative slowdown / memory growth tolerated before a metric counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Timings below this many milliseconds are too noisy to compare relatively
+MIN_COMPARABLE_MS = 5.0
+
+
+def dataset_end_date():
+    """Latest expense date, so the benchmark windows hit data on any dataset"""
+    return Expense.all_objects.aggregate(last=Max('date'))['last'] or date.today()
+
+
+def hot_endpoints(as_of):
+    """[(name, url, params)] for every benchmarked endpoint, anchored on as_of"""
+    month_start, next_month = month_range(as_of.year, as_of.month)
+    month_end = next_month - timedelta(days=1)
+    month = {'start_date': month_start.isoformat(), 'end_date': month_end.isoformat()}
+    period = f"{as_of.year}-{as_of.month:02d}"
+
+    endpoints = [
+        ('dashboard', reverse('dashboard'), {'period': period}),
+    ]
+    for chart_period in ('weekly', 'monthly', 'yearly'):
+        endpoints.append((f'dashboard_charts_{chart_period}', reverse('get_chart_data'),
+                          {'period': chart_period, 'selected_period': period}))
+    endpoints += [
+        ('dashboard_charts_custom', reverse('get_chart_data'), month),
+        ('report_data_all', reverse('get_report_data'), {'type': 'all', 'period': 'monthly', **month}),
+        ('report_export_excel', reverse('export_report'), {'type': 'all', 'format': 'excel', 'period': 'monthly', **month}),
+        ('report_export_pdf', reverse('export_report'), {'type': 'all', 'format': 'pdf', 'period': 'monthly', **month}),
+        ('weekly_attendance', reverse('get_weekly_attendance'), {}),
+        ('attendance_summary', reverse('get_attendance_summary'),
+         {'from_date': month['start_date'], 'to_date': month['end_date']}),
+        ('payroll_data', reverse('get_payroll_data'), {'month': as_of.month, 'year': as_of.year}),
+        ('expenses_page', reverse('expenses'), month),
+        ('income_page', reverse('income'), month),
+        ('purchases_page', reverse('purchases'), month),
+        ('payroll_page', reverse('payroll'), {'period': period}),
+        ('attendance_page', reverse('attendance'), {}),
+    ]
+    return endpoints
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(client, url, params, trace_memory=False):
+    """
+    One request: (status, wall ms, query count, peak bytes). Peak bytes is
+    None unless trace_memory is set, which needs tracemalloc running.
+    """
+    stats = QueryStats()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(stats))
+        response = client.get(url, params)
+        # Exports may stream; include producing the body in the timing
+        if getattr(response, 'streaming', False):
+            for _ in response.streaming_content:
+                pass
+        else:
+            response.content
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    peak = None
+    if trace_memory:
+        peak = max(tracemalloc.get_traced_memory()[1] - baseline_memory, 0)
+    return response.status_code, elapsed_ms, stats.count, peak
+
+
+def run_benchmarks(iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, only=None, as_of=None, log=None):
+    """Benchmark every hot endpoint; returns the result document (same shape as the baseline)"""
+    log = log or (lambda message: None)
+    as_of = as_of or dataset_end_date()
+    # Record server errors as 500s instead of letting one broken endpoint abort the run
+    client = Client(raise_request_exception=False)
+    results = {}
+
+    for name, url, params in hot_endpoints(as_of):
+        if only and name not in only:
+            continue
+        for _ in range(warmup):
+            measure(client, url, params)
+
+        timings, queries, statuses = [], [], set()
+        for _ in range(iterations):
+            status, elapsed_ms, query_count, _ = measure(client, url, params)
+            timings.append(elapsed_ms)
+            queries.append(query_count)
+            statuses.add(status)
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(MEMORY_ITERATIONS):
+                status, _, _, peak = measure(client, url, params, trace_memory=True)
+                peaks.append(peak)
+                statuses.add(status)
+        finally:
+            tracemalloc.stop()
+
+        results[name] = {
+            'url': url,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 0.95), 2),
+            'queries': max(queries),
+            'peak_kb': round(max(peaks) / 1024, 1),
+            'status': sorted(statuses),
+        }
+        log(f"{name}: p50 {results[name]['p50_ms']}ms, p95 {results[name]['p95_ms']}ms, "
+            f"{results[name]['queries']} queries, {results[name]['peak_kb']} KiB")
+
+    return {
+        'meta': {
+            'as_of': as_of.isoformat(),
+            'iterations': iterations,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'endpoints': results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """List of regression messages for results against a baseline document"""
+    regressions = []
+    for name, current in results['endpoints'].items():
+        if any(status >= 400 for status in current['status']):
+            regressions.append(f"{name}: returned HTTP {current['status']}")
+
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: {current['queries']} queries (baseline {previous['queries']})")
+        for metric, unit in (('p50_ms', 'ms'), ('p95_ms', 'ms'), ('peak_kb', 'KiB')):
+            before, after = previous[metric], current[metric]
+            if unit == 'ms' and max(before, after) < MIN_COMPARABLE_MS:
+                continue
+            if before and after > before * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {after}{unit} vs baseline {before}{unit} (+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_baseline(results, baseline):
+    """Baseline document with results' endpoints replacing the same names in baseline"""
+    return {
+        'meta': results['meta'],
+        'endpoints': {**baseline.get('endpoints', {}), **results['endpoints']},
+    }
+
+
+def save_baseline(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,252 @@
+# fine/utils/expense_import.py
+"""
+Streaming bulk import of expenses from CSV or XLSX voucher sheets.
+
+Rows are read one at a time (csv.DictReader / openpyxl read-only mode),
+validated against Expense.CATEGORY_CHOICES and PAYMENT_METHOD_CHOICES, and
+written with bulk_create in fixed-size batches inside one transaction.
+Invalid rows are skipped and reported with their line number, as are
+duplicate vouchers (same fingerprint already in the file or the database).
+"""
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from ..models import Employee, Expense, SearchToken
+
+DEFAULT_BATCH_SIZE = 2000
+
+# Only the first errors are returned in full; the rest are just counted
+MAX_REPORTED_ERRORS = 1000
+
+# Accepted header spellings -> Expense field
+COLUMN_ALIASES = {
+    'date': 'date',
+    'voucher_no': 'voucher_no',
+    'voucher no': 'voucher_no',
+    'voucher': 'voucher_no',
+    'category': 'category',
+    'description': 'description',
+    'total_amount': 'total_amount',
+    'total amount': 'total_amount',
+    'amount': 'total_amount',
+    'payment_method': 'payment_method',
+    'payment method': 'payment_method',
+    'payment mode': 'payment_method',
+    'employee_name': 'employee_name',
+    'employee name': 'employee_name',
+    'employee': 'employee_name',
+}
+
+REQUIRED_COLUMNS = ('date', 'category', 'total_amount', 'payment_method')
+
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d-%b-%Y', '%Y-%m-%d %H:%M:%S', '%d-%m-%Y %H:%M', '%d/%m/%Y %H:%M')
+
+# Salary expenses are created from payroll, never imported directly
+CATEGORY_LOOKUP = {c[0].lower(): c[0] for c in Expense.CATEGORY_CHOICES if c[0] != 'Salary'}
+PAYMENT_METHOD_LOOKUP = {p[0].lower(): p[0] for p in Expense.PAYMENT_METHOD_CHOICES if p[0] != 'Salary'}
+
+
+class ImportFormatError(ValueError):
+    """Raised when the file itself cannot be read as an expense sheet"""
+
+
+def _map_header(header, aliases, required):
+    mapping = []
+    for name in header:
+        key = str(name).strip().lower() if name is not None else ''
+        mapping.append(aliases.get(key))
+
+    missing = [col for col in required if col not in mapping]
+    if missing:
+        raise ImportFormatError(f"Missing required column(s): {', '.join(missing)}")
+    return mapping
+
+
+def iter_sheet_rows(fileobj, filename, aliases=COLUMN_ALIASES, required=REQUIRED_COLUMNS):
+    """Yield (line_no, {field: value}) for each data row of a CSV or XLSX file"""
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                raise ImportFormatError("The sheet is empty")
+            mapping = _map_header(header, aliases, required)
+            for line_no, values in enumerate(rows, start=2):
+                if values is None or all(v is None or v == '' for v in values):
+                    continue
+                yield line_no, {field: value for field, value in zip(mapping, values) if field}
+        finally:
+            wb.close()
+    elif filename.lower().endswith('.csv'):
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            raise ImportFormatError("The file is empty")
+        mapping = _map_header(header, aliases, required)
+        for line_no, values in enumerate(reader, start=2):
+            if not any(v.strip() for v in values):
+                continue
+            yield line_no, {field: value for field, value in zip(mapping, values) if field}
+    else:
+        raise ImportFormatError("Unsupported file type. Upload a .csv or .xlsx file")
+
+
+def parse_sheet_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date '{text}'")
+
+
+def _clean_text(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def build_expense(values):
+    """Validate one row and return an unsaved Expense, or raise ValueError"""
+    expense_date = parse_sheet_date(values.get('date'))
+
+    category = CATEGORY_LOOKUP.get(_clean_text(values.get('category')).lower())
+    if not category:
+        raise ValueError(f"Unknown category '{_clean_text(values.get('category'))}'")
+
+    payment_method = PAYMENT_METHOD_LOOKUP.get(_clean_text(values.get('payment_method')).lower())
+    if not payment_method:
+        raise ValueError(f"Unknown payment method '{_clean_text(values.get('payment_method'))}'")
+
+    try:
+        total_amount = Decimal(_clean_text(values.get('total_amount')).replace(',', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{_clean_text(values.get('total_amount'))}'")
+    if total_amount <= Decimal('0'):
+        raise ValueError("Amount must be greater than zero")
+
+    expense = Expense(
+        date=expense_date,
+        voucher_no=_clean_text(values.get('voucher_no'))[:50] or None,
+        category=category,
+        description=_clean_text(values.get('description')),
+        total_amount=total_amount,
+        payment_method=payment_method,
+        employee_name=_clean_text(values.get('employee_name'))[:100] or None,
+        record_state='active',
+    )
+    # bulk_create skips save(), so set the fingerprint here (employee_id is set per batch)
+    expense.fingerprint = expense.compute_fingerprint()
+    return expense
+
+
+def _existing_fingerprints(batch):
+    """Fingerprints of the batch that already exist as active expenses (one indexed query)"""
+    fingerprints = {e.fingerprint for e in batch if e.fingerprint}
+    if not fingerprints:
+        return set()
+    return set(Expense.objects.filter(fingerprint__in=fingerprints).values_list('fingerprint', flat=True))
+
+
+def _assign_employee_ids(rows):
+    """
+    Set employee_id on rows with an employee_name, as Expense.save() would:
+    one query for the batch's known employees, then resolve_id for new names.
+    """
+    named = [e for e in rows if e.employee_name]
+    if not named:
+        return
+    ids = Employee.ids_for(e.employee_name for e in named)
+    for expense in named:
+        key = Employee.normalize(expense.employee_name)
+        if key not in ids:
+            ids[key] = Employee.resolve_id(expense.employee_name)
+        expense.employee_id = ids[key]
+
+
+def import_expense_file(fileobj, filename, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Import expenses from an uploaded CSV/XLSX file.
+
+    Valid rows are inserted in batches of batch_size inside a single
+    transaction (rolled back when dry_run is set). Returns a report with
+    the imported count and row-level errors.
+    """
+    imported = 0
+    error_count = 0
+    duplicate_count = 0
+    errors = []
+    batch = []
+    batch_lines = []
+    seen = set()
+
+    def report_error(line_no, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': line_no, 'message': message})
+
+    def flush():
+        nonlocal imported, duplicate_count
+        existing = _existing_fingerprints(batch)
+        rows = []
+        for line_no, expense in zip(batch_lines, batch):
+            if expense.fingerprint in existing:
+                duplicate_count += 1
+                report_error(line_no, f"Duplicate voucher '{expense.voucher_no}' already recorded")
+            else:
+                rows.append(expense)
+        _assign_employee_ids(rows)
+        Expense.objects.bulk_create(rows, batch_size=batch_size)
+        # bulk_create skips save(); index rows whose keys the backend returned
+        SearchToken.index_documents('expense', rows)
+        imported += len(rows)
+
+    with transaction.atomic():
+        for line_no, values in iter_sheet_rows(fileobj, filename):
+            try:
+                expense = build_expense(values)
+            except ValueError as e:
+                report_error(line_no, str(e))
+                continue
+
+            if expense.fingerprint:
+                if expense.fingerprint in seen:
+                    duplicate_count += 1
+                    report_error(line_no, f"Duplicate voucher '{expense.voucher_no}' repeated in file")
+                    continue
+                seen.add(expense.fingerprint)
+
+            batch.append(expense)
+            batch_lines.append(line_no)
+            if len(batch) >= batch_size:
+                flush()
+                batch = []
+                batch_lines = []
+
+        if batch:
+            flush()
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return {
+        'imported': imported,
+        'error_count': error_count,
+        'duplicate_count': duplicate_count,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
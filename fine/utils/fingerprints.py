@@ -0,0 +1,36 @@
+# fine/utils/fingerprints.py
+"""
+Normalized voucher/bill fingerprints used to catch duplicate entries.
+
+A fingerprint hashes (date, amount, voucher or bill number, category or
+vendor) after normalising case and whitespace. Rows without a voucher/bill
+number get an empty fingerprint and are never treated as duplicates, since
+same-day same-amount entries without a reference are normal.
+"""
+import hashlib
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+
+def normalize_ref(value):
+    """Lower-case and collapse whitespace"""
+    return ' '.join(str(value or '').lower().split())
+
+
+def voucher_fingerprint(date_value, amount, reference, party):
+    reference = normalize_ref(reference)
+    if not reference:
+        return ''
+
+    if isinstance(date_value, datetime):
+        date_value = date_value.date()
+    elif isinstance(date_value, str):
+        date_value = date.fromisoformat(date_value[:10])
+
+    try:
+        amount = Decimal(str(amount or 0)).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        amount = Decimal('0.00')
+
+    raw = '|'.join([date_value.isoformat(), str(amount), reference, normalize_ref(party)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
@@ -0,0 +1,175 @@
+# fine/utils/gst_summary.py
+"""
+GST input-credit summaries read from GstMonthlyRollup.
+
+The rollup holds one row per (month, category, vendor), so a quarter or a
+year is a handful of rows; summaries pivot them in Python from one query.
+Years and quarters are financial (April-March, as GST returns are filed):
+FY2025-26 Q1 is April-June 2025.
+rebuild_gst_rollup recreates the table from purchases in one grouped query.
+"""
+import calendar
+from decimal import Decimal
+from io import BytesIO
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from ..models import GstMonthlyRollup, Purchase
+from .period_utils import FISCAL_YEAR_START_MONTH
+
+# Calendar months of the financial year, April first
+FISCAL_MONTHS = tuple((FISCAL_YEAR_START_MONTH - 1 + i) % 12 + 1 for i in range(12))
+
+
+def fiscal_year_label(fiscal_year):
+    return f"FY{fiscal_year}-{(fiscal_year + 1) % 100:02d}"
+
+
+def fiscal_month(fiscal_year, month):
+    """(calendar year, month) of a month within a financial year"""
+    return (fiscal_year if month >= FISCAL_YEAR_START_MONTH else fiscal_year + 1), month
+
+
+def rebuild_gst_rollup():
+    """Recreate every rollup row from the purchase table; returns the row count"""
+    grouped = Purchase.objects.annotate(
+        p_year=ExtractYear('date'),
+        p_month=ExtractMonth('date'),
+    ).values('p_year', 'p_month', 'cat_id', 'vendor').annotate(
+        bills=Count('id'),
+        total=Sum('total_amount'),
+        gst=Sum('gst_amount'),
+    ).order_by()
+
+    rows = {}
+    for g in grouped:
+        key = (g['p_year'], g['p_month'], g['cat_id'], GstMonthlyRollup.vendor_key_for(g['vendor']))
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = GstMonthlyRollup(
+                year=key[0], month=key[1], cat_id=key[2], vendor_key=key[3],
+                vendor=' '.join(str(g['vendor']).split())[:100],
+            )
+        row.bill_count += g['bills']
+        row.total_amount += g['total'] or Decimal('0')
+        row.gst_amount += g['gst'] or Decimal('0')
+
+    with transaction.atomic():
+        GstMonthlyRollup.objects.all().delete()
+        GstMonthlyRollup.objects.bulk_create(rows.values(), batch_size=2000)
+    return len(rows)
+
+
+def gst_summary(fiscal_year, quarter=None, month=None):
+    """
+    GST totals for a financial year, one of its quarters or one of its months,
+    broken down by month, category and vendor
+    """
+    if month:
+        months = (fiscal_month(fiscal_year, month),)
+        label = f"{calendar.month_name[month]} {months[0][0]}"
+    elif quarter:
+        months = tuple(fiscal_month(fiscal_year, m) for m in FISCAL_MONTHS[(quarter - 1) * 3:quarter * 3])
+        label = f"{fiscal_year_label(fiscal_year)} Q{quarter}"
+    else:
+        months = tuple(fiscal_month(fiscal_year, m) for m in FISCAL_MONTHS)
+        label = fiscal_year_label(fiscal_year)
+
+    # A financial year spans two calendar years: filter on (year, month) pairs
+    in_period = Q()
+    for calendar_year in sorted({y for y, _ in months}):
+        in_period |= Q(year=calendar_year, month__in=[m for y, m in months if y == calendar_year])
+
+    rows = GstMonthlyRollup.objects.filter(in_period, bill_count__gt=0).values(
+        'year', 'month', 'cat__name', 'vendor_key', 'vendor', 'bill_count', 'total_amount', 'gst_amount'
+    )
+
+    def bucket():
+        return {'bills': 0, 'total_amount': Decimal('0'), 'gst_amount': Decimal('0')}
+
+    def add(target, row):
+        target['bills'] += row['bill_count']
+        target['total_amount'] += row['total_amount']
+        target['gst_amount'] += row['gst_amount']
+
+    totals = bucket()
+    by_month = {m: bucket() for m in months}
+    by_category = {}
+    by_vendor = {}
+    for row in rows:
+        add(totals, row)
+        add(by_month[(row['year'], row['month'])], row)
+        add(by_category.setdefault(row['cat__name'], bucket()), row)
+        vendor = by_vendor.setdefault(row['vendor_key'], {'vendor': row['vendor'], **bucket()})
+        add(vendor, row)
+
+    def as_float(values):
+        return {k: float(v) if isinstance(v, Decimal) else v for k, v in values.items()}
+
+    return {
+        'period': label,
+        'fiscal_year': fiscal_year,
+        'quarter': quarter,
+        'month': month,
+        'totals': as_float(totals),
+        'by_month': [
+            {'year': y, 'month': m, 'month_name': f"{calendar.month_abbr[m]} {y}", **as_float(v)}
+            for (y, m), v in by_month.items()
+        ],
+        'by_category': sorted(
+            ({'category': name, **as_float(v)} for name, v in by_category.items()),
+            key=lambda c: c['gst_amount'], reverse=True
+        ),
+        'by_vendor': sorted(
+            (as_float(v) for v in by_vendor.values()),
+            key=lambda v: v['gst_amount'], reverse=True
+        ),
+    }
+
+
+def gst_summary_workbook(summary):
+    """Excel workbook bytes for a gst_summary result"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    header_font = Font(bold=True, size=12, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    title_font = Font(bold=True, size=14)
+
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    sheets = (
+        ('By Month', ['Month', 'Bills', 'Purchases (₹)', 'GST Input (₹)'],
+         [[m['month_name'], m['bills'], m['total_amount'], m['gst_amount']] for m in summary['by_month']]),
+        ('By Category', ['Category', 'Bills', 'Purchases (₹)', 'GST Input (₹)'],
+         [[c['category'], c['bills'], c['total_amount'], c['gst_amount']] for c in summary['by_category']]),
+        ('By Vendor', ['Vendor', 'Bills', 'Purchases (₹)', 'GST Input (₹)'],
+         [[v['vendor'], v['bills'], v['total_amount'], v['gst_amount']] for v in summary['by_vendor']]),
+    )
+
+    for title, headers, rows in sheets:
+        ws = wb.create_sheet(title)
+        ws.append([f"GST Input Credit - {title}"])
+        ws.append([f"Period: {summary['period']}"])
+        ws.append([])
+        ws['A1'].font = title_font
+        ws.append(headers)
+        for cell in ws[4]:
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal='center')
+        for row in rows:
+            ws.append(row)
+        ws.append([])
+        ws.append(['Total', summary['totals']['bills'], summary['totals']['total_amount'], summary['totals']['gst_amount']])
+        ws.cell(row=ws.max_row, column=1).font = Font(bold=True)
+        ws.column_dimensions['A'].width = 30
+        for column in ('B', 'C', 'D'):
+            ws.column_dimensions[column].width = 16
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
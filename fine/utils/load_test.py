@@ -0,0 +1,261 @@
+# fine/utils/load_test.py
+"""
+In-process concurrent load test for the month-end write paths.
+
+Simulated supervisors run as threads (each with its own database
+connection), optionally spread over several processes, and fire a weighted
+mix of save_attendance, edit_attendance, save_payroll and report reads
+through the Django test client for a fixed time. The same small pool of
+employees and days is hit on purpose so writes contend for the same rows.
+
+The report gives throughput and latency percentiles per operation, counts
+deadlocks, lock-wait timeouts and constraint conflicts from the error
+responses, and finishes with integrity checks over the written month
+(duplicate attendance, duplicate payroll, Salary expenses that no longer
+add up to net salary).
+"""
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.test import Client
+from django.urls import reverse
+
+from ..models import Attendance, Payroll
+from .load_test_worker import process_main
+from .period_utils import month_range
+
+DEFAULT_MIX = {
+    'save_attendance': 45,
+    'edit_attendance': 20,
+    'save_payroll': 10,
+    'report_read': 25,
+}
+
+ATTENDANCE_STATUSES = ('present', 'present', 'present', 'half_day', 'absent')
+
+# Substrings of backend error messages, checked in order
+ERROR_KINDS = (
+    ('deadlock', ('deadlock',)),
+    ('lock_timeout', ('lock wait timeout', 'database is locked', 'could not obtain lock')),
+    ('conflict', ('duplicate entry', 'unique constraint', 'integrityerror')),
+)
+
+
+def classify_error(message):
+    text = (message or '').lower()
+    for kind, needles in ERROR_KINDS:
+        if any(needle in text for needle in needles):
+            return kind
+    return 'error'
+
+
+def load_scenario(year, month, employees=None):
+    """Employees with an active payroll in the month (optionally the first N) and the month's days"""
+    start, end = month_range(year, month)
+    rows = list(Payroll.objects.filter(month=month, year=year).order_by('employee_name').values(
+        'employee_name', 'basic_pay', 'payment_split_type', 'cash_percentage',
+        'bank_transfer_percentage', 'salary_date',
+    ))
+    if employees:
+        rows = rows[:employees]
+    for row in rows:
+        for key in ('basic_pay', 'cash_percentage', 'bank_transfer_percentage'):
+            row[key] = str(row[key])
+        row['salary_date'] = row['salary_date'].isoformat()
+    days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days)]
+    return {'year': year, 'month': month, 'employees': rows, 'days': days}
+
+
+def _operation(rng, scenario, kind):
+    """(method, url, body or query) for one operation"""
+    employee = rng.choice(scenario['employees'])
+    day = rng.choice(scenario['days'])
+
+    if kind == 'save_attendance':
+        return 'post', reverse('save_attendance'), {
+            'employee_name': employee['employee_name'],
+            'date': day,
+            'status': rng.choice(ATTENDANCE_STATUSES),
+            'notes': '',
+        }
+    if kind == 'edit_attendance':
+        return 'post', reverse('edit_attention'), {
+            'employee_name': employee['employee_name'],
+            'date': day,
+            'status': rng.choice(ATTENDANCE_STATUSES),
+            'notes': 'load test',
+        }
+    if kind == 'save_payroll':
+        return 'post', reverse('save_payroll'), {
+            'employee_name': employee['employee_name'],
+            'month': scenario['month'],
+            'year': scenario['year'],
+            'basic_pay': employee['basic_pay'],
+            'spr_amount': 0,
+            'salary_date': employee['salary_date'],
+            'payment_split_type': employee['payment_split_type'],
+            'cash_percentage': employee['cash_percentage'],
+            'bank_transfer_percentage': employee['bank_transfer_percentage'],
+        }
+
+    read = rng.choice(('payroll', 'weekly', 'report'))
+    if read == 'payroll':
+        return 'get', reverse('get_payroll_data'), {'month': scenario['month'], 'year': scenario['year']}
+    if read == 'weekly':
+        return 'get', reverse('get_weekly_attendance'), {}
+    return 'get', reverse('get_report_data'), {
+        'type': 'all', 'period': 'monthly', 'start_date': scenario['days'][0], 'end_date': scenario['days'][-1],
+    }
+
+
+def _user(scenario, mix, duration, seed, results):
+    """One simulated user: fire operations until duration elapses, appending samples to results"""
+    rng = random.Random(seed)
+    client = Client(raise_request_exception=False)
+    kinds, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+    samples = []
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights=weights)[0]
+            method, url, payload = _operation(rng, scenario, kind)
+            started = time.perf_counter()
+            if method == 'post':
+                response = client.post(url, json.dumps(payload), content_type='application/json')
+            else:
+                response = client.get(url, payload)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            outcome = 'ok'
+            if response.status_code >= 400:
+                try:
+                    body = json.loads(response.content)
+                    message = body.get('message') or body.get('error')
+                except (ValueError, AttributeError):
+                    message = response.content[:500].decode('utf-8', 'replace')
+                outcome = classify_error(message)
+            samples.append((kind, outcome, elapsed_ms))
+    finally:
+        connections.close_all()
+        results.extend(samples)
+
+
+def _run_threads(scenario, mix, threads, duration, seed):
+    results = []
+    workers = [
+        threading.Thread(target=_user, args=(scenario, mix, duration, seed * 1000 + i, results))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def summarize(samples, elapsed):
+    """Per-operation counts, throughput, latency percentiles and error kinds"""
+    by_kind = defaultdict(list)
+    for kind, outcome, elapsed_ms in samples:
+        by_kind[kind].append((outcome, elapsed_ms))
+    by_kind['all'] = [(outcome, elapsed_ms) for _, outcome, elapsed_ms in samples]
+
+    summary = {}
+    for kind, rows in by_kind.items():
+        latencies = sorted(ms for _, ms in rows)
+        outcomes = defaultdict(int)
+        for outcome, _ in rows:
+            outcomes[outcome] += 1
+        summary[kind] = {
+            'requests': len(rows),
+            'throughput_rps': round(len(rows) / elapsed, 1) if elapsed else 0,
+            'p50_ms': round(_percentile(latencies, 0.50), 1),
+            'p95_ms': round(_percentile(latencies, 0.95), 1),
+            'p99_ms': round(_percentile(latencies, 0.99), 1),
+            'max_ms': round(latencies[-1], 1) if latencies else 0,
+            'outcomes': dict(outcomes),
+        }
+    return summary
+
+
+def integrity_violations(year, month):
+    """Duplicate or inconsistent rows left behind in the month"""
+    start, end = month_range(year, month)
+    attendance = Attendance.objects.filter(date__gte=start, date__lt=end)
+
+    duplicate_attendance = list(
+        attendance.values('employee_id', 'date').annotate(n=Count('id')).filter(n__gt=1).order_by()
+        .values_list('employee_id', 'date', 'n')[:50]
+    )
+    duplicate_payroll = list(
+        Payroll.objects.filter(month=month, year=year).values('employee_id').annotate(n=Count('id'))
+        .filter(n__gt=1).order_by().values_list('employee_id', 'n')[:50]
+    )
+    salary_mismatch = list(
+        Payroll.objects.filter(month=month, year=year, expenses_created=True).annotate(
+            paid=Coalesce(
+                Sum('expenses__total_amount', filter=Q(expenses__record_state='active', expenses__category='Salary')),
+                Value(0), output_field=DecimalField(max_digits=12, decimal_places=2),
+            )
+        ).exclude(paid=F('net_salary')).values_list('id', 'net_salary', 'paid')[:50]
+    )
+    return {
+        'duplicate_attendance': [
+            {'employee_id': e, 'date': d.isoformat(), 'rows': n} for e, d, n in duplicate_attendance
+        ],
+        'duplicate_payroll': [{'employee_id': e, 'rows': n} for e, n in duplicate_payroll],
+        'salary_expense_mismatch': [
+            {'payroll_id': p, 'net_salary': str(net), 'salary_expenses': str(paid)} for p, net, paid in salary_mismatch
+        ],
+    }
+
+
+def run_load_test(year, month, threads=8, processes=1, duration=30, mix=None, employees=None, seed=1, log=None):
+    """Run the load test and return the report dict"""
+    log = log or (lambda message: None)
+    mix = mix or DEFAULT_MIX
+    scenario = load_scenario(year, month, employees)
+    if not scenario['employees']:
+        raise ValueError(f"No active payroll for {year}-{month:02d}; generate data first")
+
+    log(f"{processes} process(es) x {threads} thread(s) for {duration}s over "
+        f"{len(scenario['employees'])} employees, {year}-{month:02d}")
+
+    started = time.perf_counter()
+    if processes <= 1:
+        samples = _run_threads(scenario, mix, threads, duration, seed)
+    else:
+        # Workers open their own connections; don't share this process's sockets
+        database_name = connections['default'].settings_dict['NAME']
+        connections.close_all()
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes) as pool:
+            chunks = pool.map(process_main, [
+                (database_name, scenario, mix, threads, duration, seed + i) for i in range(processes)
+            ])
+        samples = [sample for chunk in chunks for sample in chunk]
+    elapsed = time.perf_counter() - started
+
+    return {
+        'config': {
+            'year': year, 'month': month, 'threads': threads, 'processes': processes,
+            'duration_s': duration, 'employees': len(scenario['employees']), 'mix': mix, 'seed': seed,
+        },
+        'elapsed_s': round(elapsed, 2),
+        'operations': summarize(samples, elapsed),
+        'integrity': integrity_violations(year, month),
+    }
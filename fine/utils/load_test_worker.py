@@ -0,0 +1,27 @@
+# fine/utils/load_test_worker.py
+"""
+Entry point of load-test worker processes.
+
+Workers are started with the 'spawn' method: a fresh interpreter imports this
+module to find the target before Django is configured, so nothing here may
+import models (or a fine module that does) at module level. django.setup()
+runs first, then the load test itself is imported.
+"""
+
+
+def process_main(args):
+    """Run one worker's simulated users; args is (database name, *_run_threads arguments)"""
+    database_name, *thread_args = args
+
+    import django
+    django.setup()
+
+    from django.db import connections
+    from django.test.utils import setup_test_environment
+
+    # Write to the parent's database, which is a test_ database under the test runner
+    connections['default'].settings_dict['NAME'] = database_name
+    setup_test_environment()
+
+    from .load_test import _run_threads
+    return _run_threads(*thread_args)
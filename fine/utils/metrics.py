@@ -0,0 +1,154 @@
+# fine/utils/metrics.py
+"""
+Prometheus metrics for requests, report exports, attendance summary
+regeneration and the totals caches, served in the text format at /metrics.
+
+Uses prometheus_client when it is installed; without it every recording
+call is a no-op and /metrics answers 503. Under gunicorn (or any
+multi-process server) set PROMETHEUS_MULTIPROC_DIR to an empty directory
+writable by all workers before they start: each worker then writes its
+samples to files there and /metrics merges them, so any worker can serve a
+complete scrape. Clear the directory on deploy and call
+mark_process_dead(worker.pid) from gunicorn's child_exit hook.
+
+Cache hit ratios are derived from the hit/miss counters at scrape time.
+"""
+import os
+
+from django.conf import settings
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:
+    prometheus_client = None
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+EXPORT_SIZE_BUCKETS = (10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6, 50e6)
+SUMMARY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def enabled():
+    return prometheus_client is not None and getattr(settings, 'METRICS_ENABLED', True)
+
+
+def multiprocess_dir():
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir')
+
+
+if prometheus_client is not None:
+    REQUEST_DURATION = Histogram(
+        'fine_request_duration_seconds', 'Request wall time by URL name',
+        ['view', 'method'],
+    )
+    REQUEST_QUERIES = Histogram(
+        'fine_request_queries', 'Database queries per request by URL name',
+        ['view'], buckets=QUERY_BUCKETS,
+    )
+    EXPORT_DURATION = Histogram(
+        'fine_export_duration_seconds', 'export_report time to build the file',
+        ['format', 'type'],
+    )
+    EXPORT_SIZE = Histogram(
+        'fine_export_size_bytes', 'export_report file size',
+        ['format', 'type'], buckets=EXPORT_SIZE_BUCKETS,
+    )
+    SUMMARY_GENERATIONS = Counter(
+        'fine_summary_generations', 'AttendanceSummary.generate_summary_for_period calls',
+        ['period_type', 'result'],
+    )
+    SUMMARY_DURATION = Histogram(
+        'fine_summary_generation_duration_seconds', 'AttendanceSummary.generate_summary_for_period time',
+        ['period_type'], buckets=SUMMARY_BUCKETS,
+    )
+    CACHE_REQUESTS = Counter(
+        'fine_cache_requests', 'Cache lookups by cache and result (hit or miss)',
+        ['cache', 'result'],
+    )
+
+    class CacheHitRatioCollector:
+        """fine_cache_hit_ratio per cache, computed from the fine_cache_requests counters of a registry"""
+
+        def __init__(self, source):
+            self.source = source
+
+        def collect(self):
+            lookups = {}
+            for family in self.source.collect():
+                if family.name != 'fine_cache_requests':
+                    continue
+                for sample in family.samples:
+                    if not sample.name.endswith('_total'):
+                        continue
+                    counts = lookups.setdefault(sample.labels['cache'], {'hit': 0.0, 'miss': 0.0})
+                    counts[sample.labels['result']] = counts.get(sample.labels['result'], 0.0) + sample.value
+
+            ratio = GaugeMetricFamily(
+                'fine_cache_hit_ratio', 'Share of cache lookups that were hits since the counters started',
+                labels=['cache'],
+            )
+            for cache_name, counts in sorted(lookups.items()):
+                total = counts['hit'] + counts['miss']
+                if total:
+                    ratio.add_metric([cache_name], counts['hit'] / total)
+            yield ratio
+
+
+def observe_request(view, method, seconds, queries):
+    if enabled():
+        REQUEST_DURATION.labels(view or 'unresolved', method).observe(seconds)
+        REQUEST_QUERIES.labels(view or 'unresolved').observe(queries)
+
+
+def observe_export(format_type, report_type, seconds, size):
+    if enabled():
+        EXPORT_DURATION.labels(format_type, report_type).observe(seconds)
+        if size is not None:
+            EXPORT_SIZE.labels(format_type, report_type).observe(size)
+
+
+def observe_summary(period_type, created, seconds):
+    if enabled():
+        SUMMARY_GENERATIONS.labels(period_type, 'created' if created else 'updated').inc()
+        SUMMARY_DURATION.labels(period_type).observe(seconds)
+
+
+def record_cache(cache_name, hit):
+    if enabled():
+        CACHE_REQUESTS.labels(cache_name, 'hit' if hit else 'miss').inc()
+
+
+class _Forward:
+    """Collector re-exposing everything another registry collects"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        return self.source.collect()
+
+
+def render():
+    """Exposition text for all metrics (merged across workers in multi-process mode), or None when disabled"""
+    if not enabled():
+        return None
+
+    if multiprocess_dir():
+        source = CollectorRegistry()
+        multiprocess.MultiProcessCollector(source)
+    else:
+        source = prometheus_client.REGISTRY
+
+    registry = CollectorRegistry()
+    registry.register(_Forward(source))
+    registry.register(CacheHitRatioCollector(source))
+    return prometheus_client.generate_latest(registry)
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live-gauge files (call from gunicorn's child_exit hook)"""
+    if prometheus_client is not None and multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
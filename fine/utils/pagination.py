@@ -0,0 +1,71 @@
+# fine/utils/pagination.py
+"""
+Keyset (seek) pagination for the date-ordered listing pages.
+
+Rows are ordered newest first on (date, id). The cursor is the (date, id)
+of the last row shown, so every page is an index range read no matter
+how deep the user scrolls, unlike OFFSET paging.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE):
+    """Page size from the query string, clamped to [1, MAX_PAGE_SIZE]"""
+    try:
+        page_size = int(request.GET.get('page_size', default))
+    except (ValueError, TypeError):
+        page_size = default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(row):
+    return f"{row.date.isoformat()}_{row.pk}"
+
+
+def decode_cursor(cursor):
+    """Return (date, id) from a cursor string, or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        date_str, pk_str = cursor.split('_', 1)
+        return date.fromisoformat(date_str), int(pk_str)
+    except (ValueError, AttributeError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE, amount_field=None):
+    """
+    Fetch one page of rows after the cursor.
+
+    Returns a dict with the rows, the cursor for the next page, whether
+    more rows exist and, when amount_field is given, the page total.
+    """
+    queryset = queryset.order_by('-date', '-id')
+
+    position = decode_cursor(cursor)
+    if position:
+        last_date, last_id = position
+        queryset = queryset.filter(Q(date__lt=last_date) | Q(date=last_date, id__lt=last_id))
+
+    # One extra row tells us whether another page exists without a COUNT
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    page_total = None
+    if amount_field:
+        page_total = sum((getattr(row, amount_field) or Decimal('0') for row in rows), Decimal('0'))
+
+    return {
+        'rows': rows,
+        'has_more': has_more,
+        'next_cursor': encode_cursor(rows[-1]) if has_more and rows else None,
+        'page_total': page_total,
+        'page_size': page_size,
+    }
@@ -0,0 +1,120 @@
+# fine/utils/payroll_arrears.py
+"""
+Incremental payroll arrears engine.
+
+Attendance saves mark the affected (employee, month) payrolls in DirtyPayroll.
+This module recomputes only those payrolls in one batch: worked days (the
+same Payroll.worked_days_for rule as a normal save), incentive eligibility
+(> 28 worked days), salary split, and the linked Salary expenses. It returns
+a variance report.
+
+The configured incentive is kept in configured_spr_amount, so an incentive
+revoked by a downward attendance edit comes back after an upward one.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+
+from ..models import DirtyPayroll, Expense, Payroll, SearchToken
+
+PAYROLL_FIELDS = [
+    'worked_days', 'spr_amount', 'net_salary',
+    'cash_percentage', 'bank_transfer_percentage',
+    'cash_amount', 'bank_transfer_amount',
+]
+
+
+def _rebuild_salary_expenses(payrolls):
+    """
+    Replace the Salary expenses of payrolls in bulk. bulk_create skips
+    Expense.save(), so fingerprints and search tokens are handled here.
+    """
+    old_ids = list(Expense.objects.filter(payroll__in=payrolls).values_list('id', flat=True))
+    Expense.objects.filter(id__in=old_ids).delete()
+    SearchToken.remove_documents('expense', old_ids)
+
+    expenses = [expense for payroll in payrolls for expense in payroll.build_salary_expenses()]
+    for expense in expenses:
+        expense.record_state = 'active'
+        expense.fingerprint = expense.compute_fingerprint()
+    Expense.objects.bulk_create(expenses)
+    # Rows whose keys the backend returned; MySQL searches through FULLTEXT instead
+    SearchToken.index_documents('expense', expenses)
+
+
+def recompute_dirty_payrolls(apply=True, limit=None):
+    """
+    Recompute dirty payrolls and return an arrears/variance report.
+    With apply=False the report is produced without writing anything.
+    """
+    markers = DirtyPayroll.objects.select_related('payroll').order_by('marked_at')
+    if limit:
+        markers = markers[:limit]
+    markers = list(markers)
+
+    payrolls = [m.payroll for m in markers if m.payroll.record_state == 'active']
+    worked_map = Payroll.worked_days_for(p.id for p in payrolls) if payrolls else {}
+
+    records = []
+    changed = []
+    for payroll in payrolls:
+        old = {field: getattr(payroll, field) for field in PAYROLL_FIELDS}
+
+        payroll.worked_days = worked_map.get(payroll.id, Decimal('0'))
+
+        # The configured incentive is paid only above 28 worked days; it is revoked when
+        # worked days drop to 28 or below and restored when they rise again
+        payroll.spr_amount = payroll.configured_spr_amount if payroll.incentive_eligible() else Decimal('0')
+        incentive_revoked = old['spr_amount'] > Decimal('0') and payroll.spr_amount == Decimal('0')
+        incentive_restored = old['spr_amount'] == Decimal('0') and payroll.spr_amount > Decimal('0')
+
+        payroll.calculate_salary()
+
+        if all(getattr(payroll, field) == old[field] for field in PAYROLL_FIELDS):
+            continue
+
+        changed.append(payroll)
+        records.append({
+            'payroll_id': payroll.id,
+            'employee_name': payroll.employee_name,
+            'month': payroll.month,
+            'year': payroll.year,
+            'old_worked_days': float(old['worked_days']),
+            'new_worked_days': float(payroll.worked_days),
+            'old_spr_amount': float(old['spr_amount']),
+            'new_spr_amount': float(payroll.spr_amount),
+            'incentive_revoked': incentive_revoked,
+            'incentive_restored': incentive_restored,
+            'old_net_salary': float(old['net_salary']),
+            'new_net_salary': float(payroll.net_salary),
+            'arrears': float(payroll.net_salary - old['net_salary']),
+            'cash_delta': float(payroll.cash_amount - old['cash_amount']),
+            'bank_delta': float(payroll.bank_transfer_amount - old['bank_transfer_amount']),
+        })
+
+    if apply:
+        with transaction.atomic():
+            if changed:
+                Payroll.all_objects.bulk_update(changed, PAYROLL_FIELDS)
+
+                # Rebuild Salary expenses only where they had been created
+                with_expenses = [p for p in changed if p.expenses_created]
+                if with_expenses:
+                    _rebuild_salary_expenses(with_expenses)
+
+            DirtyPayroll.objects.filter(id__in=[m.id for m in markers]).delete()
+
+        for payroll in changed:
+            payroll.invalidate_month_totals()
+
+    return {
+        'checked': len(payrolls),
+        'changed': len(changed),
+        'applied': apply,
+        'records': records,
+        'totals': {
+            'arrears': sum(r['arrears'] for r in records),
+            'cash_delta': sum(r['cash_delta'] for r in records),
+            'bank_delta': sum(r['bank_delta'] for r in records),
+        }
+    }
@@ -0,0 +1,150 @@
+# fine/utils/payroll_simulator.py
+"""
+Read-only payroll what-if simulator.
+
+Loads a month's payroll rows and worked days into NumPy arrays once and
+evaluates many scenarios against them in a single vectorized pass.
+Nothing is written to the database.
+"""
+from decimal import Decimal
+
+import numpy as np
+from ..models import Payroll
+
+# Integer codes for Payroll.PAYMENT_SPLIT_CHOICES
+SPLIT_CODES = {'full_cash': 0, 'full_bank': 1, 'split': 2}
+
+# Incentives (SPR) are only allowed above this many worked days
+INCENTIVE_MIN_WORKED_DAYS = float(Payroll.INCENTIVE_MIN_WORKED_DAYS)
+
+MAX_SCENARIOS = 1000
+
+
+def load_month_arrays(month, year):
+    """
+    Load active payrolls for a month and their worked days as arrays.
+    Costs two queries regardless of staff size.
+    """
+    rows = list(Payroll.objects.filter(month=month, year=year).order_by('employee_name').values_list(
+        'id', 'employee_name', 'basic_pay', 'spr_amount',
+        'payment_split_type', 'cash_percentage', 'bank_transfer_percentage'
+    ))
+
+    # Worked days per payroll in one grouped query (the rule Payroll.save() uses)
+    worked_map = Payroll.worked_days_for(row[0] for row in rows)
+
+    return {
+        'ids': np.array([row[0] for row in rows], dtype=np.int64),
+        'employee_names': [row[1] for row in rows],
+        # Money is held in paise so rounding matches Decimal quantize(0.01)
+        'basic_paise': np.array([int(row[2] * 100) for row in rows], dtype=np.float64),
+        'spr_paise': np.array([int(row[3] * 100) for row in rows], dtype=np.float64),
+        'split_code': np.array([SPLIT_CODES.get(row[4], 0) for row in rows], dtype=np.int8),
+        'cash_percentage': np.array([float(row[5]) for row in rows], dtype=np.float64),
+        'bank_transfer_percentage': np.array([float(row[6]) for row in rows], dtype=np.float64),
+        'worked_days': np.array([float(worked_map.get(row[0], 0)) for row in rows], dtype=np.float64),
+    }
+
+
+def _scenario_vector(scenarios, key, default):
+    """Collect one scenario parameter into an (S, 1) column vector"""
+    values = [s.get(key) for s in scenarios]
+    return np.array([default if v is None else float(v) for v in values], dtype=np.float64)[:, None]
+
+
+def simulate(arrays, scenarios):
+    """
+    Evaluate scenarios against loaded month arrays.
+
+    Supported scenario keys (all optional):
+        basic_multiplier, basic_delta      - basic pay = basic * multiplier + delta
+        spr_multiplier, spr_amount         - SPR = spr * multiplier, or a flat amount for everyone
+        payment_split_type                 - override split type for the whole staff
+        cash_percentage, bank_transfer_percentage - override split percentages
+
+    Returns a list of per-scenario totals in rupees.
+    """
+    n_scenarios = len(scenarios)
+
+    # (S, 1) parameter columns broadcast against (1, N) employee rows
+    basic_mult = _scenario_vector(scenarios, 'basic_multiplier', 1.0)
+    basic_delta = _scenario_vector(scenarios, 'basic_delta', 0.0) * 100
+    spr_mult = _scenario_vector(scenarios, 'spr_multiplier', 1.0)
+
+    basic = np.maximum(np.rint(arrays['basic_paise'][None, :] * basic_mult + basic_delta), 0)
+    spr = np.rint(arrays['spr_paise'][None, :] * spr_mult)
+
+    spr_flat = np.array([s.get('spr_amount') is not None for s in scenarios])
+    if spr_flat.any():
+        flat_values = _scenario_vector(scenarios, 'spr_amount', 0.0) * 100
+        spr = np.where(spr_flat[:, None], np.rint(flat_values), spr)
+    spr = np.maximum(spr, 0)
+
+    # Incentive rule: SPR is dropped for anyone with worked days <= 28
+    eligible = arrays['worked_days'][None, :] > INCENTIVE_MIN_WORKED_DAYS
+    incentives_dropped = ((spr > 0) & ~eligible).sum(axis=1)
+    spr = np.where(eligible, spr, 0)
+
+    net = np.maximum(basic + spr, 0)
+
+    # Split type: per-employee value unless the scenario overrides it
+    split_override = np.array(
+        [SPLIT_CODES.get(s.get('payment_split_type'), -1) for s in scenarios], dtype=np.int8
+    )[:, None]
+    split_code = np.where(split_override >= 0, split_override, arrays['split_code'][None, :])
+
+    cash_pct = np.where(
+        np.isnan(_scenario_vector(scenarios, 'cash_percentage', np.nan)),
+        arrays['cash_percentage'][None, :],
+        _scenario_vector(scenarios, 'cash_percentage', np.nan),
+    )
+    bank_pct = np.where(
+        np.isnan(_scenario_vector(scenarios, 'bank_transfer_percentage', np.nan)),
+        arrays['bank_transfer_percentage'][None, :],
+        _scenario_vector(scenarios, 'bank_transfer_percentage', np.nan),
+    )
+
+    # Same normalisation as Payroll.calculate_salary for 'split'
+    total_pct = cash_pct + bank_pct
+    safe_total = np.where(total_pct > 0, total_pct, 1)
+    split_cash_pct = np.where(total_pct > 0, cash_pct * 100 / safe_total, cash_pct)
+    split_bank_pct = np.where(total_pct > 0, bank_pct * 100 / safe_total, bank_pct)
+
+    cash_pct = np.select([split_code == 0, split_code == 1], [100.0, 0.0], split_cash_pct)
+    bank_pct = np.select([split_code == 0, split_code == 1], [0.0, 100.0], split_bank_pct)
+
+    # np.rint rounds half to even, matching Decimal.quantize's default context
+    cash = np.rint(net * cash_pct / 100)
+    bank = np.rint(net * bank_pct / 100)
+
+    def to_rupees(paise_totals):
+        return [float(Decimal(int(v)) / 100) for v in paise_totals]
+
+    totals = {
+        'total_basic_pay': to_rupees(basic.sum(axis=1)),
+        'total_spr': to_rupees(spr.sum(axis=1)),
+        'total_net_payable': to_rupees(net.sum(axis=1)),
+        'total_cash': to_rupees(cash.sum(axis=1)),
+        'total_bank': to_rupees(bank.sum(axis=1)),
+    }
+
+    results = []
+    for i in range(n_scenarios):
+        result = {key: values[i] for key, values in totals.items()}
+        result['incentives_dropped'] = int(incentives_dropped[i])
+        result['scenario'] = scenarios[i]
+        results.append(result)
+
+    return results
+
+
+def simulate_month(month, year, scenarios):
+    """Load a month once and run all scenarios against it, plus the current baseline"""
+    arrays = load_month_arrays(month, year)
+    results = simulate(arrays, [{}] + list(scenarios))
+
+    return {
+        'employee_count': len(arrays['employee_names']),
+        'baseline': results[0],
+        'scenarios': results[1:],
+    }
@@ -0,0 +1,203 @@
+# fine/utils/payslips.py
+"""
+Batch payslip generation.
+
+Payslip data for a month is collected in two queries and turned into plain
+dicts, so the ReportLab rendering can run in a process pool without touching
+the ORM. The pool is only used by the generate_payslips command; the web
+export renders sequentially. Finished PDFs are written into a ZIP archive as
+they arrive.
+"""
+import calendar
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, Q
+
+from ..models import Attendance, Payroll
+
+
+def collect_payslip_data(month, year):
+    """Plain, picklable payslip rows for every active payroll in the month"""
+    payrolls = list(Payroll.objects.filter(month=month, year=year).order_by('employee_name').values(
+        'id', 'employee_name', 'basic_pay', 'spr_amount', 'net_salary', 'worked_days',
+        'payment_split_type', 'cash_percentage', 'bank_transfer_percentage',
+        'cash_amount', 'bank_transfer_amount', 'salary_date', 'month', 'year'
+    ))
+
+    # Attendance breakdown for all payrolls in one grouped query
+    attendance_stats = Attendance.objects.filter(
+        payroll_id__in=[p['id'] for p in payrolls]
+    ).values('payroll_id').annotate(
+        p_count=Count('id', filter=Q(status='present')),
+        h_count=Count('id', filter=Q(status='half_day')),
+        a_count=Count('id', filter=Q(status='absent')),
+    )
+    stats_map = {s['payroll_id']: s for s in attendance_stats}
+
+    slips = []
+    for p in payrolls:
+        s = stats_map.get(p['id'], {'p_count': 0, 'h_count': 0, 'a_count': 0})
+        slips.append({
+            'id': p['id'],
+            'employee_name': p['employee_name'],
+            'period_display': f"{calendar.month_name[p['month']]} {p['year']}",
+            'month': p['month'],
+            'year': p['year'],
+            'salary_date': p['salary_date'].strftime('%d-%b-%Y') if p['salary_date'] else '-',
+            'basic_pay': float(p['basic_pay']),
+            'spr_amount': float(p['spr_amount']),
+            'net_salary': float(p['net_salary']),
+            'worked_days': float(p['worked_days']),
+            'payment_split_type': p['payment_split_type'],
+            'cash_percentage': float(p['cash_percentage']),
+            'bank_transfer_percentage': float(p['bank_transfer_percentage']),
+            'cash_amount': float(p['cash_amount']),
+            'bank_transfer_amount': float(p['bank_transfer_amount']),
+            'present_days': s['p_count'],
+            'half_days': s['h_count'],
+            'absent_days': s['a_count'],
+        })
+    return slips
+
+
+def payslip_filename(slip):
+    safe_name = ''.join(c if c.isalnum() else '_' for c in slip['employee_name']).strip('_')
+    return f"Payslip_{safe_name}_{slip['year']}{slip['month']:02d}_{slip['id']}.pdf"
+
+
+def render_payslip(slip):
+    """
+    Render one payslip to PDF bytes. Runs inside pool workers, so it only
+    uses the plain dict passed in.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    elements = []
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'PayslipTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#1f2937'),
+        spaceAfter=12,
+        alignment=TA_CENTER
+    )
+    heading_style = ParagraphStyle(
+        'PayslipHeading',
+        parent=styles['Heading2'],
+        fontSize=12,
+        textColor=colors.HexColor('#374151'),
+        spaceAfter=10,
+        spaceBefore=15
+    )
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
+
+    elements.append(Paragraph('Payslip', title_style))
+    # Paragraph text is markup; a name containing & or < would break the PDF
+    elements.append(Paragraph(f"<b>Employee:</b> {escape(slip['employee_name'])}", styles['Normal']))
+    elements.append(Paragraph(f"<b>Period:</b> {slip['period_display']}", styles['Normal']))
+    elements.append(Paragraph(f"<b>Salary Date:</b> {slip['salary_date']}", styles['Normal']))
+    elements.append(Spacer(1, 15))
+
+    elements.append(Paragraph('Earnings', heading_style))
+    earnings_table = Table([
+        ['Component', 'Amount (₹)'],
+        ['Basic Pay', f"₹{slip['basic_pay']:,.2f}"],
+        ['Incentives (SPR)', f"₹{slip['spr_amount']:,.2f}"],
+        ['Net Salary', f"₹{slip['net_salary']:,.2f}"],
+    ], colWidths=[3*inch, 2*inch])
+    earnings_table.setStyle(table_style)
+    elements.append(earnings_table)
+
+    elements.append(Paragraph('Payment Split', heading_style))
+    split_table = Table([
+        ['Mode', 'Amount (₹)'],
+        [f"Cash ({slip['cash_percentage']:.0f}%)", f"₹{slip['cash_amount']:,.2f}"],
+        [f"Bank Transfer ({slip['bank_transfer_percentage']:.0f}%)", f"₹{slip['bank_transfer_amount']:,.2f}"],
+    ], colWidths=[3*inch, 2*inch])
+    split_table.setStyle(table_style)
+    elements.append(split_table)
+
+    elements.append(Paragraph('Attendance', heading_style))
+    attendance_table = Table([
+        ['Status', 'Days'],
+        ['Present', str(slip['present_days'])],
+        ['Half Day', str(slip['half_days'])],
+        ['Absent', str(slip['absent_days'])],
+        ['Worked Days', f"{slip['worked_days']:.1f}"],
+    ], colWidths=[3*inch, 2*inch])
+    attendance_table.setStyle(table_style)
+    elements.append(attendance_table)
+
+    doc.build(elements)
+    return payslip_filename(slip), buffer.getvalue()
+
+
+def render_payslips(slips, max_workers=1):
+    """
+    Yield (filename, pdf_bytes) for each slip. Rendering is sequential unless
+    max_workers > 1, which spreads it across a process pool; only the
+    generate_payslips command does that, never a web worker. Small batches
+    are rendered inline to skip the pool start-up cost.
+    """
+    if len(slips) < 4 or not max_workers or max_workers <= 1:
+        for slip in slips:
+            yield render_payslip(slip)
+        return
+
+    max_workers = min(len(slips), max_workers)
+    chunksize = max(1, len(slips) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(render_payslip, slips, chunksize=chunksize)
+
+
+class _ZipStreamBuffer:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_payslip_zip(slips, max_workers=1):
+    """Yield a ZIP archive of payslips chunk by chunk as PDFs finish rendering"""
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for filename, pdf_bytes in render_payslips(slips, max_workers=max_workers):
+            zf.writestr(filename, pdf_bytes)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
@@ -1,5 +1,95 @@
 # fine/utils/period_utils.py
-from datetime import datetime
+"""
+Period helpers.
+
+Date filtering goes through half-open [start, end) ranges built here, so
+queries compile to `date >= start AND date < end` and can use an index on
+the date column. date__year/date__month lookups compile to EXTRACT() and
+cannot.
+"""
+from datetime import date, datetime, timedelta
+
+PERIOD_TYPES = ('day', 'week', 'month', 'year', 'fiscal_year', 'custom')
+
+# Indian financial year: April to March, named by the calendar year it starts in
+FISCAL_YEAR_START_MONTH = 4
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def month_range(year, month):
+    """[first day of the month, first day of the next month)"""
+    year, month = int(year), int(month)
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def year_range(year, end_year=None):
+    """[1 Jan of year, 1 Jan after end_year (defaults to year))"""
+    return date(int(year), 1, 1), date(int(end_year or year) + 1, 1, 1)
+
+
+def fiscal_year_of(day):
+    """Financial year containing day (2024 for 1 Apr 2024 - 31 Mar 2025)"""
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def fiscal_quarter_of(day):
+    """Quarter 1-4 of the financial year (Q1 = Apr-Jun)"""
+    return (day.month - FISCAL_YEAR_START_MONTH) % 12 // 3 + 1
+
+
+def fiscal_year_range(fiscal_year):
+    """[1 Apr of fiscal_year, 1 Apr of the next year)"""
+    fiscal_year = int(fiscal_year)
+    return date(fiscal_year, FISCAL_YEAR_START_MONTH, 1), date(fiscal_year + 1, FISCAL_YEAR_START_MONTH, 1)
+
+
+def inclusive_range(start_date, end_date):
+    """Half-open range for an inclusive start/end pair, as entered in the date filters"""
+    return _as_date(start_date), _as_date(end_date) + timedelta(days=1)
+
+
+def period_range(period_type, anchor=None, start_date=None, end_date=None):
+    """
+    Half-open [start, end) range for a period containing anchor (default today).
+    'custom' takes inclusive start_date/end_date instead.
+    """
+    if period_type == 'custom':
+        return inclusive_range(start_date, end_date)
+
+    anchor = _as_date(anchor) or date.today()
+    if period_type == 'day':
+        return anchor, anchor + timedelta(days=1)
+    if period_type == 'week':
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=7)
+    if period_type == 'month':
+        return month_range(anchor.year, anchor.month)
+    if period_type == 'year':
+        return year_range(anchor.year)
+    if period_type == 'fiscal_year':
+        return fiscal_year_range(fiscal_year_of(anchor))
+    raise ValueError(f"Unknown period type '{period_type}'")
+
+
+def period_bounds(period_type, anchor=None):
+    """Inclusive (first day, last day) of a period, for the stored summary/report ranges"""
+    start, end = period_range(period_type, anchor)
+    return start, end - timedelta(days=1)
+
+
+def range_filter(start, end, field='date'):
+    """Filter kwargs for a half-open range on field"""
+    return {f'{field}__gte': start, f'{field}__lt': end}
+
 
 def get_selected_period(request):
     """
@@ -0,0 +1,170 @@
+# fine/utils/profiling.py
+"""
+On-demand request profiling store.
+
+A staff user appends ?__profile=<token> (or sends an X-Profile header) to
+any URL; ProfilingMiddleware then runs that one request under cProfile (or
+pyinstrument, when installed and asked for) and saves the profile here
+together with the request's SQL log. Tokens are signed with SECRET_KEY,
+tied to the user and expire after PROFILE_TOKEN_MAX_AGE seconds.
+
+Profiles live in settings.PROFILE_DIR; only the newest PROFILE_KEEP are
+kept. Each profile is a <name>.prof pstats dump plus a <name>.json sidecar
+with the request details and SQL log (and <name>.html for pyinstrument).
+"""
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = 'fine.profiling'
+PROFILE_PARAM = '__profile'
+ENGINE_PARAM = '__profile_engine'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+DEFAULT_KEEP = 50
+DEFAULT_TOKEN_MAX_AGE = 8 * 60 * 60
+
+# Only the first statements of a request are kept in its SQL log
+MAX_LOGGED_QUERIES = 500
+
+NAME_RE = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def make_token(user):
+    """Signed, expiring profiling token for a staff user"""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def check_token(token, user):
+    """True when token was issued to this staff user and has not expired"""
+    if not token or not getattr(user, 'is_staff', False):
+        return False
+    max_age = getattr(settings, 'PROFILE_TOKEN_MAX_AGE', DEFAULT_TOKEN_MAX_AGE)
+    try:
+        value = signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return value == str(user.pk)
+
+
+def requested_token(request):
+    """Profiling token from the query string or header, if any"""
+    return request.GET.get(PROFILE_PARAM) or request.META.get(PROFILE_HEADER)
+
+
+class SqlLog:
+    """execute_wrapper keeping the SQL, parameters and duration of each statement"""
+
+    def __init__(self):
+        self.entries = []
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.entries) < MAX_LOGGED_QUERIES:
+                self.entries.append({
+                    'sql': sql,
+                    'params': repr(params)[:500],
+                    'many': many,
+                    'ms': round((time.perf_counter() - started) * 1000, 2),
+                })
+
+
+def profile_path(name, ext):
+    """Path of a stored profile file; raises ValueError for names not created by save_profile"""
+    if not NAME_RE.match(name or ''):
+        raise ValueError(f"Invalid profile name '{name}'")
+    return os.path.join(profile_dir(), f"{name}.{ext}")
+
+
+def save_profile(meta, sql_log, profiler=None, html=None):
+    """Write one profile (pstats dump, optional HTML, JSON sidecar) and rotate old ones; returns its name"""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    if profiler is not None:
+        profiler.dump_stats(profile_path(name, 'prof'))
+    if html is not None:
+        with open(profile_path(name, 'html'), 'w', encoding='utf-8') as f:
+            f.write(html)
+    with open(profile_path(name, 'json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            **meta,
+            'name': name,
+            'engine': 'pyinstrument' if html is not None else 'cprofile',
+            'query_count': sql_log.count,
+            'db_ms': round(sum(entry['ms'] for entry in sql_log.entries), 2),
+            'queries': sql_log.entries,
+        }, f, indent=1)
+
+    rotate(getattr(settings, 'PROFILE_KEEP', DEFAULT_KEEP))
+    return name
+
+
+def rotate(keep):
+    """Delete all but the newest keep profiles"""
+    for name in stored_names()[keep:]:
+        for ext in ('prof', 'html', 'json'):
+            try:
+                os.remove(profile_path(name, ext))
+            except FileNotFoundError:
+                pass
+
+
+def stored_names():
+    """Stored profile names, newest first"""
+    try:
+        files = os.listdir(profile_dir())
+    except FileNotFoundError:
+        return []
+    names = {f.rsplit('.', 1)[0] for f in files if f.endswith('.json')}
+    return sorted((n for n in names if NAME_RE.match(n)), reverse=True)
+
+
+def load_meta(name):
+    with open(profile_path(name, 'json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_profiles():
+    """Sidecar data (without the SQL log) for every stored profile, newest first"""
+    profiles = []
+    for name in stored_names():
+        try:
+            meta = load_meta(name)
+        except (OSError, ValueError):
+            continue
+        meta.pop('queries', None)
+        profiles.append(meta)
+    return profiles
+
+
+def top_functions(name, sort='cumulative', limit=40):
+    """Top functions of a cProfile dump as dicts, sorted by cumulative or own time"""
+    stats = pstats.Stats(profile_path(name, 'prof'))
+    key = 3 if sort == 'cumulative' else 2
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:limit]
+    total = stats.total_tt or 1
+    return [{
+        'function': f"{os.path.basename(filename)}:{line}({func})" if line else func,
+        'primitive_calls': cc,
+        'calls': nc,
+        'own_ms': round(tt * 1000, 2),
+        'cumulative_ms': round(ct * 1000, 2),
+        'cumulative_pct': round(ct / total * 100, 1),
+    } for (filename, line, func), (cc, nc, tt, ct, _callers) in rows]
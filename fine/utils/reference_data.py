@@ -0,0 +1,116 @@
+# fine/utils/reference_data.py
+"""
+Process-local cache of form reference data (categories, vendors, choice lists).
+
+Each worker keeps the loaded lists in memory, tagged with the generation they
+were loaded at. The generation counter lives in the shared Django cache, so
+bumping it on a Cat or Vendor write makes every worker reload on its next
+request. Reading a cached list costs one cache lookup and no queries; the
+choice lists taken from model constants cost neither.
+
+The counter is only shared between processes when CACHES points at a shared
+backend (see CACHE_URL in settings); with the default local-memory cache each
+process sees only its own writes.
+"""
+import threading
+
+from django.core.cache import cache
+
+from . import metrics
+
+GENERATION_KEY = 'reference_data:generation'
+
+VENDOR_DROPDOWN_SIZE = 50
+
+_lock = threading.Lock()
+_state = {'generation': None, 'data': {}}
+
+
+def _load_categories():
+    from ..models import Cat
+    return list(Cat.objects.order_by('name'))
+
+
+def _load_vendors():
+    from ..models import Vendor
+    return sorted(
+        Vendor.objects.order_by('-usage_count', 'name').values_list('name', flat=True)[:VENDOR_DROPDOWN_SIZE],
+        key=str.lower,
+    )
+
+
+def _load_expense_categories():
+    from ..models import Expense
+    return [choice[0] for choice in Expense.CATEGORY_CHOICES]
+
+
+def _load_expense_payment_methods():
+    from ..models import Expense
+    return [p[0] for p in Expense.PAYMENT_METHOD_CHOICES]
+
+
+def _load_income_payment_modes():
+    from ..models import Income
+    return [c[0] for c in Income.PAYMENT_MODE_CHOICES]
+
+
+def _load_income_statuses():
+    from ..models import Income
+    return [s[0] for s in Income.STATUS_CHOICES]
+
+
+# Lists read from the database; reloaded when the shared generation changes
+LOADERS = {
+    'categories': _load_categories,
+    'vendors': _load_vendors,
+}
+
+# Lists built from model class constants; they cannot change while the
+# process runs, so they are built once and never check the generation
+CONSTANT_LOADERS = {
+    'expense_categories': _load_expense_categories,
+    'expense_payment_methods': _load_expense_payment_methods,
+    'income_payment_modes': _load_income_payment_modes,
+    'income_statuses': _load_income_statuses,
+}
+
+_constants = {}
+
+
+def current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def get_reference(name):
+    """Cached reference list by name; database lists are reloaded after any generation bump"""
+    if name in CONSTANT_LOADERS:
+        if name not in _constants:
+            _constants[name] = CONSTANT_LOADERS[name]()
+        return _constants[name]
+
+    generation = current_generation()
+    data = _state['data']
+    if _state['generation'] != generation:
+        with _lock:
+            if _state['generation'] != generation:
+                _state['data'] = {}
+                _state['generation'] = generation
+            data = _state['data']
+
+    metrics.record_cache('reference_data', name in data)
+    if name not in data:
+        data[name] = LOADERS[name]()
+    return data[name]
+
+
+def bump_generation():
+    """Invalidate reference data in every worker"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 2, None)
+    _state['generation'] = None
@@ -0,0 +1,172 @@
+# fine/utils/search.py
+"""
+Ranked search over expense, income and purchase records.
+
+On MySQL the FULLTEXT indexes added in migration 0004 are queried in
+boolean mode with prefix matching; terms too short for the FULLTEXT index
+are matched as substrings instead. Other backends use the SearchToken
+inverted index: every query term is an indexed equality lookup (the last
+term a prefix range), grouped per record and ranked by summed field weight.
+"""
+from django.db.models import Case, FloatField, IntegerField, Max, Q, Sum, Value, When
+from django.db.models.expressions import RawSQL
+
+from ..models import Expense, Income, Purchase, SearchToken
+from ..models.search_index import tokenize, uses_token_index
+
+DOC_MODELS = {
+    'expense': Expense,
+    'income': Income,
+    'purchase': Purchase,
+}
+
+# Column lists must match the FULLTEXT index definitions exactly
+FULLTEXT_COLUMNS = {
+    'expense': 'description, voucher_no',
+    'income': 'description',
+    'purchase': 'vendor, bill_no, description',
+}
+
+MAX_QUERY_TERMS = 8
+
+# MySQL's innodb_ft_min_token_size (default 3); shorter words are not indexed
+FULLTEXT_MIN_TOKEN_SIZE = 3
+
+
+def _active(doc_type):
+    return DOC_MODELS[doc_type].objects.all()
+
+
+def _fulltext_query(terms):
+    """
+    (boolean-mode query, short terms). Terms shorter than innodb_ft_min_token_size
+    are not in the FULLTEXT index, so a required +term* would match nothing.
+    """
+    indexed = [term for term in terms if len(term) >= FULLTEXT_MIN_TOKEN_SIZE]
+    short = [term for term in terms if len(term) < FULLTEXT_MIN_TOKEN_SIZE]
+    return ' '.join(f'+{term}*' for term in indexed), short
+
+
+def _fulltext_hits(terms, doc_types, limit):
+    """
+    [(score, date, doc_type, id)] from the MySQL FULLTEXT indexes; short terms
+    are matched as substrings of the same columns, so all terms must still match
+    """
+    boolean_query, short_terms = _fulltext_query(terms)
+    hits = []
+    for doc_type in doc_types:
+        rows = _active(doc_type)
+        columns = [column.strip() for column in FULLTEXT_COLUMNS[doc_type].split(',')]
+        for term in short_terms:
+            term_filter = Q()
+            for column in columns:
+                term_filter |= Q(**{f'{column}__icontains': term})
+            rows = rows.filter(term_filter)
+
+        if boolean_query:
+            match = RawSQL(f"MATCH({FULLTEXT_COLUMNS[doc_type]}) AGAINST (%s IN BOOLEAN MODE)", [boolean_query])
+            rows = rows.annotate(score=match).filter(score__gt=0)
+        else:
+            rows = rows.annotate(score=Value(1.0, output_field=FloatField()))
+
+        rows = rows.order_by('-score', '-date', '-id').values_list('score', 'date', 'id')[:limit]
+        hits.extend((float(score), row_date, doc_type, pk) for score, row_date, pk in rows)
+    return hits
+
+
+def _token_hits(terms, doc_types, limit):
+    """[(score, date, doc_type, id)] from the SearchToken table; all terms must match"""
+    *exact_terms, last_term = terms
+    term_filter = Q(token__startswith=last_term)
+    for term in exact_terms:
+        term_filter |= Q(token=term)
+
+    matched = {
+        f'm{i}': Max(Case(When(token=term, then=1), default=0, output_field=IntegerField()))
+        for i, term in enumerate(exact_terms)
+    }
+    matched[f'm{len(exact_terms)}'] = Max(Case(
+        When(token__startswith=last_term, then=1), default=0, output_field=IntegerField()
+    ))
+
+    rows = SearchToken.objects.filter(
+        term_filter, doc_type__in=doc_types
+    ).values('doc_type', 'object_id').annotate(
+        score=Sum('weight'), hit_date=Max('date'), **matched
+    ).filter(
+        **{name: 1 for name in matched}
+    ).order_by('-score', '-hit_date', '-object_id')
+
+    # Over-fetch a little since soft-deleted expenses are dropped afterwards
+    return [
+        (float(r['score']), r['hit_date'], r['doc_type'], r['object_id'])
+        for r in rows[:limit + limit // 2 + 1]
+    ]
+
+
+def _serialize(doc_type, obj, score):
+    if doc_type == 'expense':
+        title = obj.description or obj.category
+        subtitle = ' · '.join(filter(None, [obj.category, obj.voucher_no and f"Voucher {obj.voucher_no}"]))
+        amount = obj.total_amount
+    elif doc_type == 'income':
+        title = obj.description
+        subtitle = obj.payment_mode
+        amount = obj.amount
+    else:
+        title = obj.vendor
+        subtitle = ' · '.join(filter(None, [obj.bill_no and f"Bill {obj.bill_no}", obj.description]))
+        amount = obj.total_amount
+
+    return {
+        'type': doc_type,
+        'id': obj.id,
+        'date': obj.date.strftime('%Y-%m-%d'),
+        'title': title,
+        'subtitle': subtitle,
+        'amount': float(amount),
+        'score': round(score, 3),
+    }
+
+
+def search(query, doc_types=None, page=1, page_size=20):
+    """
+    Search the given record types (all by default) and return one page of
+    ranked hits plus a has_more flag.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    doc_types = [t for t in (doc_types or DOC_MODELS) if t in DOC_MODELS]
+    page = max(1, page)
+
+    if not terms or not doc_types:
+        return {'query': query, 'results': [], 'page': page, 'page_size': page_size, 'has_more': False}
+
+    offset = (page - 1) * page_size
+    limit = offset + page_size + 1
+
+    if uses_token_index():
+        hits = _token_hits(terms, doc_types, limit)
+    else:
+        hits = _fulltext_hits(terms, doc_types, limit)
+
+    # Load each type's records in one query; soft-deleted expenses drop out here
+    objects = {}
+    for doc_type in doc_types:
+        ids = [pk for _, _, t, pk in hits if t == doc_type]
+        if ids:
+            objects[doc_type] = _active(doc_type).in_bulk(ids)
+
+    hits = [hit for hit in hits if hit[3] in objects.get(hit[2], {})]
+    hits.sort(key=lambda hit: (-hit[0], -hit[1].toordinal(), -hit[3]))
+    page_hits = hits[offset:offset + page_size + 1]
+
+    return {
+        'query': query,
+        'results': [
+            _serialize(doc_type, objects[doc_type][pk], score)
+            for score, _, doc_type, pk in page_hits[:page_size]
+        ],
+        'page': page,
+        'page_size': page_size,
+        'has_more': len(page_hits) > page_size,
+    }
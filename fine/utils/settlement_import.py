@@ -0,0 +1,243 @@
+# fine/utils/settlement_import.py
+"""
+Streaming import of Swiggy/Zomato settlement statements into Income.
+
+Order lines are read one at a time with the expense importer's sheet reader.
+Every line gets a SHA-256 row hash: channel + order id, or, when the sheet has
+no order id, the file hash + line number, since two real orders can share a
+date, amount and generic description. Hashes already in SettlementRow are
+skipped, so an overlapping statement adds no order twice (re-uploading the
+same file is refused outright). Lines become one Income row each or, with
+aggregate=True, one Income row per (day, channel); a line's hash is only
+recorded once it has been booked. All writes use bulk_create in one
+transaction.
+"""
+import hashlib
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from ..models import Income, SearchToken, SettlementImport, SettlementRow
+from .expense_import import ImportFormatError, iter_sheet_rows, parse_sheet_date, MAX_REPORTED_ERRORS
+
+DEFAULT_BATCH_SIZE = 2000
+
+CHANNELS = ('Swiggy', 'Zomato')
+
+COLUMN_ALIASES = {
+    'date': 'date',
+    'order date': 'date',
+    'order_date': 'date',
+    'order time': 'date',
+    'settlement date': 'date',
+    'payout date': 'date',
+    'order id': 'order_id',
+    'order_id': 'order_id',
+    'order no': 'order_id',
+    'order number': 'order_id',
+    'amount': 'amount',
+    'net payable': 'amount',
+    'net_payable': 'amount',
+    'net payout': 'amount',
+    'payout': 'amount',
+    'payout amount': 'amount',
+    'final payout': 'amount',
+    'settlement amount': 'amount',
+    'net amount': 'amount',
+    'channel': 'channel',
+    'platform': 'channel',
+    'aggregator': 'channel',
+    'description': 'description',
+    'order status': 'order_status',
+    'status': 'order_status',
+}
+
+REQUIRED_COLUMNS = ('date', 'amount')
+
+# Order lines in these states carry no payout
+SKIPPED_ORDER_STATUSES = {'cancelled', 'canceled', 'rejected'}
+
+
+def file_sha256(fileobj):
+    """Hash the upload in chunks and rewind it for reading"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _channel(value, default):
+    text = str(value or '').strip().lower()
+    for channel in CHANNELS:
+        if channel.lower() in text:
+            return channel
+    if default:
+        return default
+    raise ValueError(f"Unknown channel '{value or ''}'")
+
+
+def parse_order_line(values, default_channel=None):
+    """Return (date, channel, order_id, amount, description) for one order line, or raise ValueError"""
+    line_date = parse_sheet_date(values.get('date'))
+    channel = _channel(values.get('channel'), default_channel)
+
+    try:
+        amount = Decimal(str(values.get('amount') or '').strip().replace(',', '').replace('₹', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{values.get('amount')}'")
+
+    order_id = str(values.get('order_id') or '').strip()
+    description = str(values.get('description') or '').strip()
+    return line_date, channel, order_id, amount, description
+
+
+def row_hash(line, file_hash, line_no):
+    """Cross-file dedup key for lines with an order id; unique per file line otherwise"""
+    _, channel, order_id, _, _ = line
+    if order_id:
+        raw = f"{channel}|order|{order_id}"
+    else:
+        raw = f"{channel}|file|{file_hash}|{line_no}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def import_settlement_file(fileobj, filename, channel=None, aggregate=False,
+                           batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Import a settlement CSV/XLSX into Income.
+
+    channel is used for lines without a channel/platform column. Returns a
+    report with counts of imported order lines, Income rows created,
+    duplicates skipped and row-level errors.
+    """
+    if channel and channel not in CHANNELS:
+        raise ImportFormatError(f"Channel must be one of: {', '.join(CHANNELS)}")
+
+    file_hash = file_sha256(fileobj)
+    if SettlementImport.objects.filter(file_hash=file_hash).exists():
+        raise ImportFormatError("This settlement file has already been imported")
+
+    order_lines = 0
+    income_rows = 0
+    duplicate_count = 0
+    error_count = 0
+    errors = []
+    seen = set()
+    daily = OrderedDict()
+    pending = []
+
+    def report_error(line_no, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': line_no, 'message': message})
+
+    with transaction.atomic():
+        settlement = SettlementImport.objects.create(
+            file_hash=file_hash, filename=filename[:255], channel=channel or ''
+        )
+
+        def flush():
+            """Drop lines imported by earlier statements, then write the batch"""
+            nonlocal order_lines, income_rows, duplicate_count
+            hashes = [h for h, _ in pending]
+            existing = set(SettlementRow.objects.filter(row_hash__in=hashes).values_list('row_hash', flat=True))
+
+            new_hashes = []
+            new_income = []
+            for h, (line_date, line_channel, order_id, amount, description) in pending:
+                if h in existing:
+                    duplicate_count += 1
+                    continue
+                if aggregate:
+                    # Hashes are written with the day's Income row, once its total is known
+                    key = (line_date, line_channel)
+                    total, hashes = daily.get(key, (Decimal('0'), []))
+                    hashes.append(h)
+                    daily[key] = (total + amount, hashes)
+                else:
+                    new_hashes.append(SettlementRow(row_hash=h, settlement=settlement))
+                    new_income.append(Income(
+                        date=line_date,
+                        description=(description or f"{line_channel} order {order_id}".strip())[:255],
+                        amount=amount,
+                        payment_mode=line_channel,
+                        status='Received',
+                    ))
+
+            SettlementRow.objects.bulk_create(new_hashes, batch_size=batch_size)
+            Income.objects.bulk_create(new_income, batch_size=batch_size)
+            SearchToken.index_documents('income', new_income)
+            order_lines += len(new_hashes)
+            income_rows += len(new_income)
+            pending.clear()
+
+        for line_no, values in iter_sheet_rows(fileobj, filename, COLUMN_ALIASES, REQUIRED_COLUMNS):
+            if str(values.get('order_status') or '').strip().lower() in SKIPPED_ORDER_STATUSES:
+                continue
+            try:
+                line = parse_order_line(values, channel)
+            except ValueError as e:
+                report_error(line_no, str(e))
+                continue
+
+            if not aggregate and line[3] <= Decimal('0'):
+                report_error(line_no, "Amount must be greater than zero")
+                continue
+
+            h = row_hash(line, file_hash, line_no)
+            if h in seen:
+                duplicate_count += 1
+                continue
+            seen.add(h)
+
+            pending.append((h, line))
+            if len(pending) >= batch_size:
+                flush()
+
+        if pending:
+            flush()
+
+        if aggregate:
+            day_rows = []
+            booked_hashes = []
+            for (line_date, line_channel), (total, hashes) in daily.items():
+                if total <= Decimal('0'):
+                    report_error(0, f"{line_channel} net payout for {line_date:%d-%b-%Y} is not positive; skipped")
+                    continue
+                day_rows.append(Income(
+                    date=line_date,
+                    description=f"{line_channel} settlement - {len(hashes)} orders",
+                    amount=total,
+                    payment_mode=line_channel,
+                    status='Received',
+                ))
+                booked_hashes += [SettlementRow(row_hash=h, settlement=settlement) for h in hashes]
+            SettlementRow.objects.bulk_create(booked_hashes, batch_size=batch_size)
+            Income.objects.bulk_create(day_rows, batch_size=batch_size)
+            SearchToken.index_documents('income', day_rows)
+            income_rows = len(day_rows)
+            order_lines = len(booked_hashes)
+
+        settlement.order_lines = order_lines
+        settlement.income_rows = income_rows
+        settlement.save(update_fields=['order_lines', 'income_rows'])
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    # bulk_create skips Income.save(), so drop the cached summary cards here
+    if income_rows and not dry_run:
+        Income.invalidate_summary()
+
+    return {
+        'order_lines': order_lines,
+        'income_rows': income_rows,
+        'duplicate_count': duplicate_count,
+        'error_count': error_count,
+        'errors': errors,
+        'aggregated': aggregate,
+        'dry_run': dry_run,
+    }
@@ -0,0 +1,393 @@
+# fine/utils/synthetic_data.py
+"""
+Seeded synthetic dataset for benchmarking and load tests.
+
+Generates employees with daily attendance, monthly payroll (with payment
+splits and the linked Salary expenses), and day-by-day expenses, income and
+purchases with weighted category / payment / vendor mixes. Rows are written
+with bulk_create in fixed-size chunks, month by month, so memory stays flat
+at any scale. The same seed and options against the same database produce
+the same rows.
+
+bulk_create skips model save(), so the derived tables (vendors, GST rollup,
+calendar, caches) are rebuilt once at the end instead of per row.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+
+from ..models import (
+    Attendance, CalendarDay, Cat, Employee, Expense, Income, Payroll, Purchase, Vendor,
+)
+from .gst_summary import rebuild_gst_rollup
+from .period_utils import month_range
+from .reference_data import bump_generation
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SEED = 42
+
+FIRST_NAMES = (
+    'Arun', 'Bala', 'Chitra', 'Deepa', 'Ganesh', 'Hari', 'Indira', 'Jaya', 'Karthik', 'Lakshmi',
+    'Mani', 'Nandini', 'Prakash', 'Ravi', 'Saravanan', 'Selvi', 'Senthil', 'Suresh', 'Uma', 'Vijay',
+)
+LAST_NAMES = (
+    'Kumar', 'Raj', 'Murugan', 'Pandian', 'Devi', 'Krishnan', 'Natarajan', 'Subramani', 'Velu', 'Rani',
+)
+
+# (status, weight) for a working day
+ATTENDANCE_WEIGHTS = (('present', 86), ('half_day', 6), ('absent', 8))
+
+PAYMENT_SPLIT_WEIGHTS = (('full_cash', 50), ('full_bank', 30), ('split', 20))
+
+# category: (weight, min amount, max amount)
+EXPENSE_MIX = {
+    'Electricity': (4, 2000, 18000),
+    'Water': (4, 300, 2500),
+    'Petrol & Diesel': (12, 200, 3000),
+    'Phone Bill': (2, 300, 1500),
+    'Repair & Maintenance': (8, 500, 12000),
+    'Travel Expenses': (8, 100, 2500),
+    'Washing wages': (10, 200, 1200),
+    'Daily Salary': (14, 400, 1200),
+    'Beta & OT': (10, 100, 800),
+    'Pooja': (4, 100, 1500),
+    'Sweet': (4, 200, 2000),
+    'Vessels': (3, 500, 8000),
+    'Rental': (2, 15000, 60000),
+    'ESI & PF': (2, 3000, 20000),
+    'Donation': (2, 100, 5000),
+    'Wages': (9, 500, 4000),
+    'Interest and Bank Loan': (2, 5000, 40000),
+}
+EXPENSE_PAYMENT_WEIGHTS = (('Cash', 55), ('UPI', 25), ('Bank Transfer', 15), ('Credit', 5))
+
+# payment mode: (weight, min amount, max amount, description)
+INCOME_MIX = {
+    'Cash': (35, 2000, 25000, 'Counter sales'),
+    'UPI': (30, 1500, 20000, 'UPI collections'),
+    'Credit Card': (10, 1000, 12000, 'Card sales'),
+    'Bank Transfer': (5, 5000, 60000, 'Catering order'),
+    'Swiggy': (10, 3000, 30000, 'Swiggy settlement'),
+    'Zomato': (10, 3000, 30000, 'Zomato settlement'),
+}
+
+# category: (weight, min amount, max amount, GST rate %)
+PURCHASE_MIX = {
+    'Vegetables': (30, 500, 6000, 0),
+    'Groceries': (20, 1000, 15000, 5),
+    'Dairy': (15, 800, 8000, 5),
+    'Meat & Poultry': (12, 1500, 20000, 0),
+    'Cooking Gas': (5, 2000, 9000, 18),
+    'Packaging': (8, 500, 7000, 18),
+    'Beverages': (5, 1000, 10000, 12),
+    'Cleaning Supplies': (5, 300, 4000, 18),
+}
+PURCHASE_PAYMENT_WEIGHTS = (('Cash', 40), ('UPI', 35), ('Net Banking', 20), ('Card', 5))
+
+VENDOR_PREFIXES = ('Sri', 'New', 'Royal', 'Annai', 'Murugan', 'Lakshmi', 'Star', 'Green', 'Fresh', 'City')
+VENDOR_SUFFIXES = ('Traders', 'Agencies', 'Stores', 'Enterprises', 'Suppliers', 'Wholesale')
+
+# Purchases older than this are almost always settled
+SETTLED_AFTER_DAYS = 60
+
+
+def _money(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+class SyntheticDataGenerator:
+    """
+    Builds the dataset for [end_date - years, end_date]. Per-day volumes are
+    (min, max) ranges; everything random comes from one seeded Random.
+    """
+
+    def __init__(self, employees=25, years=2, end_date=None, seed=DEFAULT_SEED,
+                 vendors=60, expenses_per_day=(2, 6), income_per_day=(4, 10), purchases_per_day=(1, 5),
+                 chunk_size=DEFAULT_CHUNK_SIZE, log=None):
+        self.rng = random.Random(seed)
+        self.employee_count = employees
+        self.end_date = end_date or date.today()
+        self.start_date = self.end_date - relativedelta(years=years) + timedelta(days=1)
+        self.vendor_count = vendors
+        self.expenses_per_day = expenses_per_day
+        self.income_per_day = income_per_day
+        self.purchases_per_day = purchases_per_day
+        self.chunk_size = chunk_size
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    # --- helpers ---
+
+    def _pick(self, weighted):
+        """Weighted choice from ((value, weight), ...) or {value: (weight, ...)}"""
+        if isinstance(weighted, dict):
+            values, weights = list(weighted), [spec[0] for spec in weighted.values()]
+        else:
+            values, weights = [v for v, _ in weighted], [w for _, w in weighted]
+        return self.rng.choices(values, weights=weights)[0]
+
+    def _amount(self, low, high):
+        # Skewed towards the low end, like real vouchers
+        return _money(low + (high - low) * self.rng.random() ** 2)
+
+    def _write(self, manager, rows, label):
+        """bulk_create an iterable of unsaved rows in chunks; returns the row count"""
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.chunk_size:
+                manager.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            manager.bulk_create(batch)
+            written += len(batch)
+        self.counts[label] = self.counts.get(label, 0) + written
+        return written
+
+    def _months(self):
+        month_start = self.start_date.replace(day=1)
+        while month_start <= self.end_date:
+            yield month_start
+            month_start += relativedelta(months=1)
+
+    def _days(self, start, end):
+        day = max(start, self.start_date)
+        end = min(end, self.end_date + timedelta(days=1))
+        while day < end:
+            yield day
+            day += timedelta(days=1)
+
+    # --- dimensions ---
+
+    def create_employees(self):
+        """New employees with names not already in the database, plus pay and join date"""
+        existing = set(Employee.objects.values_list('name_key', flat=True))
+        span = (self.end_date - self.start_date).days
+        staff = []
+        attempt = 0
+        while len(staff) < self.employee_count:
+            attempt += 1
+            name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            if Employee.normalize(name) in existing:
+                name = f"{name} {chr(65 + attempt % 26)}{attempt}"
+            key = Employee.normalize(name)
+            if key in existing:
+                continue
+            existing.add(key)
+            staff.append({
+                'name': name,
+                'key': key,
+                'basic_pay': _money(self.rng.randrange(9000, 32000, 500)),
+                'split': self._pick(PAYMENT_SPLIT_WEIGHTS),
+                'cash_percentage': Decimal(self.rng.choice((40, 50, 60, 70))),
+                # A quarter of the staff joins part-way through the period
+                'joined': self.start_date + timedelta(days=self.rng.randrange(span) if self.rng.random() < 0.25 else 0),
+            })
+
+        Employee.objects.bulk_create([Employee(name=s['name'], name_key=s['key']) for s in staff])
+        ids = Employee.ids_for([s['name'] for s in staff])
+        for s in staff:
+            s['id'] = ids[s['key']]
+        self.counts['employees'] = len(staff)
+        return staff
+
+    def create_categories(self):
+        cats = {}
+        for name in PURCHASE_MIX:
+            cats[name], _ = Cat.objects.get_or_create(name=name)
+        return cats
+
+    def vendor_names(self):
+        names = set()
+        target = min(self.vendor_count, len(VENDOR_PREFIXES) ** 2 * len(VENDOR_SUFFIXES))
+        while len(names) < target:
+            names.add(f"{self.rng.choice(VENDOR_PREFIXES)} {self.rng.choice(VENDOR_PREFIXES)} {self.rng.choice(VENDOR_SUFFIXES)}")
+        # Each vendor mostly supplies one purchase category
+        return {name: self._pick(PURCHASE_MIX) for name in sorted(names)}
+
+    # --- facts ---
+
+    def generate_staff_month(self, staff, month_start):
+        """Attendance, payroll and Salary expenses for one month"""
+        month_end = month_range(month_start.year, month_start.month)[1]
+        salary_date = min(month_end - timedelta(days=1), self.end_date)
+        working = [s for s in staff if s['joined'] < month_end]
+
+        statuses = {}
+        payrolls = []
+        for s in working:
+            days = {day: self._pick(ATTENDANCE_WEIGHTS) for day in self._days(max(month_start, s['joined']), month_end)}
+            statuses[s['id']] = days
+            worked = sum(Decimal('1') if st == 'present' else Decimal('0.5') if st == 'half_day' else 0
+                         for st in days.values())
+            payroll = Payroll(
+                employee_name=s['name'].title(),
+                employee_id=s['id'],
+                basic_pay=s['basic_pay'],
+                spr_amount=_money(self.rng.randrange(500, 3000, 100)) if worked > 28 else Decimal('0'),
+                worked_days=worked,
+                payment_split_type=s['split'],
+                cash_percentage=s['cash_percentage'] if s['split'] == 'split' else Decimal('100'),
+                bank_transfer_percentage=100 - s['cash_percentage'] if s['split'] == 'split' else Decimal('0'),
+                salary_date=salary_date,
+                month=month_start.month,
+                year=month_start.year,
+                is_paid=salary_date < self.end_date,
+                expenses_created=True,
+                record_state='active',
+            )
+            payroll.calculate_salary()
+            payrolls.append(payroll)
+
+        self._write(Payroll.all_objects, payrolls, 'payrolls')
+
+        # bulk_create does not return ids on every backend; read them back in one query
+        ids = dict(Payroll.all_objects.filter(
+            month=month_start.month, year=month_start.year, record_state='active',
+            employee_id__in=list(statuses),
+        ).values_list('employee_id', 'id'))
+        for payroll in payrolls:
+            payroll.pk = ids[payroll.employee_id]
+
+        self._write(Attendance.all_objects, (
+            Attendance(
+                payroll_id=ids[employee_id],
+                employee_id=employee_id,
+                employee_name=payroll_name,
+                date=day,
+                status=status,
+                record_state='active',
+            )
+            for employee_id, payroll_name in ((p.employee_id, p.employee_name) for p in payrolls)
+            for day, status in statuses[employee_id].items()
+        ), 'attendance')
+
+        self._write(Expense.all_objects, (
+            expense for payroll in payrolls for expense in payroll.build_salary_expenses()
+        ), 'salary_expenses')
+
+        cache.delete(Payroll.month_totals_cache_key(month_start.month, month_start.year))
+
+    def _expense_rows(self, days):
+        for day in days:
+            for _ in range(self.rng.randint(*self.expenses_per_day)):
+                category = self._pick(EXPENSE_MIX)
+                _, low, high = EXPENSE_MIX[category]
+                self.voucher_seq += 1
+                expense = Expense(
+                    date=day,
+                    voucher_no=f"SV{self.voucher_seq:07d}",
+                    category=category,
+                    description=f"{category} - {day:%d %b}",
+                    total_amount=self._amount(low, high),
+                    payment_method=self._pick(EXPENSE_PAYMENT_WEIGHTS),
+                    record_state='active',
+                )
+                expense.fingerprint = expense.compute_fingerprint()
+                yield expense
+
+    def _income_rows(self, days):
+        for day in days:
+            # Weekends are busier
+            factor = 1.4 if day.weekday() >= 5 else 1.0
+            for _ in range(self.rng.randint(*self.income_per_day)):
+                mode = self._pick(INCOME_MIX)
+                _, low, high, description = INCOME_MIX[mode]
+                yield Income(
+                    date=day,
+                    description=description,
+                    amount=_money(self._amount(low, high) * Decimal(str(factor))),
+                    payment_mode=mode,
+                    status='Pending' if mode in ('Swiggy', 'Zomato') and (self.end_date - day).days < 7 else 'Received',
+                )
+
+    def _purchase_rows(self, days, vendors, cats):
+        names = list(vendors)
+        for day in days:
+            age = (self.end_date - day).days
+            for _ in range(self.rng.randint(*self.purchases_per_day)):
+                vendor = self.rng.choice(names)
+                category = vendors[vendor] if self.rng.random() < 0.8 else self._pick(PURCHASE_MIX)
+                _, low, high, gst_rate = PURCHASE_MIX[category]
+                total = self._amount(low, high)
+                if age > SETTLED_AFTER_DAYS:
+                    status = 'Paid' if self.rng.random() < 0.98 else 'Due'
+                else:
+                    status = self._pick((('Paid', 60), ('Pending', 30), ('Due', 10)))
+                self.bill_seq += 1
+                purchase = Purchase(
+                    date=day,
+                    vendor=vendor,
+                    cat=cats[category],
+                    bill_no=f"SB{self.bill_seq:07d}",
+                    total_amount=total,
+                    gst_amount=_money(total * gst_rate / (100 + gst_rate)),
+                    payment_mode=self._pick(PURCHASE_PAYMENT_WEIGHTS),
+                    status=status,
+                )
+                purchase.fingerprint = purchase.compute_fingerprint()
+                yield purchase
+
+    def generate_daily_month(self, month_start, vendors, cats):
+        """Expenses, income and purchases for one month"""
+        month_end = month_range(month_start.year, month_start.month)[1]
+        self._write(Expense.all_objects, self._expense_rows(self._days(month_start, month_end)), 'expenses')
+        self._write(Income.objects, self._income_rows(self._days(month_start, month_end)), 'income')
+        self._write(Purchase.objects, self._purchase_rows(self._days(month_start, month_end), vendors, cats), 'purchases')
+
+    # --- derived tables ---
+
+    def rebuild_vendors(self, vendor_names):
+        """Vendor usage, last use and outstanding balance from the generated purchases"""
+        stats = Purchase.objects.filter(vendor__in=list(vendor_names)).values('vendor').annotate(
+            n=Count('id'),
+            last=Max('date'),
+            outstanding=Sum('total_amount', filter=Q(status__in=Purchase.OUTSTANDING_STATUSES)),
+        )
+        by_key = {Vendor.normalize(row['vendor']): row for row in stats}
+        existing = {v.normalized_name: v for v in Vendor.objects.filter(normalized_name__in=list(by_key))}
+
+        new_rows = []
+        for key, row in by_key.items():
+            vendor = existing.get(key) or Vendor(name=row['vendor'], normalized_name=key)
+            vendor.usage_count = row['n']
+            vendor.last_used = row['last']
+            vendor.outstanding_amount = row['outstanding'] or Decimal('0')
+            if vendor.pk is None:
+                new_rows.append(vendor)
+        Vendor.objects.bulk_create(new_rows, batch_size=self.chunk_size)
+        Vendor.objects.bulk_update(list(existing.values()), ['usage_count', 'last_used', 'outstanding_amount'],
+                                   batch_size=self.chunk_size)
+
+    def run(self):
+        """Generate everything; returns {table: rows written}"""
+        self.voucher_seq = Expense.all_objects.filter(voucher_no__startswith='SV').count()
+        self.bill_seq = Purchase.objects.filter(bill_no__startswith='SB').count()
+        CalendarDay.ensure_range(self.start_date, self.end_date)
+
+        with transaction.atomic():
+            staff = self.create_employees()
+            cats = self.create_categories()
+            vendors = self.vendor_names()
+
+        for month_start in self._months():
+            # One transaction per month keeps a failed run resumable and the lock window short
+            with transaction.atomic():
+                self.generate_staff_month(staff, month_start)
+                self.generate_daily_month(month_start, vendors, cats)
+            self.log(f"{month_start:%b %Y}: {self.counts}")
+
+        with transaction.atomic():
+            self.rebuild_vendors(vendors)
+            self.counts['gst_rollup'] = rebuild_gst_rollup()
+
+        Income.invalidate_summary()
+        bump_generation()
+        return self.counts
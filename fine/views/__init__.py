@@ -1,10 +1,25 @@
 # fine/views/__init__.py
 from .auth_views import login_view as login
 from .dashboard_views import dashboard, get_chart_data
-from .expense_views import expenses, delete_expense, get_expense_report, restore_expense
-from .income_views import income, delete_income, edit_income, get_income_report
-from .purchase_views import purchases, edit_purchase, delete_purchase, get_purchase_report, add_category_ajax
+from .expense_views import expenses, expense_rows, import_expenses, delete_expense, get_expense_report, restore_expense
+from .income_views import income, income_rows, import_settlements, delete_income, edit_income, get_income_report
+from .purchase_views import (
+    purchases,
+    purchase_rows,
+    vendor_autocomplete,
+    payables_aging,
+    vendor_balances,
+    get_gst_summary,
+    export_gst_summary,
+    edit_purchase,
+    delete_purchase,
+    get_purchase_report,
+    add_category_ajax,
+)
 from .main_views import settings, attendance, reports  # Removed payroll from here
+from .search_views import search
+from .profiling_views import profile_list, profile_detail, profile_download
+from .metrics_views import metrics
 
 # Updated payroll views with payment split functionality
 from .payroll_views import (
@@ -14,6 +29,10 @@ from .payroll_views import (
     delete_payroll,  # Delete payroll and expenses
     recreate_expenses,  # Manually recreate expenses for payroll
     restore_payroll,
+    simulate_payroll,  # What-if simulation of payroll totals
+    export_payslips,  # ZIP of PDF payslips for a month
+    get_payroll_arrears,  # Preview arrears after retroactive attendance edits
+    recompute_payroll_arrears,  # Apply arrears recomputation
 )
 
 # Updated attendance views - only the API functions, not the main view
@@ -64,6 +83,10 @@ __all__ = [
     'delete_payroll',
     'recreate_expenses',
     'restore_payroll',
+    'simulate_payroll',
+    'export_payslips',
+    'get_payroll_arrears',
+    'recompute_payroll_arrears',
 
     # Attendance API views (not the main attendance view)
     'save_attendance',
@@ -78,21 +101,42 @@ __all__ = [
     'generate_summary_for_range',
 
     # Expense views
+    'expense_rows',
+    'import_expenses',
     'delete_expense',
     'get_expense_report',
     'restore_expense',
 
     # Income views
+    'income_rows',
+    'import_settlements',
     'delete_income',
     'edit_income',
     'get_income_report',
 
     # Purchase views
+    'purchase_rows',
+    'vendor_autocomplete',
+    'payables_aging',
+    'vendor_balances',
+    'get_gst_summary',
+    'export_gst_summary',
     'edit_purchase',
     'delete_purchase',
     'get_purchase_report',
     'add_category_ajax',
 
+    # Search
+    'search',
+
+    # Request profiles
+    'profile_list',
+    'profile_detail',
+    'profile_download',
+
+    # Prometheus metrics
+    'metrics',
+
     # =================== NEW REPORTS VIEWS ===================
     # Unified reports API
     'get_report_data',
@@ -7,7 +7,7 @@ from django.utils import timezone
 import json
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from django.db.models import Q
+from django.db.models import Q, Count
 
 # Import from base or models
 from .base import logger
@@ -295,37 +295,38 @@ def get_weekly_attendance(request):
     start_of_week = today - timedelta(days=today.weekday())  # Monday
     end_of_week = start_of_week + timedelta(days=6)  # Sunday
     
-    # Get all active employees from Payroll table (Payroll.objects uses SoftDeleteManager)
-    payroll_records = Payroll.objects.all()
+    # Active employees from Payroll (Payroll.objects uses SoftDeleteManager), one row per employee id
+    # (the payroll spelling is kept since the frontend posts it back as employee_name)
+    employee_rows = Payroll.objects.filter(employee__isnull=False).values_list(
+        'employee_id', 'employee_name'
+    ).distinct().order_by('employee_name')
+    employees = dict(employee_rows)
+    employees_list = list(employees.values())
     
-    # Get unique employee names from payroll
-    employees_list = sorted(list(set(
-        payroll_records.values_list('employee_name', flat=True).distinct()
-    )))
-    
-    # Get ALL attendance for the week (including deleted for reference)
+    # Get ALL attendance for the week in one query, keyed by (employee_id, date)
     # We need to see both active and previously saved records
     week_attendance = Attendance.all_objects.filter(
-        date__range=[start_of_week, end_of_week]
-    ).exclude(record_state='deleted')  # Exclude soft deleted records
+        date__range=[start_of_week, end_of_week],
+        employee_id__in=list(employees)
+    ).exclude(record_state='deleted').select_related('payroll').order_by('id')  # Exclude soft deleted records
+    
+    records_by_key = {}
+    for record in week_attendance:
+        records_by_key.setdefault((record.employee_id, record.date), record)
     
     # Create attendance data dictionary
     attendance_data = {}
     
     # For each employee, for each day of the week, get their attendance status
-    for employee_name in employees_list:
+    for employee_id, employee_name in employees.items():
         for i in range(7):
             day_date = start_of_week + timedelta(days=i)
             date_str = day_date.strftime('%Y-%m-%d')
+            key = f"{employee_name}_{date_str}"
             
-            # Find attendance record for this employee on this date
-            attendance_record = week_attendance.filter(
-                employee_name=employee_name,
-                date=day_date
-            ).first()
+            attendance_record = records_by_key.get((employee_id, day_date))
             
             if attendance_record:
-                key = f"{employee_name}_{date_str}"
                 attendance_data[key] = {
                     'status': attendance_record.status,
                     'notes': attendance_record.notes or '',
@@ -336,7 +337,6 @@ def get_weekly_attendance(request):
             else:
                 # If no record exists, still create a placeholder
                 # This helps the frontend know this employee exists for this date
-                key = f"{employee_name}_{date_str}"
                 attendance_data[key] = {
                     'status': '',
                     'notes': '',
@@ -618,9 +618,20 @@ def get_attendance_summary(request):
         if employee_name:
             payroll_records = payroll_records.filter(employee_name__icontains=employee_name)
         
-        employees_list = sorted(list(set(
-            payroll_records.values_list('employee_name', flat=True).distinct()
-        )))
+        employees = dict(payroll_records.filter(employee__isnull=False).values_list(
+            'employee_id', 'employee_name'
+        ).distinct().order_by('employee_name'))
+        
+        # Attendance counts for every employee in one grouped query on employee_id
+        attendance_stats = Attendance.objects.filter(
+            employee_id__in=list(employees),
+            date__range=[start_date, end_date]
+        ).values('employee_id').annotate(
+            p_count=Count('id', filter=Q(status='present')),
+            h_count=Count('id', filter=Q(status='half_day')),
+            a_count=Count('id', filter=Q(status='absent')),
+        )
+        stats_map = {row['employee_id']: row for row in attendance_stats}
         
         summary_list = []
         total_present = 0
@@ -629,17 +640,13 @@ def get_attendance_summary(request):
         total_full_days = Decimal('0.0')
         
         # For each employee, calculate attendance for the date range
-        for employee in employees_list:
-            # Get attendance records for this employee in the date range
-            attendance_records = Attendance.objects.filter(
-                employee_name=employee,
-                date__range=[start_date, end_date]
-            )
+        for employee_id, employee in employees.items():
+            stats = stats_map.get(employee_id, {'p_count': 0, 'h_count': 0, 'a_count': 0})
             
             # Calculate counts
-            present_count = attendance_records.filter(status='present').count()
-            half_day_count = attendance_records.filter(status='half_day').count()
-            absent_count = attendance_records.filter(status='absent').count()
+            present_count = stats['p_count']
+            half_day_count = stats['h_count']
+            absent_count = stats['a_count']
             
             # FIX: Calculate full_days as decimal
             full_days_decimal = Decimal(present_count) + (Decimal(half_day_count) * Decimal('0.5'))
@@ -1,8 +1,8 @@
 # dashboard_views.py
 from django.shortcuts import render
 from django.db.models import Sum, Count
-from ..models import Expense, Purchase, Income
-from ..utils.period_utils import get_selected_period, get_period_options
+from ..models import CalendarDay, Expense, Purchase, Income
+from ..utils.period_utils import get_selected_period, get_period_options, month_range, year_range, range_filter
 from django.http import JsonResponse
 from datetime import datetime, timedelta
 import json
@@ -16,22 +16,22 @@ def dashboard(request):
     # Get selected period from request
     selected_date, selected_year, selected_month, period_str = get_selected_period(request)
     
+    # Half-open [start, end) range for the month, so date filters can use the date indexes
+    month_filter = range_filter(*month_range(selected_year, selected_month))
+    
     # Calculate Total Income for selected period
     total_income = Income.objects.filter(
-        date__year=selected_year,
-        date__month=selected_month
+        **month_filter
     ).aggregate(total_income=Sum('amount'))['total_income'] or 0
     
     # Calculate Total Expenses for selected period
     total_expenses = Expense.objects.filter(
-        date__year=selected_year,
-        date__month=selected_month
+        **month_filter
     ).aggregate(total_expenses=Sum('total_amount'))['total_expenses'] or 0
     
     # Calculate Total Purchases for selected period
     total_purchases = Purchase.objects.filter(
-        date__year=selected_year,
-        date__month=selected_month
+        **month_filter
     ).aggregate(total_purchases=Sum('total_amount'))['total_purchases'] or 0
     
     # Calculate Net Balance (Income - (Expenses + Purchases))
@@ -39,8 +39,7 @@ def dashboard(request):
 
     # Fetch 5 Most Recent Expenses for the selected period
     recent_expenses = Expense.objects.filter(
-        date__year=selected_year,
-        date__month=selected_month
+        **month_filter
     ).order_by('-date')[:5]
 
     # Get period options for dropdown
@@ -198,163 +197,74 @@ def get_custom_range_overview(start_date, end_date):
     }
 
 
+def _bucket_series(bucket, keys, start, end):
+    """Income/expense/purchase totals for each bucket key, grouped on the calendar table"""
+    series = {}
+    for name, model, amount_field in (
+        ('income', Income, 'amount'),
+        ('expenses', Expense, 'total_amount'),
+        ('purchases', Purchase, 'total_amount'),
+    ):
+        totals = CalendarDay.group_totals(model.objects.all(), bucket, amount_field, start, end)
+        series[name] = [float(totals.get(key, 0)) for key in keys]
+    return series
+
+
 def get_weekly_data(base_date):
-    """Get weekly data within the selected month only"""
-    labels = []
-    income_data = []
-    expense_data = []
-    purchase_data = []
-    
-    # Get first and last day of the selected month
-    first_day = base_date.replace(day=1)
-    if base_date.month == 12:
-        last_day = base_date.replace(year=base_date.year+1, month=1, day=1) - timedelta(days=1)
-    else:
-        last_day = base_date.replace(month=base_date.month+1, day=1) - timedelta(days=1)
-    
-    # Calculate total days in month
-    total_days = (last_day - first_day).days + 1
+    """Get ISO-week data within the selected month only"""
+    first_day, next_month = month_range(base_date.year, base_date.month)
+    last_day = next_month - timedelta(days=1)
     
-    # If month has less than 28 days, show all data as one "week"
-    if total_days < 28:
-        num_weeks = 1
-    else:
-        # Divide month into ~4 weeks
-        num_weeks = 4
+    # Monday of every week touching the month; partial weeks are clipped to the month
+    week_starts = []
+    week_start = first_day - timedelta(days=first_day.weekday())
+    while week_start <= last_day:
+        week_starts.append(week_start)
+        week_start += timedelta(days=7)
     
-    days_per_week = total_days / num_weeks
+    labels = [
+        f"{max(ws, first_day).strftime('%b %d')} - {min(ws + timedelta(days=6), last_day).strftime('%d')}"
+        for ws in week_starts
+    ]
     
-    for i in range(num_weeks):
-        week_start = first_day + timedelta(days=int(days_per_week * i))
-        if i == num_weeks - 1:
-            week_end = last_day  # Last week goes to end of month
-        else:
-            week_end = first_day + timedelta(days=int(days_per_week * (i + 1)) - 1)
-        
-        # Format label
-        labels.append(f"{week_start.strftime('%b %d')} - {week_end.strftime('%d')}")
-        
-        # Get income for the week
-        income = Income.objects.filter(
-            date__gte=week_start,
-            date__lte=week_end
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        income_data.append(float(income))
-        
-        # Get expenses for the week
-        expense = Expense.objects.filter(
-            date__gte=week_start,
-            date__lte=week_end
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        expense_data.append(float(expense))
-        
-        # Get purchases for the week
-        purchase = Purchase.objects.filter(
-            date__gte=week_start,
-            date__lte=week_end
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        purchase_data.append(float(purchase))
-    
-    return {
-        'labels': labels,
-        'income': income_data,
-        'expenses': expense_data,
-        'purchases': purchase_data
-    }
+    return {'labels': labels, **_bucket_series('week', week_starts, first_day, next_month)}
 
 def get_monthly_data(base_date):
-    """Get monthly data for the last 6 months - FIXED"""
-    labels = []
-    income_data = []
-    expense_data = []
-    purchase_data = []
+    """Get monthly data for the last 6 months"""
+    current_month = month_range(base_date.year, base_date.month)[0]
+    month_starts = [current_month - relativedelta(months=i) for i in range(5, -1, -1)]
     
-    for i in range(5, -1, -1):
-        # FIXED: Calculate month correctly - subtract i months from base_date
-        month_date = base_date.replace(day=1) - relativedelta(months=i)
-        
-        # Format label
-        labels.append(month_date.strftime('%b'))
-        
-        # Get data for the month
-        income = Income.objects.filter(
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        income_data.append(float(income))
-        
-        expense = Expense.objects.filter(
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        expense_data.append(float(expense))
-        
-        purchase = Purchase.objects.filter(
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        purchase_data.append(float(purchase))
+    labels = [m.strftime('%b') for m in month_starts]
+    end = month_range(month_starts[-1].year, month_starts[-1].month)[1]
     
-    return {
-        'labels': labels,
-        'income': income_data,
-        'expenses': expense_data,
-        'purchases': purchase_data
-    }
+    return {'labels': labels, **_bucket_series('month', month_starts, month_starts[0], end)}
 
 
 def get_yearly_data():
     """Get yearly data for the last 5 years"""
-    labels = []
-    income_data = []
-    expense_data = []
-    purchase_data = []
-    
     current_year = datetime.now().year
+    years = list(range(current_year-4, current_year+1))
     
-    for year in range(current_year-4, current_year+1):
-        labels.append(str(year))
-        
-        income = Income.objects.filter(
-            date__year=year
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        income_data.append(float(income))
-        
-        expense = Expense.objects.filter(
-            date__year=year
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        expense_data.append(float(expense))
-        
-        purchase = Purchase.objects.filter(
-            date__year=year
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        purchase_data.append(float(purchase))
+    labels = [str(year) for year in years]
     
-    return {
-        'labels': labels,
-        'income': income_data,
-        'expenses': expense_data,
-        'purchases': purchase_data
-    }
+    return {'labels': labels, **_bucket_series('year', years, *year_range(years[0], current_year))}
 
 
 def get_month_overview_data(year, month):
     """Get month overview data for pie chart"""
+    month_filter = range_filter(*month_range(year, month))
     try:
         # Get totals for the month
         income_total = float(Income.objects.filter(
-            date__year=year,
-            date__month=month
+            **month_filter
         ).aggregate(total=Sum('amount'))['total'] or 0)
         
         expense_total = float(Expense.objects.filter(
-            date__year=year,
-            date__month=month
+            **month_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         purchase_total = float(Purchase.objects.filter(
-            date__year=year,
-            date__month=month
+            **month_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         return {
@@ -385,28 +295,21 @@ def get_month_overview_data(year, month):
     
 def get_weekly_overview_data(base_date):
     """Get overview data for the current week within selected month"""
-    # Get first and last day of the selected month
-    first_day = base_date.replace(day=1)
-    if base_date.month == 12:
-        last_day = base_date.replace(year=base_date.year+1, month=1, day=1) - timedelta(days=1)
-    else:
-        last_day = base_date.replace(month=base_date.month+1, day=1) - timedelta(days=1)
+    # Half-open range for the selected month
+    month_filter = range_filter(*month_range(base_date.year, base_date.month))
     
     try:
         # Aggregate totals for the entire month (weekly view shows weekly breakdown but pie shows month total)
         income_total = float(Income.objects.filter(
-            date__gte=first_day,
-            date__lte=last_day
+            **month_filter
         ).aggregate(total=Sum('amount'))['total'] or 0)
         
         expense_total = float(Expense.objects.filter(
-            date__gte=first_day,
-            date__lte=last_day
+            **month_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         purchase_total = float(Purchase.objects.filter(
-            date__gte=first_day,
-            date__lte=last_day
+            **month_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         return {
@@ -438,22 +341,20 @@ def get_yearly_overview_data():
     """Get overview data for the last 5 years (matching yearly line chart scope)"""
     current_year = datetime.now().year
     start_year = current_year - 4
+    years_filter = range_filter(*year_range(start_year, current_year))
     
     try:
         # Aggregate totals for the last 5 years
         income_total = float(Income.objects.filter(
-            date__year__gte=start_year,
-            date__year__lte=current_year
+            **years_filter
         ).aggregate(total=Sum('amount'))['total'] or 0)
         
         expense_total = float(Expense.objects.filter(
-            date__year__gte=start_year,
-            date__year__lte=current_year
+            **years_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         purchase_total = float(Purchase.objects.filter(
-            date__year__gte=start_year,
-            date__year__lte=current_year
+            **years_filter
         ).aggregate(total=Sum('total_amount'))['total'] or 0)
         
         return {
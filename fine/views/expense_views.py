@@ -1,6 +1,8 @@
 # expense_views.py - Updated for direct total amount entry and soft delete support
 from django.shortcuts import get_object_or_404, render, redirect
+from django.db.models import Sum, Q
 from django.utils import timezone
+from django.template.loader import render_to_string
 from decimal import Decimal
 from ..models import Expense, Income
 from django.http import JsonResponse
@@ -10,6 +12,14 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 import json
 
+from ..utils.pagination import keyset_page, get_page_size
+from ..utils.fingerprints import voucher_fingerprint
+from ..utils.reference_data import get_reference
+from ..utils.period_utils import inclusive_range, range_filter
+
+# Entry form fields re-filled when a duplicate voucher is reported
+EXPENSE_FORM_FIELDS = ('expense_id', 'date', 'voucher_no', 'category', 'total_amount', 'payment_method', 'description')
+
 
 def expenses(request):
     """
@@ -49,6 +59,19 @@ def expenses(request):
             except Payroll.DoesNotExist:
                 pass
 
+        # Duplicate voucher check on the indexed fingerprint
+        try:
+            fingerprint = voucher_fingerprint(data['date'], total_amount, data['voucher_no'], category)
+        except ValueError:
+            fingerprint = ''
+        duplicate = Expense.find_duplicate(fingerprint, exclude_id=expense_id)
+        if duplicate and request.POST.get('allow_duplicate') != 'true':
+            # Re-open the form with the entered values, the matching voucher and a "Save anyway" button
+            context = expense_page_context(request)
+            context['duplicate'] = duplicate
+            context['form_data'] = {field: request.POST.get(field, '') for field in EXPENSE_FORM_FIELDS}
+            return render(request, 'fine/expenses.html', context, status=409)
+
         if expense_id:
             # Update existing expense (including soft deleted ones)
             expense = get_object_or_404(Expense.all_objects, id=expense_id)
@@ -68,24 +91,75 @@ def expenses(request):
 
         return redirect('expenses')
 
-    # --- GET: Handle Listing and Filtering ---
-    # Get active expenses by default
-    all_expenses = Expense.objects.all().order_by('-date')
+    return render(request, 'fine/expenses.html', expense_page_context(request))
+
 
+def expense_page_context(request):
+    """Listing, totals and form choices for the expenses page"""
+    all_expenses, start_date, end_date, show_deleted = filter_expenses(request)
+
+    # Calculate totals based on filtered results in a single aggregate query
+    if not show_deleted:
+        totals = all_expenses.aggregate(
+            total_expenses=Sum('total_amount'),
+            payroll_expenses=Sum('total_amount', filter=Q(category='Salary')),
+        )
+        total_expenses = totals['total_expenses'] or Decimal('0')
+        payroll_expenses = totals['payroll_expenses'] or Decimal('0')
+        other_expenses = total_expenses - payroll_expenses
+    else:
+        total_expenses = payroll_expenses = other_expenses = 0
+
+    # Only the first keyset page is rendered; the rest is loaded via expense_rows
+    page = keyset_page(
+        all_expenses.select_related('payroll'),
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='total_amount',
+    )
+
+    # Default date values if not provided
+    if not start_date or not end_date:
+        today = timezone.now().date()
+        start_date = today.replace(day=1).isoformat()
+        end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1]).isoformat()
+
+    context = {
+        'expenses': page['rows'],
+        'page': page,
+        'total_expenses': total_expenses,
+        'payroll_expenses': payroll_expenses,
+        'other_expenses': other_expenses,
+        'start_date': start_date,
+        'end_date': end_date,
+        'today_date': timezone.now().date().isoformat(),
+        'categories': get_reference('expense_categories'),
+        'payment_methods': get_reference('expense_payment_methods'),
+        # UNIT_CHOICES removed to fix AttributeError
+        'show_deleted': show_deleted,
+    }
+    return context
+
+
+def filter_expenses(request):
+    """
+    Apply the listing filters from the query string.
+    Returns (queryset, start_date, end_date, show_deleted).
+    """
     start_date = request.GET.get('start_date')
     end_date = request.GET.get('end_date')
     category_filter = request.GET.get('category')
     show_deleted = request.GET.get('show_deleted', 'false').lower() == 'true'
 
-    if show_deleted:
-        all_expenses = Expense.all_objects.all().order_by('-date')
+    # Get active expenses by default
+    all_expenses = Expense.all_objects.all() if show_deleted else Expense.objects.all()
 
     # Date range filtering
     if start_date and end_date:
         try:
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
             end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-            all_expenses = all_expenses.filter(date__range=[start_date_obj, end_date_obj])
+            all_expenses = all_expenses.filter(**range_filter(*inclusive_range(start_date_obj, end_date_obj)))
         except ValueError:
             today = timezone.now().date()
             start_date = today.replace(day=1).isoformat()
@@ -98,34 +172,51 @@ def expenses(request):
         else:
             all_expenses = all_expenses.filter(category=category_filter)
 
-    # Calculate totals based on filtered results
-    if not show_deleted:
-        total_expenses = sum(exp.total_amount for exp in all_expenses)
-        payroll_expenses = sum(exp.total_amount for exp in all_expenses.filter(category='Salary'))
-        other_expenses = total_expenses - payroll_expenses
-    else:
-        total_expenses = payroll_expenses = other_expenses = 0
+    return all_expenses, start_date, end_date, show_deleted
 
-    # Default date values if not provided
-    if not start_date or not end_date:
-        today = timezone.now().date()
-        start_date = today.replace(day=1).isoformat()
-        end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1]).isoformat()
 
-    context = {
-        'expenses': all_expenses,
-        'total_expenses': total_expenses,
-        'payroll_expenses': payroll_expenses,
-        'other_expenses': other_expenses,
-        'start_date': start_date,
-        'end_date': end_date,
-        'today_date': timezone.now().date().isoformat(),
-        'categories': [choice[0] for choice in Expense.CATEGORY_CHOICES],
-        'payment_methods': [p[0] for p in Expense.PAYMENT_METHOD_CHOICES],
-        # UNIT_CHOICES removed to fix AttributeError
-        'show_deleted': show_deleted,
-    }
-    return render(request, 'fine/expenses.html', context)
+def expense_rows(request):
+    """JSON endpoint returning the next keyset page of expense rows for infinite scroll."""
+    all_expenses, _, _, _ = filter_expenses(request)
+    page = keyset_page(
+        all_expenses.select_related('payroll'),
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='total_amount',
+    )
+    html = render_to_string('includes/expense_rows.html', {'expenses': page['rows']}, request=request)
+
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'count': len(page['rows']),
+        'page_total': float(page['page_total']),
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor'],
+    })
+
+
+@require_POST
+def import_expenses(request):
+    """Bulk import expenses from an uploaded CSV/XLSX voucher sheet."""
+    from ..utils.expense_import import import_expense_file, ImportFormatError
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+
+    try:
+        report = import_expense_file(
+            upload.file,
+            upload.name,
+            dry_run=request.POST.get('dry_run', 'false').lower() == 'true',
+        )
+    except ImportFormatError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({'success': True, **report})
 
 
 def delete_expense(request, pk):
@@ -2,9 +2,13 @@ from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Sum
-from datetime import timedelta
 from ..models import Income
 from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_POST
+from ..utils.pagination import keyset_page, get_page_size
+from ..utils.reference_data import get_reference
+from ..utils.period_utils import inclusive_range, range_filter
 
 def income(request):
     if request.method == "POST":
@@ -19,32 +23,19 @@ def income(request):
         messages.success(request, "Income added successfully!")
         return redirect('income')
 
-    # --- Date Filter Logic Start ---
     today = timezone.now().date()
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    
-    income_records = Income.objects.all().order_by('-date')
-    display_date_info = "All Records"
-    
-    # Apply date range filter if both dates provided
-    if start_date and end_date:
-        income_records = income_records.filter(date__range=[start_date, end_date])
-        display_date_info = f"From {start_date} to {end_date}"
-    else:
-        start_date = ""
-        end_date = ""
-    # --- Date Filter Logic End ---
+    income_records, start_date, end_date, display_date_info = filter_income(request)
 
-    # Summary Calculations
-    yesterday = today - timedelta(days=1)
-    start_of_week = today - timedelta(days=today.weekday())
-    start_of_month = today.replace(day=1)
+    # Only the first keyset page is rendered; the rest is loaded via income_rows
+    page = keyset_page(
+        income_records,
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='amount',
+    )
 
-    daily_total = Income.objects.filter(date=today).aggregate(Sum('amount'))['amount__sum'] or 0
-    yesterday_total = Income.objects.filter(date=yesterday).aggregate(Sum('amount'))['amount__sum'] or 0
-    weekly_total = Income.objects.filter(date__gte=start_of_week).aggregate(Sum('amount'))['amount__sum'] or 0
-    monthly_total = Income.objects.filter(date__gte=start_of_month).aggregate(Sum('amount'))['amount__sum'] or 0
+    # Summary cards come from the day-scoped cache; only the range total is queried
+    summary = Income.get_summary_totals(today)
     total_sum = income_records.aggregate(Sum('amount'))['amount__sum'] or 0
 
     def get_trend(current, previous):
@@ -52,21 +43,96 @@ def income(request):
         return ((current - previous) / previous) * 100
 
     context = {
-        'income_records': income_records,
-        'payment_modes': [c[0] for c in Income.PAYMENT_MODE_CHOICES],
-        'status_choices': [s[0] for s in Income.STATUS_CHOICES],
+        'income_records': page['rows'],
+        'page': page,
+        'payment_modes': get_reference('income_payment_modes'),
+        'status_choices': get_reference('income_statuses'),
         'today_date': today.isoformat(),
         'start_date': start_date,
         'end_date': end_date,
         'display_date_info': display_date_info,
-        'daily_total': daily_total,
-        'weekly_total': weekly_total,
-        'monthly_total': monthly_total,
+        'daily_total': summary['daily_total'],
+        'weekly_total': summary['weekly_total'],
+        'monthly_total': summary['monthly_total'],
         'total_sum': total_sum,
-        'daily_trend': get_trend(daily_total, yesterday_total),
+        'daily_trend': get_trend(summary['daily_total'], summary['yesterday_total']),
     }
     return render(request, 'fine/income.html', context)
 
+def filter_income(request):
+    """
+    Apply the listing date filter from the query string.
+    Returns (queryset, start_date, end_date, display_date_info).
+    """
+    start_date = request.GET.get('start_date')
+    end_date = request.GET.get('end_date')
+    
+    income_records = Income.objects.all()
+    display_date_info = "All Records"
+    
+    # Apply date range filter if both dates provided
+    if start_date and end_date:
+        try:
+            income_records = income_records.filter(**range_filter(*inclusive_range(start_date, end_date)))
+            display_date_info = f"From {start_date} to {end_date}"
+        except ValueError:
+            start_date = ""
+            end_date = ""
+    else:
+        start_date = ""
+        end_date = ""
+
+    return income_records, start_date, end_date, display_date_info
+
+def income_rows(request):
+    """JSON endpoint returning the next keyset page of income rows for infinite scroll"""
+    income_records, _, _, _ = filter_income(request)
+    page = keyset_page(
+        income_records,
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='amount',
+    )
+    html = render_to_string('includes/income_rows.html', {
+        'income_records': page['rows'],
+        'payment_modes': get_reference('income_payment_modes'),
+        'status_choices': get_reference('income_statuses'),
+    }, request=request)
+
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'count': len(page['rows']),
+        'page_total': float(page['page_total']),
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor'],
+    })
+
+@require_POST
+def import_settlements(request):
+    """Import a Swiggy/Zomato settlement CSV/XLSX into income records"""
+    from ..utils.settlement_import import import_settlement_file
+    from ..utils.expense_import import ImportFormatError
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+
+    try:
+        report = import_settlement_file(
+            upload.file,
+            upload.name,
+            channel=request.POST.get('channel') or None,
+            aggregate=request.POST.get('aggregate', 'false').lower() == 'true',
+            dry_run=request.POST.get('dry_run', 'false').lower() == 'true',
+        )
+    except ImportFormatError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({'success': True, **report})
+
 def delete_income(request, pk):
     if request.method == "POST":
         income_record = get_object_or_404(Income, pk=pk)
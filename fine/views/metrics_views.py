@@ -0,0 +1,29 @@
+# fine/views/metrics_views.py
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from ..utils import metrics as app_metrics
+
+
+def _authorized(request):
+    """Scrapers send 'Authorization: Bearer <METRICS_TOKEN>'; staff users may look from a browser"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').strip()
+    if token and supplied and constant_time_compare(supplied, token):
+        return True
+    return getattr(request.user, 'is_staff', False)
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint; needs the METRICS_TOKEN bearer token or a staff login"""
+    if not _authorized(request):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    body = app_metrics.render()
+    if body is None:
+        return HttpResponse('Metrics are disabled (prometheus_client is not installed)',
+                            status=503, content_type='text/plain')
+    return HttpResponse(body, content_type=app_metrics.CONTENT_TYPE)
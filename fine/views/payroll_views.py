@@ -1,105 +1,34 @@
 # payroll_views.py - Updated to send worked_days to frontend for table display
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_GET
 from django.shortcuts import get_object_or_404, render
-from django.db.models import Sum
 import json
 from datetime import datetime
 from decimal import Decimal
+from django.db.models import Count, Q
 
 # Import models
 from ..models import Payroll
-
-def get_selected_period(request):
-    """Get selected period from request query parameters."""
-    period_str = request.GET.get('period', '')
-    
-    if period_str:
-        try:
-            year_str, month_str = period_str.split('-')
-            year = int(year_str)
-            month = int(month_str)
-            
-            if month < 1 or month > 12:
-                raise ValueError("Invalid month")
-                
-            selected_date = datetime(year, month, 1)
-            return selected_date, year, month, period_str
-        except (ValueError, AttributeError):
-            pass
-    
-    current_date = datetime.now()
-    current_year = current_date.year
-    current_month = current_date.month
-    period_str = f"{current_year}-{current_month:02d}"
-    
-    return current_date, current_year, current_month, period_str
-
-def get_period_options(selected_year, selected_month):
-    """Generate a list of month-year options for the dropdown."""
-    current_date = datetime.now()
-    current_year = current_date.year
-    current_month = current_date.month
-    
-    options = []
-    
-    for offset in range(-12, 4):
-        total_months_from_current = current_month + offset
-        year = current_year + (total_months_from_current - 1) // 12
-        month = ((total_months_from_current - 1) % 12) + 1
-        
-        if month < 1 or month > 12:
-            continue
-            
-        try:
-            period_value = f"{year}-{month:02d}"
-            display_text = f"{datetime(year, month, 1).strftime('%B')} {year}"
-            is_selected = (year == selected_year and month == selected_month)
-            
-            options.append({
-                'value': period_value,
-                'text': display_text,
-                'selected': is_selected
-            })
-        except ValueError:
-            continue
-    
-    def sort_key(x):
-        y, m = map(int, x['value'].split('-'))
-        return (-y, -m)
-    
-    options.sort(key=sort_key)
-    
-    return options
+from ..utils.period_utils import get_selected_period, get_period_options, month_range, range_filter
 
 def payroll_list(request):
     """Main payroll page view - Now serves as API endpoint for JavaScript"""
     selected_date, selected_year, selected_month, period_str = get_selected_period(request)
     
-    # Filter only active records (Payroll.objects uses SoftDeleteManager)
-    payrolls = Payroll.objects.filter(
-        month=selected_month,
-        year=selected_year
-    ).order_by('employee_name')
-    
-    # Calculate totals for initial display
-    total_basic_pay = payrolls.aggregate(total=Sum('basic_pay'))['total'] or Decimal('0')
-    total_spr = payrolls.aggregate(total=Sum('spr_amount'))['total'] or Decimal('0')
-    total_cash = payrolls.aggregate(total=Sum('cash_amount'))['total'] or Decimal('0')
-    total_bank = payrolls.aggregate(total=Sum('bank_transfer_amount'))['total'] or Decimal('0')
-    total_net_payable = payrolls.aggregate(total=Sum('net_salary'))['total'] or Decimal('0')
+    # Cached per-month totals (one multi-aggregate query on a cache miss)
+    totals = Payroll.get_month_totals(selected_month, selected_year)
     
     # Get period options for dropdown
     period_options = get_period_options(selected_year, selected_month)
     
     context = {
         # Initial values for summary cards
-        'total_salary': total_basic_pay,
-        'total_spr': total_spr,
-        'total_cash': total_cash,
-        'total_bank': total_bank,
-        'total_net_payable': total_net_payable,
+        'total_salary': totals['total_basic_pay'],
+        'total_spr': totals['total_spr'],
+        'total_cash': totals['total_cash'],
+        'total_bank': totals['total_bank'],
+        'total_net_payable': totals['total_net_payable'],
         'selected_period': period_str,
         'selected_period_display': selected_date.strftime('%B %Y'),
         'period_options': period_options,
@@ -234,45 +163,22 @@ def get_payroll_data(request):
     total_bank = Decimal('0')
     total_net_payable = Decimal('0')
     
+    # Worked days for every employee in one grouped query on employee_id
+    from ..models import Attendance
+    worked_stats = Attendance.objects.filter(
+        employee_id__in=[p.employee_id for p in payrolls if p.employee_id],
+        **range_filter(*month_range(year, month))
+    ).values('employee_id').annotate(
+        p_count=Count('id', filter=Q(status='present')),
+        h_count=Count('id', filter=Q(status='half_day')),
+    )
+    worked_map = {
+        row['employee_id']: Decimal(row['p_count']) + Decimal(row['h_count']) * Decimal('0.5')
+        for row in worked_stats
+    }
+    
     for payroll in payrolls:
-        # Calculate worked days from Attendance module
-        worked_days = Decimal('0')
-        
-        try:
-            # Import Attendance model inside the function to avoid circular imports
-            from ..models import Attendance
-            
-            # Get attendance records for this employee in the selected month/year
-            # Use all_objects to include all attendance records
-            attendance_records = Attendance.all_objects.filter(
-                employee_name__iexact=payroll.employee_name.strip(),  # Case-insensitive matching
-                date__month=month,
-                date__year=year,
-                record_state='active'  # Only active records
-            )
-            
-            print(f"Employee: {payroll.employee_name}, Attendance records: {attendance_records.count()}")
-            
-            # Calculate worked days based on status
-            for attendance in attendance_records:
-                if attendance.status == 'present':
-                    worked_days += Decimal('1')
-                    print(f"  - {attendance.date}: Present (+1)")
-                elif attendance.status == 'half_day':
-                    worked_days += Decimal('0.5')
-                    print(f"  - {attendance.date}: Half Day (+0.5)")
-                elif attendance.status == 'absent':
-                    print(f"  - {attendance.date}: Absent (+0)")
-                else:
-                    print(f"  - {attendance.date}: Unknown status '{attendance.status}'")
-            
-            print(f"Total worked days: {worked_days}")
-            
-        except Exception as e:
-            print(f"Error calculating worked days for {payroll.employee_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            worked_days = Decimal('0')
+        worked_days = worked_map.get(payroll.employee_id, Decimal('0'))
         
         # Ensure calculations are up to date
         payroll.calculate_salary()
@@ -399,4 +305,97 @@ def recreate_expenses(request):
         return JsonResponse({
             'success': False,
             'message': str(e)
-        }, status=400)
\ No newline at end of file
+        }, status=400)
+
+@require_POST
+def simulate_payroll(request):
+    """Read-only what-if simulation of payroll totals for a month"""
+    try:
+        from ..utils.payroll_simulator import simulate_month, MAX_SCENARIOS
+
+        data = json.loads(request.body)
+        month = int(data.get('month', datetime.now().month))
+        year = int(data.get('year', datetime.now().year))
+        scenarios = data.get('scenarios', [])
+
+        if not isinstance(scenarios, list) or not all(isinstance(s, dict) for s in scenarios):
+            return JsonResponse({
+                'success': False,
+                'message': 'scenarios must be a list of objects'
+            }, status=400)
+
+        if len(scenarios) > MAX_SCENARIOS:
+            return JsonResponse({
+                'success': False,
+                'message': f'At most {MAX_SCENARIOS} scenarios can be simulated at once'
+            }, status=400)
+
+        result = simulate_month(month, year, scenarios)
+
+        return JsonResponse({
+            'success': True,
+            'month': month,
+            'year': year,
+            **result
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+@require_GET
+def export_payslips(request):
+    """
+    Stream a ZIP of PDF payslips for every payroll in a month, rendered one at a
+    time in this worker; use the generate_payslips command for a parallel batch
+    """
+    try:
+        from ..utils.payslips import collect_payslip_data, stream_payslip_zip
+
+        month = int(request.GET.get('month', datetime.now().month))
+        year = int(request.GET.get('year', datetime.now().year))
+
+        slips = collect_payslip_data(month, year)
+        if not slips:
+            return JsonResponse({
+                'success': False,
+                'message': 'No payroll records found for the selected month'
+            }, status=404)
+
+        response = StreamingHttpResponse(stream_payslip_zip(slips), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="Payslips_{year}{month:02d}.zip"'
+        return response
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+@require_GET
+def get_payroll_arrears(request):
+    """Preview arrears for payrolls whose attendance changed after saving"""
+    try:
+        from ..utils.payroll_arrears import recompute_dirty_payrolls
+
+        report = recompute_dirty_payrolls(apply=False)
+        return JsonResponse({'success': True, **report})
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+@require_POST
+def recompute_payroll_arrears(request):
+    """Recompute dirty payrolls and their Salary expenses, returning the arrears report"""
+    try:
+        from ..utils.payroll_arrears import recompute_dirty_payrolls
+
+        report = recompute_dirty_payrolls(apply=True)
+        return JsonResponse({'success': True, **report})
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
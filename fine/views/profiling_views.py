@@ -0,0 +1,58 @@
+# fine/views/profiling_views.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from ..utils import profiling
+
+
+@staff_member_required
+@require_GET
+def profile_list(request):
+    """Stored request profiles, plus a fresh profiling token for the current user"""
+    return render(request, 'fine/profiles.html', {
+        'profiles': profiling.list_profiles(),
+        'token': profiling.make_token(request.user),
+        'profile_param': profiling.PROFILE_PARAM,
+        'engine_param': profiling.ENGINE_PARAM,
+    })
+
+
+@staff_member_required
+@require_GET
+def profile_detail(request, name):
+    """Top functions and SQL log of one stored profile"""
+    sort = 'tottime' if request.GET.get('sort') == 'tottime' else 'cumulative'
+    try:
+        meta = profiling.load_meta(name)
+    except (OSError, ValueError):
+        raise Http404("Profile not found")
+
+    functions = []
+    if meta.get('engine') == 'cprofile':
+        try:
+            functions = profiling.top_functions(name, sort=sort)
+        except OSError:
+            pass
+
+    return render(request, 'fine/profile_detail.html', {
+        'profile': meta,
+        'functions': functions,
+        'sort': sort,
+    })
+
+
+@staff_member_required
+@require_GET
+def profile_download(request, name, ext):
+    """Raw .prof dump (for snakeviz / pstats), pyinstrument HTML or JSON sidecar"""
+    if ext not in ('prof', 'html', 'json'):
+        raise Http404("Profile not found")
+    try:
+        path = profiling.profile_path(name, ext)
+        handle = open(path, 'rb')
+    except (OSError, ValueError):
+        raise Http404("Profile not found")
+    # pyinstrument output is opened in the browser, everything else downloaded
+    return FileResponse(handle, as_attachment=ext != 'html', filename=f"{name}.{ext}")
@@ -1,12 +1,25 @@
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
+from django.template.loader import render_to_string
+from django.db.models import Sum, Count, Case, When, Value, CharField
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Import models
-from ..models import Purchase, Cat
+from ..models import Purchase, Cat, Vendor
+from ..utils.pagination import keyset_page, get_page_size
+from ..utils.period_utils import fiscal_year_of
+from ..utils.fingerprints import voucher_fingerprint
+from ..utils.reference_data import get_reference
+from ..utils.period_utils import inclusive_range, range_filter
+
+# Entry form fields re-filled when a duplicate bill is reported
+PURCHASE_FORM_FIELDS = (
+    'purchase_id', 'date', 'vendor', 'custom_vendor', 'cat', 'bill_no',
+    'total_amount', 'gst_amount', 'payment_mode', 'status', 'description',
+)
 
 
 def purchases(request):
@@ -25,6 +38,9 @@ def purchases(request):
             if not vendor:
                 raise ValueError("Vendor is required.")
 
+            # Reuse the existing spelling when the vendor is already known
+            vendor = Vendor.canonical_name(vendor)
+
             # Handle Category (use 'cat' field name from form)
             cat_id = request.POST.get('cat')
             if not cat_id:
@@ -45,9 +61,21 @@ def purchases(request):
                 'description': request.POST.get('description', ''),
             }
 
+            # Duplicate bill check on the indexed fingerprint
+            fingerprint = voucher_fingerprint(
+                date_obj, purchase_data['total_amount'], purchase_data['bill_no'], vendor
+            )
+            duplicate = Purchase.find_duplicate(fingerprint, exclude_id=purchase_id)
+            if duplicate and request.POST.get('allow_duplicate') != 'true':
+                return render_duplicate_purchase(request, duplicate)
+
             if purchase_id and purchase_id.strip():
-                # UPDATE existing record
-                Purchase.objects.filter(id=purchase_id).update(**purchase_data)
+                # UPDATE existing record through save() so the fingerprint, search
+                # index and vendor balance follow the change
+                purchase = get_object_or_404(Purchase, id=purchase_id)
+                for field, value in purchase_data.items():
+                    setattr(purchase, field, value)
+                purchase.save()
                 messages.success(request, "Purchase updated successfully!")
             else:
                 # CREATE new record
@@ -60,9 +88,69 @@ def purchases(request):
             messages.error(request, f"Error: {str(e)}")
             return redirect('purchases')
 
-    # -------------------- GET DATA & CONTEXT --------------------
+    return render(request, 'fine/purchases.html', purchase_page_context(request))
+
+
+def purchase_page_context(request):
+    """Listing, range total and form choices for the purchases page"""
+    purchase_list, start_date, end_date, display_date = filter_purchases(request)
+
+    # Range total by aggregate; only the first keyset page of rows is rendered
+    range_total = purchase_list.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
+    page = keyset_page(
+        purchase_list.select_related('cat'),
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='total_amount',
+    )
+
+    # Most used vendors for the dropdown (cached reference data); the rest are found via vendor_autocomplete
+    vendor_choices = get_reference('vendors')
+
+    context = {
+        'purchases': page['rows'],
+        'page': page,
+        'range_total': range_total,
+        'vendor_choices': vendor_choices,
+        'cat_choices': get_reference('categories'),
+        'today_date': display_date,
+        'start_date': start_date,
+        'end_date': end_date,
+    }
+    return context
+
+
+def render_duplicate_purchase(request, duplicate, purchase_id=None):
+    """
+    Re-open the purchase form with the entered values, the matching bill and a
+    "Save anyway" button that posts allow_duplicate.
+    """
+    form_data = {field: request.POST.get(field, '') for field in PURCHASE_FORM_FIELDS}
+    if purchase_id:
+        form_data['purchase_id'] = str(purchase_id)
+    context = purchase_page_context(request)
+    context['duplicate'] = duplicate
+    context['form_data'] = form_data
+    return render(request, 'fine/purchases.html', context, status=409)
+
+
+def filter_purchases(request):
+    """
+    Apply the listing date filters from the query string.
+    Returns (queryset, start_date, end_date, display_date).
+    """
     selected_date = request.GET.get('date')
-    purchase_list = Purchase.objects.all().select_related('cat').order_by('-date')
+    start_date = request.GET.get('start_date', '')
+    end_date = request.GET.get('end_date', '')
+    purchase_list = Purchase.objects.all()
+
+    if start_date and end_date:
+        try:
+            purchase_list = purchase_list.filter(**range_filter(*inclusive_range(start_date, end_date)))
+        except ValueError:
+            start_date = end_date = ''
+    else:
+        start_date = end_date = ''
 
     if selected_date:
         purchase_list = purchase_list.filter(date=selected_date)
@@ -70,17 +158,28 @@ def purchases(request):
     else:
         display_date = timezone.now().date().isoformat()
 
-    # Get unique vendors for dropdown
-    vendor_choices = Purchase.objects.values_list('vendor', flat=True).distinct().order_by('vendor')
+    return purchase_list, start_date, end_date, display_date
 
-    context = {
-        'purchases': purchase_list,
-        'vendor_choices': vendor_choices,
-        'cat_choices': Cat.objects.all(),
-        'today_date': display_date,
-    }
 
-    return render(request, 'fine/purchases.html', context)
+def purchase_rows(request):
+    """JSON endpoint returning the next keyset page of purchase rows for infinite scroll."""
+    purchase_list, _, _, _ = filter_purchases(request)
+    page = keyset_page(
+        purchase_list.select_related('cat'),
+        cursor=request.GET.get('cursor'),
+        page_size=get_page_size(request),
+        amount_field='total_amount',
+    )
+    html = render_to_string('includes/purchase_rows.html', {'purchases': page['rows']}, request=request)
+
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'count': len(page['rows']),
+        'page_total': float(page['page_total']),
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor'],
+    })
 
 
 def edit_purchase(request, pk):
@@ -96,7 +195,7 @@ def edit_purchase(request, pk):
             vendor = request.POST.get('custom_vendor', '').strip()
             if not vendor:
                 vendor = request.POST.get('vendor', '').strip()
-            purchase.vendor = vendor
+            purchase.vendor = Vendor.canonical_name(vendor)
 
             # Update Category (use 'cat' field name)
             cat_id = request.POST.get('cat')
@@ -110,6 +209,10 @@ def edit_purchase(request, pk):
             purchase.status = request.POST.get('status')
             purchase.description = request.POST.get('description', '')
 
+            duplicate = Purchase.find_duplicate(purchase.compute_fingerprint(), exclude_id=purchase.id)
+            if duplicate and request.POST.get('allow_duplicate') != 'true':
+                return render_duplicate_purchase(request, duplicate, purchase_id=purchase.id)
+
             purchase.save()
             messages.success(request, "Purchase updated successfully!")
 
@@ -119,6 +222,143 @@ def edit_purchase(request, pk):
     return redirect('purchases')
 
 
+AGING_BUCKETS = (
+    ('0_30', 0, 30),
+    ('31_60', 31, 60),
+    ('61_90', 61, 90),
+    ('90_plus', 91, None),
+)
+
+
+def payables_aging(request):
+    """
+    Outstanding (Pending/Due) purchases bucketed by age, per vendor and overall,
+    from one grouped query over the (status, date) index. Vendor spellings are
+    folded on the normalized name, as in the vendor table and vendor_balances.
+    """
+    today = timezone.now().date()
+
+    bucket = Case(
+        *[
+            When(date__gte=today - timedelta(days=high), then=Value(name))
+            for name, _, high in AGING_BUCKETS if high is not None
+        ],
+        default=Value(AGING_BUCKETS[-1][0]),
+        output_field=CharField(),
+    )
+    rows = Purchase.objects.filter(
+        status__in=Purchase.OUTSTANDING_STATUSES
+    ).annotate(bucket=bucket).values('vendor', 'bucket').annotate(
+        total=Sum('total_amount'),
+        count=Count('id'),
+    ).order_by()
+
+    rows = list(rows)
+    keys = {Vendor.normalize(row['vendor']) for row in rows}
+    names = dict(Vendor.objects.filter(normalized_name__in=keys).values_list('normalized_name', 'name'))
+
+    empty = {name: 0.0 for name, _, _ in AGING_BUCKETS}
+    overall = dict(empty)
+    vendors = {}
+    for row in rows:
+        total = float(row['total'] or 0)
+        overall[row['bucket']] += total
+        key = Vendor.normalize(row['vendor'])
+        entry = vendors.setdefault(key, {'vendor': names.get(key, row['vendor']), **empty, 'total': 0.0, 'bills': 0})
+        entry[row['bucket']] += total
+        entry['total'] += total
+        entry['bills'] += row['count']
+
+    return JsonResponse({
+        'success': True,
+        'as_of': today.isoformat(),
+        'buckets': [{'bucket': name, 'min_days': low, 'max_days': high} for name, low, high in AGING_BUCKETS],
+        'totals': {**overall, 'total': sum(overall.values())},
+        'vendors': sorted(vendors.values(), key=lambda v: v['total'], reverse=True),
+    })
+
+
+def vendor_balances(request):
+    """Per-vendor outstanding balances, read from the incrementally maintained vendor table"""
+    vendors = Vendor.objects.filter(outstanding_amount__gt=0).order_by('-outstanding_amount')
+    return JsonResponse({
+        'success': True,
+        'data': [
+            {'vendor': v.name, 'outstanding': float(v.outstanding_amount),
+             'last_used': v.last_used.strftime('%Y-%m-%d') if v.last_used else None}
+            for v in vendors
+        ],
+        'total_outstanding': float(sum(v.outstanding_amount for v in vendors)),
+    })
+
+
+def _gst_period(request):
+    """
+    (financial year, quarter, month) from the query string; year is the
+    April-March financial year named by its starting year, quarter/month are optional
+    """
+    year = int(request.GET.get('year') or fiscal_year_of(timezone.now().date()))
+    quarter = int(request.GET['quarter']) if request.GET.get('quarter') else None
+    month = int(request.GET['month']) if request.GET.get('month') else None
+    if quarter is not None and quarter not in (1, 2, 3, 4):
+        raise ValueError("quarter must be 1-4")
+    if month is not None and not 1 <= month <= 12:
+        raise ValueError("month must be 1-12")
+    return year, quarter, month
+
+
+def get_gst_summary(request):
+    """Monthly/quarterly/yearly GST input totals from the GST rollup table"""
+    from ..utils.gst_summary import gst_summary
+
+    try:
+        year, quarter, month = _gst_period(request)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({'success': True, **gst_summary(year, quarter=quarter, month=month)})
+
+
+def export_gst_summary(request):
+    """Excel download of the GST summary for the requested period"""
+    from ..utils.gst_summary import gst_summary, gst_summary_workbook
+
+    try:
+        year, quarter, month = _gst_period(request)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    summary = gst_summary(year, quarter=quarter, month=month)
+    response = HttpResponse(
+        gst_summary_workbook(summary),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    filename = f"GST_Summary_{summary['period'].replace(' ', '_')}.xlsx"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def vendor_autocomplete(request):
+    """Prefix search over the vendor table, most used first"""
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), 50))
+    except (ValueError, TypeError):
+        limit = 10
+
+    vendors = Vendor.autocomplete(request.GET.get('q', ''), limit=limit)
+    return JsonResponse({
+        'success': True,
+        'results': [
+            {
+                'name': v.name,
+                'usage_count': v.usage_count,
+                'last_used': v.last_used.strftime('%Y-%m-%d') if v.last_used else None,
+            }
+            for v in vendors
+        ],
+    })
+
+
 def delete_purchase(request, pk):
     if request.method == "POST":
         purchase = get_object_or_404(Purchase, pk=pk)
@@ -135,7 +375,10 @@ def add_category_ajax(request):
     if request.method == "POST":
         name = request.POST.get('name', '').strip()
         if name:
-            cat_obj, created = Cat.objects.get_or_create(name=name)
+            # Existing categories are answered from the cached list without a query
+            cat_obj = next((c for c in get_reference('categories') if c.name.lower() == name.lower()), None)
+            if cat_obj is None:
+                cat_obj, created = Cat.objects.get_or_create(name=name)
             return JsonResponse({
                 'success': True,
                 'id': cat_obj.id,
@@ -2,19 +2,32 @@
 from django.shortcuts import render
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_GET, require_POST
-from django.db.models import Sum, Count, Avg, F, Q
+from django.db.models import Sum, Count, Avg, F, Q, Max
 from django.utils import timezone
 from datetime import datetime, timedelta
 from decimal import Decimal
 import json
+import time
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 
 from ..models import (
     Income, Expense, Purchase, Payroll,
-    Attendance, AttendanceSummary, Cat
+    Attendance, AttendanceSummary, Cat, CalendarDay
 )
+from ..models.calendar_day import BUCKET_FIELDS
+from ..utils import metrics
+from ..utils.period_utils import period_bounds
+
+# Report period radio -> period_utils period type for the default range
+REPORT_PERIODS = {
+    'daily': 'day',
+    'weekly': 'week',
+    'monthly': 'month',
+    'yearly': 'year',
+    'fiscal': 'fiscal_year',
+}
 
 
 def reports(request):
@@ -44,22 +57,9 @@ def get_report_data(request):
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
 
         if not start_date or not end_date:
-            today = timezone.now().date()
-            if period_type == 'daily':
-                start_date = end_date = today
-            elif period_type == 'weekly':
-                start_date = today - timedelta(days=today.weekday())
-                end_date = start_date + timedelta(days=6)
-            elif period_type == 'monthly':
-                start_date = today.replace(day=1)
-                next_month = start_date.replace(
-                    month=start_date.month % 12 + 1,
-                    year=start_date.year + (start_date.month // 12)
-                )
-                end_date = next_month - timedelta(days=1)
-            else:
-                start_date = today.replace(month=1, day=1)
-                end_date = today.replace(month=12, day=31)
+            start_date, end_date = period_bounds(
+                REPORT_PERIODS.get(period_type, 'year'), timezone.now().date()
+            )
 
         response_data = {
             'success': True,
@@ -89,6 +89,12 @@ def get_report_data(request):
                 response_data['data'], start_date, end_date
             )
 
+        group_by = request.GET.get('group_by')
+        if group_by:
+            if group_by not in BUCKET_FIELDS:
+                raise ValueError(f"Unknown group_by '{group_by}'")
+            response_data['data']['breakdown'] = get_period_breakdown(start_date, end_date, group_by)
+
         return JsonResponse(response_data)
 
     except Exception as e:
@@ -223,7 +229,7 @@ def get_payroll_report(start_date, end_date):
 
     total_salary = payrolls.aggregate(total=Sum('net_salary'))['total'] or Decimal('0')
     total_incentives = payrolls.aggregate(total=Sum('spr_amount'))['total'] or Decimal('0')
-    employees_paid = payrolls.values('employee_name').distinct().count()
+    employees_paid = payrolls.values('employee_id').distinct().count()
 
     total_cash = payrolls.aggregate(total=Sum('cash_amount'))['total'] or Decimal('0')
     total_bank = payrolls.aggregate(total=Sum('bank_transfer_amount'))['total'] or Decimal('0')
@@ -233,7 +239,8 @@ def get_payroll_report(start_date, end_date):
         amount=Sum('net_salary')
     )
 
-    employee_totals = payrolls.values('employee_name').annotate(
+    employee_totals = payrolls.values('employee_id').annotate(
+        employee_name=Max('employee_name'),
         total_salary=Sum('net_salary'),
         total_incentives=Sum('spr_amount'),
         count=Count('id')
@@ -260,27 +267,28 @@ def get_payroll_report(start_date, end_date):
 def get_attendance_report(start_date, end_date):
     """Generate attendance report data with optimized single-query aggregation"""
     # Get all active employees from payroll to ensure everyone is included
-    employees = list(Payroll.objects.filter(
-        record_state='active'
-    ).values_list('employee_name', flat=True).distinct())
+    employees = dict(Payroll.objects.filter(
+        record_state='active',
+        employee__isnull=False
+    ).values_list('employee_id', 'employee_name').distinct().order_by('employee_name'))
 
-    # Fetch aggregated attendance data in a single query
+    # Fetch aggregated attendance data in a single query, grouped on the integer employee id
     attendance_stats = Attendance.objects.filter(
         date__range=[start_date, end_date],
         record_state='active'
-    ).values('employee_name').annotate(
+    ).values('employee_id').annotate(
         p_count=Count('id', filter=Q(status='present')),
         h_count=Count('id', filter=Q(status='half_day')),
         a_count=Count('id', filter=Q(status='absent')),
     )
 
     # Convert to dictionary for easy lookup
-    stats_map = {s['employee_name']: s for s in attendance_stats}
+    stats_map = {s['employee_id']: s for s in attendance_stats}
     total_days_in_period = (end_date - start_date).days + 1
     
     records = []
-    for emp_name in employees:
-        s = stats_map.get(emp_name, {'p_count': 0, 'h_count': 0, 'a_count': 0})
+    for employee_id, emp_name in employees.items():
+        s = stats_map.get(employee_id, {'p_count': 0, 'h_count': 0, 'a_count': 0})
         full_days = Decimal(s['p_count']) + (Decimal(s['h_count']) * Decimal('0.5'))
         
         records.append({
@@ -316,6 +324,36 @@ def get_attendance_report(start_date, end_date):
     }
 
 
+def get_period_breakdown(start_date, end_date, group_by):
+    """Income/expense/purchase/salary totals per calendar bucket, one grouped query per source"""
+    end = end_date + timedelta(days=1)
+    sources = (
+        ('income', Income.objects.all(), 'amount', 'date'),
+        ('expense', Expense.objects.all(), 'total_amount', 'date'),
+        ('purchase', Purchase.objects.all(), 'total_amount', 'date'),
+        ('salary', Payroll.objects.all(), 'net_salary', 'salary_date'),
+    )
+
+    buckets = {}
+    for name, queryset, amount_field, date_field in sources:
+        totals = CalendarDay.group_totals(queryset, group_by, amount_field, start_date, end, date_field=date_field)
+        for key, total in totals.items():
+            buckets.setdefault(key, {})[name] = float(total)
+
+    rows = []
+    for key in sorted(buckets):
+        row = {'income': 0.0, 'expense': 0.0, 'purchase': 0.0, 'salary': 0.0, **buckets[key]}
+        row['net'] = row['income'] - row['expense'] - row['purchase'] - row['salary']
+        if group_by == 'fiscal_quarter':
+            row['period'] = f"FY{key[0]}-{(key[0] + 1) % 100:02d} Q{key[1]}"
+        elif group_by == 'fiscal_year':
+            row['period'] = f"FY{key}-{(key + 1) % 100:02d}"
+        else:
+            row['period'] = str(key)
+        rows.append(row)
+    return rows
+
+
 def get_overall_summary(report_data, start_date, end_date):
     """Generate overall summary for combined report"""
     days_in_period = (end_date - start_date).days + 1
@@ -343,6 +381,7 @@ def get_overall_summary(report_data, start_date, end_date):
 @require_GET
 def export_report(request):
     """Export report to Excel or PDF format"""
+    started = time.perf_counter()
     try:
         format_type = request.GET.get('format', 'excel')
         report_type = request.GET.get('type', 'all')
@@ -370,12 +409,15 @@ def export_report(request):
             report_data['summary'] = get_overall_summary(report_data, start_date, end_date)
 
         if format_type == 'excel':
-            return export_to_excel(report_data, report_type, start_date, end_date, period_type)
+            response = export_to_excel(report_data, report_type, start_date, end_date, period_type)
         elif format_type == 'pdf':
-            return export_to_pdf(report_data, report_type, start_date, end_date, period_type)
+            response = export_to_pdf(report_data, report_type, start_date, end_date, period_type)
         else:
             return JsonResponse({'success': False, 'error': 'Invalid format'}, status=400)
 
+        metrics.observe_export(format_type, report_type, time.perf_counter() - started, len(response.content))
+        return response
+
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -0,0 +1,25 @@
+# search_views.py
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from ..utils.pagination import get_page_size
+from ..utils.search import search as run_search
+
+
+@require_GET
+def search(request):
+    """Ranked, paginated search across expenses, income and purchases."""
+    query = request.GET.get('q', '').strip()
+    doc_types = [t.strip() for t in request.GET.get('type', '').split(',') if t.strip()] or None
+
+    try:
+        page = int(request.GET.get('page', 1))
+    except (ValueError, TypeError):
+        page = 1
+
+    try:
+        result = run_search(query, doc_types=doc_types, page=page, page_size=get_page_size(request, default=20))
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({'success': True, **result})
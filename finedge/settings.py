@@ -48,11 +48,13 @@ INSTALLED_APPS = [
 SITE_ID = 1
 
 MIDDLEWARE = [
+    'fine.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'fine.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,6 +94,86 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Set CACHE_URL (e.g. redis://localhost:6379/1) to share cached totals and the
+# reference-data generation counter between worker processes.
+
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+        }
+    }
+
+
+# Seconds cached page totals (payroll month totals, income summary cards) live.
+# Writes drop the keys, but only in the writing process unless CACHE_URL is set,
+# so keep this short with the default per-process cache.
+TOTALS_CACHE_TIMEOUT = int(os.getenv('TOTALS_CACHE_TIMEOUT', '60'))
+
+
+# Query budgets
+# Most queries each view (by function name) may run per request; see
+# fine/middleware.py. Over-budget requests log a warning, or raise when
+# QUERY_BUDGET_RAISE is set (as the test suite does).
+
+QUERY_BUDGETS = {
+    'get_weekly_attendance': 5,
+    'get_attendance_summary': 5,
+    'get_payroll_data': 5,
+    'get_chart_data': 8,
+    'dashboard': 10,
+    'expense_rows': 5,
+    'income_rows': 5,
+    'purchase_rows': 5,
+    'search': 5,
+}
+
+QUERY_BUDGET_RAISE = os.getenv('QUERY_BUDGET_RAISE', '').lower() in ('1', 'true', 'yes')
+
+
+# On-demand profiling
+# Staff users can profile one request with ?__profile=<token>; tokens and the
+# stored profiles are listed at /profiles/. See fine/utils/profiling.py.
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))
+PROFILE_TOKEN_MAX_AGE = 8 * 60 * 60
+
+
+# Metrics
+# /metrics serves Prometheus text format when prometheus_client is installed.
+# Under gunicorn, export PROMETHEUS_MULTIPROC_DIR (an empty directory shared by
+# the workers) before starting; see fine/utils/metrics.py. Only staff users
+# can open it; give the scraper METRICS_TOKEN as a bearer token.
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+
+# Logging
+# fine.requests emits one JSON line per request with its query count and timings.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'fine.requests': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 